@@ -1,7 +1,7 @@
 from typing import Type
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String
-from sqlalchemy.dialects.postgresql import INTEGER, TEXT
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, String, text
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, INTEGER, JSONB, TEXT
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import expression
 
@@ -14,7 +14,14 @@ class User(Base):
     Users table
     """
 
-    __table_args__ = {"schema": "webhook"}
+    __table_args__ = (
+        Index(
+            "ix_user_phone_number_phone_number_id",
+            "phone_number",
+            "phone_number_id",
+        ),
+        {"schema": "webhook"},
+    )
     __tablename__ = "user"
 
     user_id = Column(INTEGER, primary_key=True)
@@ -28,7 +35,17 @@ class Session(Base):
     Sessions table
     """
 
-    __table_args__ = {"schema": "webhook"}
+    __table_args__ = (
+        Index("ix_session_user_id", "user_id"),
+        Index(
+            "ix_session_active",
+            "user_id",
+            "communication_channel",
+            "end_time",
+            postgresql_where=text("not is_archived"),
+        ),
+        {"schema": "webhook"},
+    )
     __tablename__ = "session"
 
     session_id = Column(INTEGER, primary_key=True)
@@ -44,7 +61,16 @@ class Message(Base):
     Sessions table
     """
 
-    __table_args__ = {"schema": "webhook"}
+    __table_args__ = (
+        Index("ux_message_wa_message_id", "wa_message_id", unique=True),
+        Index("ux_message_wa_reply_message_id", "wa_reply_message_id", unique=True),
+        Index(
+            "ix_message_session_id_received_timestamp",
+            "session_id",
+            "received_timestamp",
+        ),
+        {"schema": "webhook"},
+    )
     __tablename__ = "message"
 
     message_id = Column(INTEGER, primary_key=True)
@@ -54,7 +80,9 @@ class Message(Base):
     user_message = Column(String(4096))
     bot_message = Column(String(4096))
     wa_message_id = Column(String(256))
+    wa_reply_message_id = Column(String(256))
     concatenated_message_id = Column(INTEGER)
+    processing_step = Column(String(32), nullable=False, server_default="received")
 
 
 class MessageStatus(Base):
@@ -62,7 +90,10 @@ class MessageStatus(Base):
     Message status table
     """
 
-    __table_args__ = {"schema": "webhook"}
+    __table_args__ = (
+        Index("ix_message_status_message_id", "message_id"),
+        {"schema": "webhook"},
+    )
     __tablename__ = "message_status"
 
     status_id = Column(INTEGER, primary_key=True)
@@ -76,7 +107,10 @@ class GptResponse(Base):
     Sessions table
     """
 
-    __table_args__ = {"schema": "webhook"}
+    __table_args__ = (
+        Index("ix_gpt_response_message_id", "message_id"),
+        {"schema": "webhook"},
+    )
     __tablename__ = "gpt_response"
 
     response_id = Column(INTEGER, primary_key=True)
@@ -89,9 +123,51 @@ class MessageProcessing(Base):
     Message processing table
     """
 
-    __table_args__ = {"schema": "webhook"}
+    __table_args__ = (
+        Index("ix_message_processing_session_id", "session_id"),
+        Index("ix_message_processing_message_id", "message_id"),
+        Index("ix_message_processing_created_at", "created_at"),
+        {"schema": "webhook"},
+    )
     __tablename__ = "message_processing"
 
     message_processing_id = Column(INTEGER, primary_key=True)
     session_id = Column(INTEGER, ForeignKey(Session.session_id), nullable=False)
     message_id = Column(INTEGER, ForeignKey(Message.message_id), nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=text("now()"))
+
+
+class MessagePending(Base):
+    """
+    Message pending table. Queue of received webhook updates
+    """
+
+    __table_args__ = (
+        Index("ix_message_pending_available_at", "available_at"),
+        {"schema": "webhook"},
+    )
+    __tablename__ = "message_pending"
+
+    message_pending_id = Column(INTEGER, primary_key=True)
+    entry = Column(JSONB, nullable=False)
+    attempts = Column(INTEGER, nullable=False, server_default=text("0"))
+    available_at = Column(DateTime, nullable=False, server_default=text("now()"))
+    created_at = Column(DateTime, nullable=False, server_default=text("now()"))
+
+
+class SendRateLimit(Base):
+    """
+    Send rate limit table. Token buckets of outbound messages shared by workers
+    """
+
+    __table_args__ = (
+        Index("ix_send_rate_limit_updated_at", "updated_at"),
+        {"schema": "webhook", "prefixes": ["UNLOGGED"]},
+    )
+    __tablename__ = "send_rate_limit"
+
+    key = Column(String(256), primary_key=True)
+    tokens = Column(DOUBLE_PRECISION, nullable=False)
+    updated_at = Column(
+        DateTime, nullable=False, server_default=text("clock_timestamp()")
+    )
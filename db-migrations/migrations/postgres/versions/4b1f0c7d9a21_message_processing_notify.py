@@ -0,0 +1,47 @@
+"""message processing notify
+
+Revision ID: 4b1f0c7d9a21
+Revises: e88028cbb1f9
+Create Date: 2026-10-18 17:05:12.418903
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "4b1f0c7d9a21"
+down_revision = "e88028cbb1f9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        create or replace function webhook.notify_message_processing()
+        returns trigger
+        language plpgsql
+        as $$
+        begin
+            perform pg_notify('webhook_message_processing', new.session_id::text);
+            return new;
+        end;
+        $$
+        """
+    )
+    op.execute(
+        """
+        create trigger message_processing_notify
+        after insert on webhook.message_processing
+        for each row
+        execute function webhook.notify_message_processing()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "drop trigger if exists message_processing_notify on webhook.message_processing"
+    )
+    op.execute("drop function if exists webhook.notify_message_processing()")
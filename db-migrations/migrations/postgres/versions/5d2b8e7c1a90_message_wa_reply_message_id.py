@@ -0,0 +1,37 @@
+"""message wa reply message id
+
+Revision ID: 5d2b8e7c1a90
+Revises: 9c3e5a1f7b42
+Create Date: 2026-10-18 18:05:12.417301
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "5d2b8e7c1a90"
+down_revision = "9c3e5a1f7b42"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "message",
+        sa.Column("wa_reply_message_id", sa.String(256)),
+        schema="webhook",
+    )
+    op.create_index(
+        "ux_message_wa_reply_message_id",
+        "message",
+        ["wa_reply_message_id"],
+        unique=True,
+        schema="webhook",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_message_wa_reply_message_id", "message", schema="webhook")
+    op.drop_column("message", "wa_reply_message_id", schema="webhook")
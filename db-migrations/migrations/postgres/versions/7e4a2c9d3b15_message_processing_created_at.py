@@ -0,0 +1,40 @@
+"""message processing created at
+
+Revision ID: 7e4a2c9d3b15
+Revises: 5d2b8e7c1a90
+Create Date: 2026-10-18 19:12:47.630518
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "7e4a2c9d3b15"
+down_revision = "5d2b8e7c1a90"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "message_processing",
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        schema="webhook",
+    )
+    op.create_index(
+        "ix_message_processing_created_at",
+        "message_processing",
+        ["created_at"],
+        schema="webhook",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_message_processing_created_at", "message_processing", schema="webhook"
+    )
+    op.drop_column("message_processing", "created_at", schema="webhook")
@@ -0,0 +1,46 @@
+"""send rate limit
+
+Revision ID: 8b3f1d6a2e57
+Revises: 2f8d6b1e4c73
+Create Date: 2026-10-18 21:05:13.284730
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "8b3f1d6a2e57"
+down_revision = "2f8d6b1e4c73"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "send_rate_limit",
+        sa.Column("key", sa.String(length=256), nullable=False),
+        sa.Column("tokens", postgresql.DOUBLE_PRECISION(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("clock_timestamp()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("key"),
+        schema="webhook",
+        prefixes=["UNLOGGED"],
+    )
+    op.create_index(
+        "ix_send_rate_limit_updated_at",
+        "send_rate_limit",
+        ["updated_at"],
+        schema="webhook",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_send_rate_limit_updated_at", "send_rate_limit", schema="webhook")
+    op.drop_table("send_rate_limit", schema="webhook")
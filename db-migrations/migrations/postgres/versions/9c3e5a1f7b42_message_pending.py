@@ -0,0 +1,53 @@
+"""message pending
+
+Revision ID: 9c3e5a1f7b42
+Revises: 4b1f0c7d9a21
+Create Date: 2026-10-18 17:42:36.905114
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "9c3e5a1f7b42"
+down_revision = "4b1f0c7d9a21"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "message_pending",
+        sa.Column("message_pending_id", sa.INTEGER(), nullable=False),
+        sa.Column("entry", postgresql.JSONB(), nullable=False),
+        sa.Column(
+            "attempts", sa.INTEGER(), server_default=sa.text("0"), nullable=False
+        ),
+        sa.Column(
+            "available_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("message_pending_id"),
+        schema="webhook",
+    )
+    op.create_index(
+        "ix_message_pending_available_at",
+        "message_pending",
+        ["available_at"],
+        schema="webhook",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_message_pending_available_at", "message_pending", schema="webhook"
+    )
+    op.drop_table("message_pending", schema="webhook")
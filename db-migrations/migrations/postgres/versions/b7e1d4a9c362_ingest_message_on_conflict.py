@@ -0,0 +1,179 @@
+"""ingest message on conflict
+
+Revision ID: b7e1d4a9c362
+Revises: c4a7e2f9b618
+Create Date: 2026-10-19 10:12:41.508213
+
+"""
+
+from alembic import context, op
+from alembic.script import ScriptDirectory
+
+
+# revision identifiers, used by Alembic.
+revision = "b7e1d4a9c362"
+down_revision = "c4a7e2f9b618"
+branch_labels = None
+depends_on = None
+
+
+# `wa_message_id` is unique, so duplicates are looked up whatever archive state of
+# their session is, and message created by concurrent ingest is returned as duplicate
+# instead of failing whole batch with unique violation
+INGEST_MESSAGE_FUNCTION = """
+        create or replace function webhook.ingest_message(
+            p_user_name varchar,
+            p_phone_number varchar,
+            p_phone_number_id varchar,
+            p_channel varchar,
+            p_wa_message_id varchar,
+            p_user_message varchar,
+            p_received_timestamp bigint,
+            p_status varchar,
+            p_status_timestamp bigint
+        )
+        returns table (
+            user_id integer,
+            session_id integer,
+            is_new_session boolean,
+            message_id integer,
+            status_id integer,
+            is_duplicate boolean
+        )
+        language plpgsql
+        as $$
+        #variable_conflict use_column
+        declare
+            v_user_id integer;
+            v_session_id integer;
+            v_is_new_session boolean := false;
+            v_message_id integer;
+            v_message_session_id integer;
+            v_status_id integer;
+            v_status varchar;
+        begin
+            -- 1. Get or create user
+            select u.user_id
+              into v_user_id
+              from webhook.user u
+             where u.phone_number = p_phone_number
+               and u.phone_number_id = p_phone_number_id
+             limit 1;
+
+            if v_user_id is null then
+                insert into webhook.user(user_name, phone_number, phone_number_id)
+                values (p_user_name, p_phone_number, p_phone_number_id)
+                returning user_id into v_user_id;
+            end if;
+
+            -- 2. Skip message if it is already processing or replied
+            select m.message_id, m.session_id
+              into v_message_id, v_message_session_id
+              from webhook.message m
+             where m.wa_message_id = p_wa_message_id;
+
+            if v_message_id is not null then
+                select ms.status_id, ms.status
+                  into v_status_id, v_status
+                  from webhook.message_status ms
+                 where ms.message_id = v_message_id
+                 limit 1;
+
+                if v_status in ('delivered', 'opened', 'concatenated') or exists (
+                    select 1
+                      from webhook.message_processing mp
+                     where mp.message_id = v_message_id
+                ) then
+                    return query
+                    select v_user_id, null::integer, false, v_message_id, v_status_id, true;
+                    return;
+                end if;
+            end if;
+
+            -- 3. Get active session and prolong it or create new one
+            select s.session_id
+              into v_session_id
+              from webhook.session s
+             where s.user_id = v_user_id
+               and s.communication_channel = p_channel
+               and s.end_time > now()
+               and not s.is_archived
+             limit 1;
+
+            if v_session_id is null then
+                insert into webhook.session(user_id, start_time, end_time, communication_channel)
+                values (
+                    v_user_id,
+                    to_timestamp(p_received_timestamp),
+                    to_timestamp(p_received_timestamp) + interval '24h',
+                    p_channel
+                )
+                returning session_id into v_session_id;
+
+                v_is_new_session := true;
+            else
+                update webhook.session
+                   set end_time = to_timestamp(p_received_timestamp) + interval '24h'
+                 where session_id = v_session_id;
+
+                v_is_new_session := not exists (
+                    select 1
+                      from webhook.message m
+                     where m.session_id = v_session_id
+                       and m.bot_message is not null
+                );
+            end if;
+
+            -- 4. Create message, processing and status entries. Retried message
+            -- of archived or expired session is moved to active one
+            if v_message_id is null then
+                insert into webhook.message(session_id, received_timestamp, user_message, wa_message_id)
+                values (v_session_id, to_timestamp(p_received_timestamp), p_user_message, p_wa_message_id)
+                on conflict (wa_message_id) do nothing
+                returning message_id into v_message_id;
+
+                -- Message was created by concurrent ingest, it processes message
+                if v_message_id is null then
+                    select m.message_id, ms.status_id
+                      into v_message_id, v_status_id
+                      from webhook.message m
+                      left join webhook.message_status ms
+                        on ms.message_id = m.message_id
+                     where m.wa_message_id = p_wa_message_id
+                     limit 1;
+
+                    return query
+                    select v_user_id, null::integer, false, v_message_id, v_status_id, true;
+                    return;
+                end if;
+            elsif v_message_session_id <> v_session_id then
+                update webhook.message
+                   set session_id = v_session_id
+                 where message_id = v_message_id;
+            end if;
+
+            insert into webhook.message_processing(message_id, session_id)
+            values (v_message_id, v_session_id);
+
+            if v_status_id is null then
+                insert into webhook.message_status(message_id, status, timestamp)
+                values (v_message_id, p_status, to_timestamp(p_status_timestamp))
+                returning status_id into v_status_id;
+            end if;
+
+            return query
+            select v_user_id, v_session_id, v_is_new_session, v_message_id, v_status_id, false;
+        end;
+        $$
+"""
+
+
+def upgrade() -> None:
+    op.execute(INGEST_MESSAGE_FUNCTION)
+
+
+def downgrade() -> None:
+    # Function of previous revision is restored by its own migration
+    ScriptDirectory.from_config(context.config).get_revision(
+        "2f8d6b1e4c73"
+    ).module.upgrade()
@@ -0,0 +1,43 @@
+"""message processing step
+
+Revision ID: c4a7e2f9b618
+Revises: 8b3f1d6a2e57
+Create Date: 2026-10-18 22:14:06.517302
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "c4a7e2f9b618"
+down_revision = "8b3f1d6a2e57"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "message",
+        sa.Column(
+            "processing_step",
+            sa.String(32),
+            nullable=False,
+            server_default="received",
+        ),
+        schema="webhook",
+    )
+    op.execute(
+        """
+        update webhook.message m
+           set processing_step = 'status_updated'
+          from webhook.message_status ms
+         where ms.message_id = m.message_id
+           and ms.status in ('delivered', 'opened')
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("message", "processing_step", schema="webhook")
@@ -0,0 +1,246 @@
+"""ingest messages function
+
+Revision ID: d3f8a6c1e925
+Revises: b7e1d4a9c362
+Create Date: 2026-10-19 14:37:52.306184
+
+"""
+
+from alembic import context, op
+from alembic.script import ScriptDirectory
+
+
+# revision identifiers, used by Alembic.
+revision = "d3f8a6c1e925"
+down_revision = "b7e1d4a9c362"
+branch_labels = None
+depends_on = None
+
+
+# Messages of one user are ingested by set-based statements: user and session are
+# resolved once per batch and messages, processing and status entries are created by
+# multi-row inserts, instead of calling `webhook.ingest_message` per message
+INGEST_MESSAGES_FUNCTION = """
+        create or replace function webhook.ingest_messages(
+            p_user_name varchar,
+            p_phone_number varchar,
+            p_phone_number_id varchar,
+            p_channel varchar,
+            p_wa_message_ids varchar[],
+            p_user_messages varchar[],
+            p_received_timestamps bigint[],
+            p_status varchar,
+            p_status_timestamp bigint
+        )
+        returns table (
+            user_id integer,
+            session_id integer,
+            is_new_session boolean,
+            message_id integer,
+            status_id integer,
+            is_duplicate boolean,
+            processing_step varchar,
+            bot_message varchar
+        )
+        language plpgsql
+        as $$
+        #variable_conflict use_column
+        declare
+            v_user_id integer;
+            v_session_id integer;
+            v_is_new_session boolean := false;
+            v_new_wa_message_ids varchar[];
+            v_retried_message_ids integer[];
+            v_created_message_ids integer[];
+            v_message_ids integer[] := '{}';
+            v_min_received_timestamp bigint;
+            v_max_received_timestamp bigint;
+        begin
+            if coalesce(cardinality(p_wa_message_ids), 0) = 0 then
+                return;
+            end if;
+
+            -- 1. Get or create user
+            select u.user_id
+              into v_user_id
+              from webhook.user u
+             where u.phone_number = p_phone_number
+               and u.phone_number_id = p_phone_number_id
+             limit 1;
+
+            if v_user_id is null then
+                insert into webhook.user(user_name, phone_number, phone_number_id)
+                values (p_user_name, p_phone_number, p_phone_number_id)
+                returning user_id into v_user_id;
+            end if;
+
+            -- 2. Skip messages repeated in batch, already processing or replied ones,
+            -- split the rest into new and retried ones
+            select array_agg(m.wa_message_id order by m.position)
+                       filter (where e.message_id is null),
+                   array_agg(e.message_id order by m.position)
+                       filter (where e.message_id is not null),
+                   min(m.received_timestamp),
+                   max(m.received_timestamp)
+              into v_new_wa_message_ids,
+                   v_retried_message_ids,
+                   v_min_received_timestamp,
+                   v_max_received_timestamp
+              from unnest(p_wa_message_ids, p_received_timestamps)
+                   with ordinality as m(wa_message_id, received_timestamp, position)
+              left join webhook.message e
+                on e.wa_message_id = m.wa_message_id
+              left join lateral (
+                    select ms.status
+                      from webhook.message_status ms
+                     where ms.message_id = e.message_id
+                     limit 1
+              ) es on true
+             where array_position(p_wa_message_ids, m.wa_message_id) = m.position
+               and (
+                    e.message_id is null
+                    or (
+                        (es.status is null or es.status not in ('delivered', 'opened', 'concatenated'))
+                        and not exists (
+                            select 1
+                              from webhook.message_processing mp
+                             where mp.message_id = e.message_id
+                        )
+                    )
+               );
+
+            if v_min_received_timestamp is not null then
+                -- 3. Get active session and prolong it or create new one
+                select s.session_id
+                  into v_session_id
+                  from webhook.session s
+                 where s.user_id = v_user_id
+                   and s.communication_channel = p_channel
+                   and s.end_time > now()
+                   and not s.is_archived
+                 limit 1;
+
+                if v_session_id is null then
+                    insert into webhook.session(user_id, start_time, end_time, communication_channel)
+                    values (
+                        v_user_id,
+                        to_timestamp(v_min_received_timestamp),
+                        to_timestamp(v_max_received_timestamp) + interval '24h',
+                        p_channel
+                    )
+                    returning session_id into v_session_id;
+
+                    v_is_new_session := true;
+                else
+                    update webhook.session
+                       set end_time = to_timestamp(v_max_received_timestamp) + interval '24h'
+                     where session_id = v_session_id;
+
+                    v_is_new_session := not exists (
+                        select 1
+                          from webhook.message m
+                         where m.session_id = v_session_id
+                           and m.bot_message is not null
+                    );
+                end if;
+
+                -- 4. Move retried messages of archived or expired session to active one
+                if v_retried_message_ids is not null then
+                    update webhook.message
+                       set session_id = v_session_id
+                     where message_id = any(v_retried_message_ids)
+                       and session_id <> v_session_id;
+
+                    v_message_ids := v_retried_message_ids;
+                end if;
+
+                -- 5. Create new messages. Message created by concurrent ingest is
+                -- not returned and is left to that ingest as duplicate
+                if v_new_wa_message_ids is not null then
+                    with created as (
+                        insert into webhook.message(session_id, received_timestamp, user_message, wa_message_id)
+                        select v_session_id, to_timestamp(m.received_timestamp), m.user_message, m.wa_message_id
+                          from unnest(p_wa_message_ids, p_user_messages, p_received_timestamps)
+                               with ordinality as m(wa_message_id, user_message, received_timestamp, position)
+                         where m.wa_message_id = any(v_new_wa_message_ids)
+                           and array_position(p_wa_message_ids, m.wa_message_id) = m.position
+                         order by m.position
+                        on conflict (wa_message_id) do nothing
+                        returning message_id
+                    )
+                    select array_agg(c.message_id)
+                      into v_created_message_ids
+                      from created c;
+
+                    v_message_ids := v_message_ids || coalesce(v_created_message_ids, '{}');
+                end if;
+
+                -- 6. Create processing and missing status entries of ingested messages
+                insert into webhook.message_processing(message_id, session_id)
+                select m.message_id, v_session_id
+                  from unnest(v_message_ids) as m(message_id)
+                 order by m.message_id;
+
+                insert into webhook.message_status(message_id, status, timestamp)
+                select m.message_id, p_status, to_timestamp(p_status_timestamp)
+                  from unnest(v_message_ids) as m(message_id)
+                 where not exists (
+                        select 1
+                          from webhook.message_status ms
+                         where ms.message_id = m.message_id
+                 );
+            end if;
+
+            -- 7. Return messages in given order, the ones not ingested are duplicates
+            return query
+            select v_user_id,
+                   case when i.is_ingested then v_session_id end,
+                   i.is_ingested and v_is_new_session,
+                   m.message_id,
+                   ms.status_id,
+                   not i.is_ingested,
+                   m.processing_step::varchar,
+                   m.bot_message::varchar
+              from unnest(p_wa_message_ids) with ordinality as p(wa_message_id, position)
+              left join webhook.message m
+                on m.wa_message_id = p.wa_message_id
+              left join lateral (
+                    select ms.status_id
+                      from webhook.message_status ms
+                     where ms.message_id = m.message_id
+                     limit 1
+              ) ms on true
+             cross join lateral (
+                    select coalesce(m.message_id = any(v_message_ids), false)
+                           and array_position(p_wa_message_ids, p.wa_message_id) = p.position
+                           as is_ingested
+             ) i
+             order by p.position;
+        end;
+        $$
+"""
+
+
+def upgrade() -> None:
+    op.execute(INGEST_MESSAGES_FUNCTION)
+    op.execute(
+        """
+        drop function webhook.ingest_message(
+            varchar, varchar, varchar, varchar, varchar, varchar, bigint, varchar, bigint
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    # Per-message function is restored by its own migration
+    ScriptDirectory.from_config(context.config).get_revision(
+        "b7e1d4a9c362"
+    ).module.upgrade()
+    op.execute(
+        """
+        drop function webhook.ingest_messages(
+            varchar, varchar, varchar, varchar, varchar[], varchar[], bigint[], varchar, bigint
+        )
+        """
+    )
@@ -0,0 +1,107 @@
+"""hot path indexes
+
+Revision ID: e88028cbb1f9
+Revises: 36e60295c8e2
+Create Date: 2026-10-18 16:31:47.208815
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "e88028cbb1f9"
+down_revision = "36e60295c8e2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_user_phone_number_phone_number_id",
+        "user",
+        ["phone_number", "phone_number_id"],
+        schema="webhook",
+    )
+    op.create_index(
+        "ix_session_user_id",
+        "session",
+        ["user_id"],
+        schema="webhook",
+    )
+    op.create_index(
+        "ix_session_active",
+        "session",
+        ["user_id", "communication_channel", "end_time"],
+        schema="webhook",
+        postgresql_where=sa.text("not is_archived"),
+    )
+    # keep `wa_message_id` only on the first copy of already duplicated messages
+    op.execute(
+        """
+        update webhook.message m
+           set wa_message_id = null
+         where exists (
+            select 1
+              from webhook.message d
+             where d.wa_message_id = m.wa_message_id
+               and d.message_id < m.message_id
+         )
+        """
+    )
+    op.create_index(
+        "ux_message_wa_message_id",
+        "message",
+        ["wa_message_id"],
+        unique=True,
+        schema="webhook",
+    )
+    op.create_index(
+        "ix_message_session_id_received_timestamp",
+        "message",
+        ["session_id", "received_timestamp"],
+        schema="webhook",
+    )
+    op.create_index(
+        "ix_message_status_message_id",
+        "message_status",
+        ["message_id"],
+        schema="webhook",
+    )
+    op.create_index(
+        "ix_message_processing_session_id",
+        "message_processing",
+        ["session_id"],
+        schema="webhook",
+    )
+    op.create_index(
+        "ix_message_processing_message_id",
+        "message_processing",
+        ["message_id"],
+        schema="webhook",
+    )
+    op.create_index(
+        "ix_gpt_response_message_id",
+        "gpt_response",
+        ["message_id"],
+        schema="webhook",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_gpt_response_message_id", "gpt_response", schema="webhook")
+    op.drop_index(
+        "ix_message_processing_message_id", "message_processing", schema="webhook"
+    )
+    op.drop_index(
+        "ix_message_processing_session_id", "message_processing", schema="webhook"
+    )
+    op.drop_index("ix_message_status_message_id", "message_status", schema="webhook")
+    op.drop_index(
+        "ix_message_session_id_received_timestamp", "message", schema="webhook"
+    )
+    op.drop_index("ux_message_wa_message_id", "message", schema="webhook")
+    op.drop_index("ix_session_active", "session", schema="webhook")
+    op.drop_index("ix_session_user_id", "session", schema="webhook")
+    op.drop_index("ix_user_phone_number_phone_number_id", "user", schema="webhook")
@@ -0,0 +1,95 @@
+"""
+Benchmark of `HttpRequestMixin` against local stub server.
+
+Compares short-lived session per request (no `client_session` passed)
+with app-scoped keep-alive session created by `create_http_client_session`.
+
+Run from `shared-lib-template` folder:
+
+```bash
+python benchmarks/http_request_mixin_benchmark.py --requests 2000 --concurrency 20
+```
+"""
+
+import argparse
+import asyncio
+import time
+
+from aiohttp import web
+from shared_lib_template.base_settings import WhatsappBaseSettings
+from shared_lib_template.utils import HttpRequestMixin, create_http_client_session
+
+
+async def _stub_handler(request: web.Request) -> web.Response:
+    await request.read()
+    return web.json_response({"success": True})
+
+
+async def _start_stub_server() -> tuple[web.AppRunner, str]:
+    app = web.Application()
+    app.router.add_post("/{phone_number_id}/messages", _stub_handler)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host="127.0.0.1", port=0)
+    await site.start()
+
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}/123/messages"
+
+
+async def _run(
+    mixin: HttpRequestMixin, url: str, requests: int, concurrency: int
+) -> float:
+    """Returns requests per second"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _send() -> None:
+        async with semaphore:
+            await mixin.post(url=url, json={"status": "read", "message_id": "wamid"})
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(_send() for _ in range(requests)))
+
+    return requests / (time.perf_counter() - started_at)
+
+
+async def main(requests: int, concurrency: int) -> None:
+    settings = WhatsappBaseSettings.model_construct(
+        DEFAULT_VERIFY_SSL=False,
+        DEFAULT_API_RETRY_COUNT=1,
+    )
+    runner, url = await _start_stub_server()
+
+    try:
+        per_request_session_rps = await _run(
+            HttpRequestMixin(settings=settings), url, requests, concurrency
+        )
+
+        client_session = await create_http_client_session(settings=settings)
+        try:
+            shared_session_rps = await _run(
+                HttpRequestMixin(settings=settings, client_session=client_session),
+                url,
+                requests,
+                concurrency,
+            )
+        finally:
+            await client_session.close()
+
+    finally:
+        await runner.cleanup()
+
+    print(f"requests={requests} concurrency={concurrency}")
+    print(f"session per request: {per_request_session_rps:10.1f} req/s")
+    print(f"app-scoped session:  {shared_session_rps:10.1f} req/s")
+    print(f"speedup:             {shared_session_rps / per_request_session_rps:10.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(main(requests=args.requests, concurrency=args.concurrency))
@@ -19,7 +19,6 @@ setup(
     include_package_data=True,
     install_requires=[
         "aiohttp~=3.9.5",
-        "aiohttp-retry~=2.8.3",
         "asyncpg==0.29.0",
         "pydantic~=2.7.4",
         "pydantic-settings~=2.3.3",
@@ -1,16 +1,24 @@
 from shared_lib_template.constants.api_response_status import APIResponseStatus
 from shared_lib_template.constants.application_mode import ApplicationMode
+from shared_lib_template.constants.circuit_breaker_state import CircuitBreakerState
 from shared_lib_template.constants.communication_channel import CommunicationChannel
 from shared_lib_template.constants.http_codes_message import HTTPCodesMessage
 from shared_lib_template.constants.message_status import MessageStatus
+from shared_lib_template.constants.postgres_pool_mode import PostgresPoolMode
 from shared_lib_template.constants.retry_statuses import RETRY_STATUSES
+from shared_lib_template.constants.transaction_isolation_level import (
+    TransactionIsolationLevel,
+)
 
 
 __all__ = [
     "APIResponseStatus",
     "ApplicationMode",
+    "CircuitBreakerState",
     "CommunicationChannel",
     "HTTPCodesMessage",
     "RETRY_STATUSES",
     "MessageStatus",
+    "PostgresPoolMode",
+    "TransactionIsolationLevel",
 ]
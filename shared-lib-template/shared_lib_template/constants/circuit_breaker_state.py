@@ -0,0 +1,9 @@
+from shared_lib_template.constants.base import AppStringEnum
+
+
+class CircuitBreakerState(AppStringEnum):
+    """State of circuit breaker of http endpoint"""
+
+    CLOSED = "closed"  # calls pass
+    OPEN = "open"  # calls fail fast
+    HALF_OPEN = "half_open"  # probe call checks endpoint recovered
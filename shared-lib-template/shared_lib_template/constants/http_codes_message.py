@@ -10,6 +10,7 @@ class HTTPCodesMessage(AppStringEnum):
     HTTP_401_UNAUTHORIZED = "Unauthorized"
     HTTP_403_FORBIDDEN = "Forbidden"
     HTTP_404_NOT_FOUND = "Not found"
+    HTTP_422_UNPROCESSABLE_ENTITY = "Unprocessable entity"
     HTTP_429_TOO_MANY_REQUESTS = "Too many requests"
     HTTP_500_INTERNAL_SERVER_ERROR = "Internal server error"
     HTTP_503_SERVICE_UNAVAILABLE = "Service Unavailable"
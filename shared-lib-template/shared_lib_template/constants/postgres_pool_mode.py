@@ -0,0 +1,8 @@
+from shared_lib_template.constants.base import AppStringEnum
+
+
+class PostgresPoolMode(AppStringEnum):
+    """How Postgres server connections are shared between app connections"""
+
+    SESSION = "session"  # direct connection or PgBouncer session pooling
+    TRANSACTION = "transaction"  # PgBouncer transaction pooling
@@ -0,0 +1,9 @@
+from shared_lib_template.constants.base import AppStringEnum
+
+
+class TransactionIsolationLevel(AppStringEnum):
+    """Postgres transaction isolation levels (asyncpg naming)"""
+
+    READ_COMMITTED = "read_committed"
+    REPEATABLE_READ = "repeatable_read"
+    SERIALIZABLE = "serializable"
@@ -1,12 +1,29 @@
-from typing import Type
+from typing import Any, Type
+from urllib.parse import urlsplit
 
 import asyncpg
 
 from shared_lib_template.base_settings import WhatsappBaseSettings
+from shared_lib_template.constants import PostgresPoolMode
+from shared_lib_template.db.pgbouncer import TransactionPoolingConnection
 from shared_lib_template.db.postgres import PostgresConnectorInterface
+from shared_lib_template.db.replicas import Replica, ReplicaRouter
+from shared_lib_template.db.statements import (
+    prepare_registered_statements,
+    register_statement,
+    statement_registry,
+)
 
 
 async def create_postgres_connection_pool(settings: Type[WhatsappBaseSettings]):
+    """
+    Create app connection pool.
+
+    In transaction pooling mode every transaction may run on another server
+    connection, so named prepared statements are only used when PgBouncer tracks
+    them (`POSTGRES_PGBOUNCER_PREPARED_STATEMENTS`), otherwise statement cache is
+    disabled and asyncpg sends queries as unnamed statements
+    """
     return await asyncpg.create_pool(
         host=settings.POSTGRES_HOST,
         port=settings.POSTGRES_PORT,
@@ -16,10 +33,104 @@ async def create_postgres_connection_pool(settings: Type[WhatsappBaseSettings]):
         command_timeout=settings.POSTGRES_TIMEOUT,
         min_size=settings.POSTGRES_MIN_CONNECTIONS,
         max_size=settings.POSTGRES_MAX_CONNECTIONS,
+        init=(
+            prepare_registered_statements
+            if settings.POSTGRES_PREPARE_STATEMENTS
+            and _is_statement_cache_enabled(settings)
+            else None
+        ),
+        **_get_pool_mode_kwargs(settings),
+    )
+
+
+async def create_postgres_replica_router(
+    settings: Type[WhatsappBaseSettings],
+) -> ReplicaRouter | None:
+    """
+    Create and start router of read replicas from `POSTGRES_REPLICA_DSNS`,
+    `None` if no replica is configured. Replica pools open connections on demand,
+    so unavailable replica does not prevent app start
+    """
+    if not settings.POSTGRES_REPLICA_DSNS:
+        return None
+
+    replicas = []
+    for dsn in settings.POSTGRES_REPLICA_DSNS:
+        dsn_parts = urlsplit(dsn)
+        pool = await asyncpg.create_pool(
+            dsn=dsn,
+            command_timeout=settings.POSTGRES_TIMEOUT,
+            min_size=0,
+            max_size=settings.POSTGRES_MAX_CONNECTIONS,
+            **_get_pool_mode_kwargs(settings),
+        )
+        replicas.append(
+            Replica(
+                name=f"{dsn_parts.hostname}:{dsn_parts.port or settings.POSTGRES_PORT}",
+                pool=pool,
+            )
+        )
+
+    router = ReplicaRouter(
+        replicas=replicas,
+        max_lag=settings.POSTGRES_REPLICA_MAX_LAG,
+        check_interval=settings.POSTGRES_REPLICA_CHECK_INTERVAL,
+    )
+    await router.start()
+
+    return router
+
+
+async def create_postgres_listen_pool(
+    settings: Type[WhatsappBaseSettings],
+) -> asyncpg.pool.Pool | None:
+    """
+    Create pool for LISTEN connections. In session mode app pool is used, so `None`
+    is returned, as well as in transaction pooling mode without `POSTGRES_LISTEN_HOST`
+    """
+    if (
+        settings.POSTGRES_POOL_MODE != PostgresPoolMode.TRANSACTION
+        or not settings.POSTGRES_LISTEN_HOST
+    ):
+        return None
+
+    return await asyncpg.create_pool(
+        host=settings.POSTGRES_LISTEN_HOST,
+        port=settings.POSTGRES_LISTEN_PORT or settings.POSTGRES_PORT,
+        database=settings.POSTGRES_DB,
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        command_timeout=settings.POSTGRES_TIMEOUT,
+        min_size=0,
+        max_size=1,
+    )
+
+
+def _is_statement_cache_enabled(settings: Type[WhatsappBaseSettings]) -> bool:
+    return (
+        settings.POSTGRES_POOL_MODE != PostgresPoolMode.TRANSACTION
+        or settings.POSTGRES_PGBOUNCER_PREPARED_STATEMENTS
     )
 
 
+def _get_pool_mode_kwargs(settings: Type[WhatsappBaseSettings]) -> dict[str, Any]:
+    pool_kwargs: dict[str, Any] = {}
+
+    if settings.POSTGRES_POOL_MODE == PostgresPoolMode.TRANSACTION:
+        pool_kwargs["connection_class"] = TransactionPoolingConnection
+
+    if not _is_statement_cache_enabled(settings):
+        pool_kwargs["statement_cache_size"] = 0
+
+    return pool_kwargs
+
+
 __all__ = [
     "create_postgres_connection_pool",
+    "create_postgres_listen_pool",
+    "create_postgres_replica_router",
     "PostgresConnectorInterface",
+    "register_statement",
+    "ReplicaRouter",
+    "statement_registry",
 ]
@@ -0,0 +1,14 @@
+import asyncpg
+
+
+class TransactionPoolingConnection(asyncpg.Connection):
+    """
+    Connection behind PgBouncer in transaction pooling mode.
+
+    Session state is not kept between transactions there, so reset query asyncpg
+    sends on every release to pool (`UNLISTEN`, `RESET ALL`, ...) is only
+    an extra round trip and is skipped
+    """
+
+    def _get_reset_query(self) -> str:
+        return ""
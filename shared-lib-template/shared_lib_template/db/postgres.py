@@ -1,9 +1,23 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from logging import Logger
-from typing import Any
+from typing import Any, AsyncContextManager, AsyncIterator
 
 import asyncpg
 from fastapi import FastAPI
+from shared_lib_template.constants import TransactionIsolationLevel
+from shared_lib_template.db.replicas import ReplicaRouter
+from shared_lib_template.db.statements import statement_registry
+
+
+REPLICA_CONNECTION_ERRORS = (
+    OSError,
+    asyncio.TimeoutError,
+    asyncpg.exceptions.InterfaceError,
+    asyncpg.exceptions.PostgresConnectionError,
+)
 
 
 class PostgresConnectorInterface(ABC):
@@ -51,15 +65,42 @@ class PostgresConnectorInterface(ABC):
             dict[str, Any]: Query result
         """
 
+    @abstractmethod
+    def unit_of_work(
+        self,
+        transaction: bool = True,
+        isolation: TransactionIsolationLevel | None = None,
+    ) -> AsyncContextManager[None]:
+        """Hold single connection for all queries executed inside context
+
+        Args:
+            transaction (bool): Wrap queries in transaction, commit on success and rollback on error
+            isolation (TransactionIsolationLevel | None): Transaction isolation level, server default if not set
+        """
+
 
 class PostgresConnector(PostgresConnectorInterface):
-    """Postgres connector service"""
+    """
+    Postgres connector service.
 
-    def __init__(self, logger: Logger, pool: asyncpg.pool.Pool) -> None:
+    Replica queries (see `register_statement`) executed outside of unit of work
+    are read from healthy replica of `replica_router`, so reads made after writes
+    in the same unit of work always see them. Replica errors fall back to primary
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        pool: asyncpg.pool.Pool,
+        replica_router: ReplicaRouter | None = None,
+    ) -> None:
         self._logger = logger
         self._pool = pool
+        self._replica_router = replica_router
         self.connection: asyncpg.pool.PoolConnectionProxy
         self.is_connection_active = False
+        self._is_unit_of_work_active = False
+        self._is_transaction_active = False
 
     async def connect(self) -> None:
         """Connect to Postgres"""
@@ -72,51 +113,140 @@ class PostgresConnector(PostgresConnectorInterface):
 
     async def close(self) -> None:
         """Disconnect from postgres"""
-        if self.connection:
+        if self.is_connection_active:
             await self._pool.release(self.connection)
             self.is_connection_active = False
 
+    @asynccontextmanager
+    async def unit_of_work(
+        self,
+        transaction: bool = True,
+        isolation: TransactionIsolationLevel | None = None,
+    ) -> AsyncIterator[None]:
+        """Hold single connection for all queries executed inside context.
+        Nested calls join the outer unit of work"""
+        if self._is_unit_of_work_active:
+            yield None
+            return
+
+        if not self.is_connection_active:
+            await self.connect()
+
+        self._is_unit_of_work_active = True
+        try:
+            if not transaction:
+                yield None
+                return
+
+            async with self.connection.transaction(
+                isolation=str(isolation) if isolation else None
+            ):
+                self._is_transaction_active = True
+                try:
+                    yield None
+                finally:
+                    self._is_transaction_active = False
+
+        finally:
+            self._is_unit_of_work_active = False
+            await self.close()
+
+    async def _release_after_query(self) -> None:
+        """Release connection after single query if it is not held by unit of work"""
+        if not self._is_unit_of_work_active:
+            await self.close()
+
+    async def _run_query(
+        self,
+        method: str,
+        query: str,
+        *query_params: Any,
+        connection: asyncpg.Connection | None = None,
+    ) -> Any:
+        """Run query with connection `method`, record stats of registered queries"""
+        connection = connection or self.connection
+        name = statement_registry.get_name(query)
+        if name is None:
+            return await getattr(connection, method)(query, *query_params)
+
+        started_at = time.perf_counter()
+        is_failed = False
+
+        try:
+            return await getattr(connection, method)(query, *query_params)
+
+        except Exception:
+            is_failed = True
+            raise
+
+        finally:
+            statement_registry.record(
+                name=name,
+                seconds=time.perf_counter() - started_at,
+                is_failed=is_failed,
+            )
+
+    async def _fetch(self, method: str, query: str, *query_params: Any) -> Any:
+        """Run read query on replica if it is allowed and available, on primary otherwise"""
+        if (
+            self._replica_router is not None
+            and not self._is_unit_of_work_active
+            and statement_registry.is_replica_query(query)
+            and (replica := self._replica_router.choose()) is not None
+        ):
+            try:
+                async with replica.pool.acquire() as connection:
+                    return await self._run_query(
+                        method, query, *query_params, connection=connection
+                    )
+
+            except REPLICA_CONNECTION_ERRORS as e:
+                self._replica_router.mark_failed(replica, e)
+
+        if not self.is_connection_active:
+            await self.connect()
+
+        return await self._run_query(method, query, *query_params)
+
     async def execute_query(self, query: str, *query_params) -> None:
         """Execute query in postgres without return data"""
         if not self.is_connection_active:
             await self.connect()
 
         try:
-            await self.connection.execute(query, *query_params)  # type: ignore[union-attr]
+            await self._run_query("execute", query, *query_params)
 
         except asyncpg.exceptions.PostgresError as e:
             self._logger.error("Error executing query: %s", e)
+            if self._is_transaction_active:
+                raise
 
         finally:
-            await self.close()
+            await self._release_after_query()
 
     async def get_query_result_as_list(
         self, query: str, *query_params: Any
     ) -> list[dict[str, Any]]:
         """Get sql result as list of dicts"""
-        if not self.is_connection_active:
-            await self.connect()
-
         try:
-            result = await self.connection.fetch(query, *query_params)  # type: ignore[union-attr]
+            result = await self._fetch("fetch", query, *query_params)
             return [dict(row) for row in result]
 
         except asyncpg.exceptions.PostgresError as e:
             self._logger.error("Error fetching data: %s", e)
+            if self._is_transaction_active:
+                raise
             return []
 
         finally:
-            await self.close()
+            await self._release_after_query()
 
     async def get_query_result_as_dict(
         self, query: str, *query_params: Any
     ) -> dict[str, Any]:
         """Get sql result as dict (only first row)"""
-        if not self.is_connection_active:
-            await self.connect()
-
         try:
-            result = await self.connection.fetchrow(query, *query_params)  # type: ignore[union-attr]
+            result = await self._fetch("fetchrow", query, *query_params)
             if result:
                 return dict(result)
 
@@ -124,15 +254,22 @@ class PostgresConnector(PostgresConnectorInterface):
 
         except asyncpg.exceptions.PostgresError as e:
             self._logger.error("Error fetching data: %s", e)
+            if self._is_transaction_active:
+                raise
             return {}
 
         finally:
-            await self.close()
+            await self._release_after_query()
 
 
 def get_postgres_connector(logger: Logger, app: FastAPI) -> PostgresConnectorInterface:
     """
     Get Postgres connector.
-    There is Need to initialize connection pool in attribute of app class: `FastAPI(...).connection_pool`
+    There is Need to initialize connection pool in attribute of app class: `FastAPI(...).connection_pool`,
+    replica queries are routed with optional `FastAPI(...).replica_router`
     """
-    return PostgresConnector(logger=logger, pool=app.connection_pool)  # type: ignore
+    return PostgresConnector(
+        logger=logger,
+        pool=app.connection_pool,  # type: ignore
+        replica_router=getattr(app, "replica_router", None),
+    )
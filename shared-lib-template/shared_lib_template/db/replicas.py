@@ -0,0 +1,147 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+
+import asyncpg
+
+
+logger = logging.getLogger(__name__)
+
+
+REPLICA_LAG_QUERY = """
+    select case
+               when not pg_is_in_recovery()
+                 or pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() then 0
+               else extract(epoch from now() - pg_last_xact_replay_timestamp())
+           end as lag
+"""
+
+
+@dataclass
+class Replica:
+    """Read replica pool and its health"""
+
+    name: str
+    pool: asyncpg.pool.Pool
+    lag: float | None = None
+    is_healthy: bool = False
+    reads: int = 0
+    failures: int = 0
+
+
+class ReplicaRouter:
+    """
+    Routes replica queries between read replicas.
+
+    Replica lag is checked every `check_interval` seconds, replica lagging more than
+    `max_lag` seconds or failed to answer is not used until next successful check.
+    `choose` returns `None` when there is no healthy replica, so queries are read from
+    primary.
+    """
+
+    def __init__(
+        self,
+        replicas: list[Replica],
+        max_lag: float,
+        check_interval: float,
+    ) -> None:
+        self._replicas = replicas
+        self._max_lag = max_lag
+        self._check_interval = check_interval
+        self._task: asyncio.Task | None = None
+        self._next_replica = 0
+        self._fallbacks = 0
+
+    async def start(self) -> None:
+        """Check replicas and start periodic checks"""
+        await self.check()
+        self._task = asyncio.create_task(
+            self._check_periodically(), name="postgres-replica-router"
+        )
+        logger.info("Started replica router for %s", [r.name for r in self._replicas])
+
+    async def close(self) -> None:
+        """Stop checks and close replica pools"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        await asyncio.gather(*(replica.pool.close() for replica in self._replicas))
+
+    def choose(self) -> Replica | None:
+        """Get next healthy replica in round-robin order"""
+        healthy_replicas = [r for r in self._replicas if r.is_healthy]
+        if not healthy_replicas:
+            self._fallbacks += 1
+            return None
+
+        self._next_replica = (self._next_replica + 1) % len(healthy_replicas)
+        replica = healthy_replicas[self._next_replica]
+        replica.reads += 1
+
+        return replica
+
+    def mark_failed(self, replica: Replica, error: Exception) -> None:
+        """Stop using replica until next successful check"""
+        replica.is_healthy = False
+        replica.failures += 1
+        self._fallbacks += 1
+        logger.warning(
+            "Replica %s failed, reading from primary: %s", replica.name, error
+        )
+
+    async def check(self) -> None:
+        """Update lag and health of all replicas"""
+        await asyncio.gather(*(self._check_replica(r) for r in self._replicas))
+
+    def metrics(self) -> dict[str, float]:
+        """Lag, health, reads and failures of every replica, reads fallen back to primary"""
+        metrics: dict[str, float] = {"fallbacks": self._fallbacks}
+
+        for replica in self._replicas:
+            metrics[f"{replica.name}.lag"] = (
+                replica.lag if replica.lag is not None else -1
+            )
+            metrics[f"{replica.name}.healthy"] = replica.is_healthy
+            metrics[f"{replica.name}.reads"] = replica.reads
+            metrics[f"{replica.name}.failures"] = replica.failures
+
+        return metrics
+
+    async def _check_replica(self, replica: Replica) -> None:
+        try:
+            lag = await asyncio.wait_for(
+                replica.pool.fetchval(REPLICA_LAG_QUERY), timeout=self._check_interval
+            )
+        except (
+            OSError,
+            asyncio.TimeoutError,
+            asyncpg.exceptions.InterfaceError,
+            asyncpg.exceptions.PostgresError,
+        ) as e:
+            if replica.is_healthy:
+                logger.warning("Replica %s is unavailable: %s", replica.name, e)
+            replica.lag = None
+            replica.is_healthy = False
+            return None
+
+        replica.lag = float(lag) if lag is not None else None
+        is_healthy = replica.lag is not None and replica.lag <= self._max_lag
+
+        if is_healthy != replica.is_healthy:
+            logger.info(
+                "Replica %s is %s, lag %s s",
+                replica.name,
+                "healthy" if is_healthy else "lagging",
+                replica.lag,
+            )
+        replica.is_healthy = is_healthy
+
+    async def _check_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._check_interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error("Failed to check replicas: %s", e)
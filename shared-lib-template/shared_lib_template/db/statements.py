@@ -0,0 +1,119 @@
+import logging
+from dataclasses import dataclass
+
+import asyncpg
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StatementStats:
+    """Execution stats of registered statement"""
+
+    calls: int = 0
+    errors: int = 0
+    total_seconds: float = 0
+    max_seconds: float = 0
+
+
+class StatementRegistry:
+    """
+    Registry of named queries.
+
+    Registered queries are prepared on every pool connection when it is opened
+    (see `prepare_registered_statements`), connector collects their execution
+    stats by name. Queries registered as replica ones are read from healthy read
+    replica when it is configured, they must tolerate replica lag.
+    """
+
+    def __init__(self) -> None:
+        self._queries: dict[str, str] = {}
+        self._names: dict[str, str] = {}
+        self._stats: dict[str, StatementStats] = {}
+        self._replica_queries: set[str] = set()
+
+    def register(self, name: str, query: str, replica: bool = False) -> str:
+        """Register query under unique name. Returns query to pass to connector"""
+        if self._queries.get(name, query) != query:
+            raise ValueError(f"Statement `{name}` is already registered")
+
+        self._queries[name] = query
+        self._names[query] = name
+        self._stats.setdefault(name, StatementStats())
+        if replica:
+            self._replica_queries.add(query)
+
+        return query
+
+    def get_query(self, name: str) -> str:
+        """Get registered query by name"""
+        return self._queries[name]
+
+    def get_name(self, query: str) -> str | None:
+        """Get name of registered query, `None` for not registered one"""
+        return self._names.get(query)
+
+    def is_replica_query(self, query: str) -> bool:
+        """Check query may be read from replica"""
+        return query in self._replica_queries
+
+    def items(self) -> list[tuple[str, str]]:
+        """Registered names and queries"""
+        return list(self._queries.items())
+
+    def record(self, name: str, seconds: float, is_failed: bool = False) -> None:
+        """Record statement execution"""
+        stats = self._stats[name]
+        stats.calls += 1
+        stats.errors += is_failed
+        stats.total_seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+
+    def get_stats(self, name: str) -> StatementStats:
+        """Get execution stats of statement"""
+        return self._stats[name]
+
+    def metrics(self) -> dict[str, float]:
+        """Calls, errors, average and max execution time of every statement"""
+        metrics: dict[str, float] = {}
+
+        for name, stats in self._stats.items():
+            metrics[f"{name}.calls"] = stats.calls
+            metrics[f"{name}.errors"] = stats.errors
+            metrics[f"{name}.avg_ms"] = (
+                stats.total_seconds / stats.calls * 1000 if stats.calls else 0
+            )
+            metrics[f"{name}.max_ms"] = stats.max_seconds * 1000
+
+        return metrics
+
+
+statement_registry = StatementRegistry()
+
+
+def register_statement(name: str, query: str, replica: bool = False) -> str:
+    """Register query in process-wide statement registry.
+    Read-only queries tolerating replica lag may be registered with `replica=True`"""
+    return statement_registry.register(name=name, query=query, replica=replica)
+
+
+async def prepare_registered_statements(connection: asyncpg.Connection) -> None:
+    """
+    Pool `init` hook: prepare all registered statements on new connection.
+
+    Statements are put into connection statement cache, the one queries executed
+    by text are looked up in, so prepared statements survive connection release
+    to pool, unlike `Connection.prepare` ones. Statements failed to prepare are
+    prepared on first execution as before
+    """
+    for name, query in statement_registry.items():
+        try:
+            # Public `Connection.prepare` bypasses statement cache (`use_cache=False`),
+            # so private `_get_statement(query, timeout, use_cache=...)` of asyncpg
+            # 0.29 is used. Its signature is checked by tests on asyncpg upgrade
+            await connection._get_statement(  # pylint: disable=W0212
+                query, None, use_cache=True
+            )
+        except asyncpg.exceptions.PostgresError as e:
+            logger.warning("Failed to prepare statement `%s`: %s", name, e)
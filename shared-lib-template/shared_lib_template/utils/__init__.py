@@ -1,8 +1,24 @@
-from shared_lib_template.utils.http_request_mixin import HttpRequestMixin
+from shared_lib_template.utils.circuit_breaker import (
+    CircuitBreakerOpenError,
+    circuit_breaker_registry,
+)
+from shared_lib_template.utils.http_client_session import (
+    create_http_client_session,
+    get_http_client_session,
+)
+from shared_lib_template.utils.http_request_mixin import HttpRequestMixin, RetryOptions
 from shared_lib_template.utils.raise_http_exception import raise_http_exception
+from shared_lib_template.utils.retry_budget import decorrelated_jitter, retry_budget
 
 
 __all__ = [
+    "CircuitBreakerOpenError",
+    "circuit_breaker_registry",
+    "create_http_client_session",
+    "decorrelated_jitter",
+    "get_http_client_session",
     "HttpRequestMixin",
     "raise_http_exception",
+    "retry_budget",
+    "RetryOptions",
 ]
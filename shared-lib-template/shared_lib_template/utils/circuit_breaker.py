@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import time
+from types import TracebackType
+from typing import Callable
+
+from shared_lib_template.constants import CircuitBreakerState
+
+
+logger = logging.getLogger(__name__)
+
+# State exported to metrics as number
+CIRCUIT_BREAKER_STATE_METRICS = {
+    CircuitBreakerState.CLOSED: 0,
+    CircuitBreakerState.HALF_OPEN: 1,
+    CircuitBreakerState.OPEN: 2,
+}
+
+
+class CircuitBreakerOpenError(Exception):
+    """Call is rejected, circuit breaker of endpoint is open"""
+
+    def __init__(self, endpoint: str, retry_after: float) -> None:
+        super().__init__(
+            f"Circuit breaker of `{endpoint}` is open, retry after {retry_after:.1f}s"
+        )
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of single endpoint.
+
+    Breaker opens after `failure_threshold` consecutive failed calls and rejects
+    calls with `CircuitBreakerOpenError` for `recovery_timeout` seconds. Then it is
+    half-open: single probe call is let through, its success closes breaker, its
+    failure opens it again. Exceptions not matched by `is_failure` do not count,
+    they mean endpoint answered. Results of calls started before last state change
+    are ignored, so late call does not close opened breaker or release probe.
+
+    Usage:
+        async with breaker.call():
+            await call_endpoint()
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        failure_threshold: int,
+        recovery_timeout: float,
+        is_failure: Callable[[BaseException], bool] = lambda e: True,
+    ) -> None:
+        self.endpoint = endpoint
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._is_failure = is_failure
+        self._state = CircuitBreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        # Incremented on every state change, calls remember one they started in
+        self._generation = 0
+        self._is_probe_running = False
+        self._transitions = {state: 0 for state in CircuitBreakerState}
+        self._rejected = 0
+
+    @property
+    def state(self) -> CircuitBreakerState:
+        """Current state, open breaker becomes half-open after recovery timeout"""
+        if (
+            self._state == CircuitBreakerState.OPEN
+            and time.monotonic() - self._opened_at >= self._recovery_timeout
+        ):
+            self._set_state(CircuitBreakerState.HALF_OPEN)
+
+        return self._state
+
+    def call(self) -> "CircuitBreakerCall":
+        """Guard single call of endpoint"""
+        return CircuitBreakerCall(breaker=self)
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds left until breaker lets probe call through"""
+        if self._state == CircuitBreakerState.CLOSED:
+            return 0
+
+        return max(self._opened_at + self._recovery_timeout - time.monotonic(), 0)
+
+    def metrics(self) -> dict[str, float]:
+        """State, transitions to every state and rejected calls"""
+        metrics: dict[str, float] = {
+            "state": CIRCUIT_BREAKER_STATE_METRICS[self.state],
+            "rejected": self._rejected,
+        }
+        for state, transitions in self._transitions.items():
+            metrics[f"transitions.{state}"] = transitions
+
+        return metrics
+
+    def _start_call(self) -> tuple[int, bool]:
+        """
+        Let call through or raise `CircuitBreakerOpenError`.
+        Returns state generation call started in and whether it is probe
+        """
+        state = self.state
+
+        if state == CircuitBreakerState.CLOSED:
+            return self._generation, False
+
+        if state == CircuitBreakerState.HALF_OPEN and not self._is_probe_running:
+            self._is_probe_running = True
+            return self._generation, True
+
+        self._rejected += 1
+        raise CircuitBreakerOpenError(
+            endpoint=self.endpoint, retry_after=self.retry_after
+        )
+
+    def _finish_call(
+        self, generation: int, is_probe: bool, exc: BaseException | None
+    ) -> None:
+        """Record result of call started in state `generation`"""
+        if is_probe:
+            self._is_probe_running = False
+
+        if generation != self._generation or isinstance(exc, asyncio.CancelledError):
+            return None
+
+        if exc is not None and self._is_failure(exc):
+            self._record_failure(exc)
+        else:
+            self._record_success()
+
+    def _record_success(self) -> None:
+        self._failures = 0
+        if self._state != CircuitBreakerState.CLOSED:
+            self._set_state(CircuitBreakerState.CLOSED)
+
+    def _record_failure(self, exc: BaseException) -> None:
+        self._failures += 1
+        if (
+            self._state == CircuitBreakerState.HALF_OPEN
+            or self._failures >= self._failure_threshold
+        ) and self._state != CircuitBreakerState.OPEN:
+            logger.warning(
+                "Opening circuit breaker of `%s` after %s failures: %s",
+                self.endpoint,
+                self._failures,
+                exc,
+            )
+            self._opened_at = time.monotonic()
+            self._set_state(CircuitBreakerState.OPEN)
+
+    def _set_state(self, state: CircuitBreakerState) -> None:
+        logger.info(
+            "Circuit breaker of `%s`: %s -> %s", self.endpoint, self._state, state
+        )
+        self._state = state
+        self._generation += 1
+        self._transitions[state] += 1
+
+
+class CircuitBreakerCall:
+    """Single call guarded by circuit breaker, see `CircuitBreaker.call`"""
+
+    def __init__(self, breaker: CircuitBreaker) -> None:
+        self._breaker = breaker
+        self._generation = 0
+        self._is_probe = False
+
+    async def __aenter__(self) -> None:
+        self._generation, self._is_probe = self._breaker._start_call()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._breaker._finish_call(
+            generation=self._generation, is_probe=self._is_probe, exc=exc
+        )
+
+
+class CircuitBreakerRegistry:
+    """Process-wide circuit breakers by endpoint"""
+
+    def __init__(self) -> None:
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(
+        self,
+        endpoint: str,
+        failure_threshold: int,
+        recovery_timeout: float,
+        is_failure: Callable[[BaseException], bool] = lambda e: True,
+    ) -> CircuitBreaker:
+        """Get breaker of endpoint, created with given options on first call"""
+        if (breaker := self._breakers.get(endpoint)) is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker(
+                endpoint=endpoint,
+                failure_threshold=failure_threshold,
+                recovery_timeout=recovery_timeout,
+                is_failure=is_failure,
+            )
+
+        return breaker
+
+    def metrics(self) -> dict[str, float]:
+        """Metrics of every breaker prefixed with its endpoint"""
+        return {
+            f"{endpoint}.{name}": value
+            for endpoint, breaker in self._breakers.items()
+            for name, value in breaker.metrics().items()
+        }
+
+
+circuit_breaker_registry = CircuitBreakerRegistry()
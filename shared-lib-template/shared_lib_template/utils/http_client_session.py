@@ -0,0 +1,25 @@
+import aiohttp
+from fastapi import FastAPI
+from shared_lib_template.types import TypeBaseSettings
+
+
+async def create_http_client_session(
+    settings: TypeBaseSettings,
+) -> aiohttp.ClientSession:
+    """Create app-scoped http client session with keep-alive connection pool"""
+    connector = aiohttp.TCPConnector(
+        limit=settings.HTTP_CONNECTION_LIMIT,
+        limit_per_host=settings.HTTP_CONNECTION_LIMIT_PER_HOST,
+        ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+    )
+
+    return aiohttp.ClientSession(connector=connector)
+
+
+def get_http_client_session(app: FastAPI) -> aiohttp.ClientSession | None:
+    """
+    Get app-scoped http client session.
+    There is Need to initialize session in attribute of app class: `FastAPI(...).http_client_session`
+    """
+    return getattr(app, "http_client_session", None)
@@ -1,8 +1,11 @@
+import asyncio
 import logging
-from typing import Any
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+from urllib.parse import urlsplit
 
 import aiohttp
-from aiohttp_retry import ExponentialRetry, RetryClient
 from shared_lib_template.constants import RETRY_STATUSES
 from shared_lib_template.types import (
     HeadersType,
@@ -10,13 +13,43 @@ from shared_lib_template.types import (
     RetryStatusesType,
     TypeBaseSettings,
 )
+from shared_lib_template.utils.circuit_breaker import (
+    CircuitBreaker,
+    circuit_breaker_registry,
+)
+from shared_lib_template.utils.retry_budget import decorrelated_jitter, retry_budget
 
 
 logger = logging.getLogger(__name__)
 
 
+def is_endpoint_failure(e: BaseException) -> bool:
+    """Check request error means endpoint is unavailable, not that request is invalid"""
+    if isinstance(e, aiohttp.ClientResponseError):
+        return e.status >= 500 or e.status in RETRY_STATUSES
+
+    return isinstance(e, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+@dataclass
+class RetryOptions:
+    """Retries of http request on server errors and `statuses`"""
+
+    attempts: int
+    start_timeout: float
+    max_timeout: float
+    statuses: RetryStatusesType
+
+
 class HttpRequestMixin:
-    """Mixin for sending http requests"""
+    """
+    Mixin for sending http requests.
+
+    Requests to every endpoint (url without query) pass its process-wide circuit
+    breaker, requests to unavailable endpoint fail fast with `CircuitBreakerOpenError`.
+    Failed requests are retried with decorrelated jitter while process-wide retry
+    budget allows
+    """
 
     def __init__(
         self,
@@ -25,13 +58,15 @@ class HttpRequestMixin:
         start_timeout: float | None = None,
         headers: dict | None = None,
         retry_statuses: RetryStatusesType | None = None,
+        client_session: aiohttp.ClientSession | None = None,
     ) -> None:
         self._base_settings = settings
+        self._client_session = client_session
 
-        self._retry_options: ExponentialRetry = ExponentialRetry(
+        self._retry_options = RetryOptions(
             attempts=retry_attempts or settings.DEFAULT_API_RETRY_COUNT,
             start_timeout=start_timeout or settings.DEFAULT_API_RETRY_START_TIMEOUT,
-            retry_all_server_errors=True,
+            max_timeout=settings.DEFAULT_API_RETRY_MAX_TIMEOUT,
             statuses=retry_statuses or RETRY_STATUSES,
         )
         self._headers = headers or {}
@@ -42,47 +77,98 @@ class HttpRequestMixin:
         headers: HeadersType | None = None,
         data: Any | None = None,
         json: JsonType | None = None,
-        retry_options: ExponentialRetry | None = None,
+        retry_options: RetryOptions | None = None,
     ) -> dict:
         """Post request"""
-        retry_config = self._retry_options
-        if retry_options is not None:
-            retry_config = retry_options
-
-        if not headers:
-            headers = self._headers
-
-        async with aiohttp.ClientSession() as session:
-            retry_client = RetryClient(
-                client_session=session,
-                retry_options=retry_config,
-                logger=logger,
-                raise_for_status=True,
-            )
-            response = await retry_client.post(
-                url,
-                data=data,
-                json=json,
-                headers=headers,
-                ssl=self._base_settings.DEFAULT_VERIFY_SSL,
-            )
-            return await response.json(content_type=None)
+        return await self._request(
+            "POST",
+            url,
+            retry_options=retry_options or self._retry_options,
+            headers=headers or self._headers,
+            data=data,
+            json=json,
+        )
 
     async def get(self, url: str, headers: dict[str, Any] | None = None) -> dict:
         """Get request"""
-        if not headers:
-            headers = self._headers
+        return await self._request(
+            "GET",
+            url,
+            retry_options=self._retry_options,
+            headers=headers or self._headers,
+        )
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        retry_options: RetryOptions,
+        **kwargs: Any,
+    ) -> dict:
+        """Send request, retry it on server errors and retry statuses"""
+        circuit_breaker = self._get_circuit_breaker(url=url)
+        attempt = 1
+        delay = retry_options.start_timeout
+
+        async with circuit_breaker.call(), self._get_client_session() as session:
+            # Request rejected by open circuit breaker is not sent, so it does not
+            # add to retry budget
+            retry_budget.record_request()
+
+            while True:
+                async with session.request(
+                    method,
+                    url,
+                    ssl=self._base_settings.DEFAULT_VERIFY_SSL,
+                    **kwargs,
+                ) as response:
+                    if not (
+                        attempt < retry_options.attempts
+                        and (
+                            response.status >= 500
+                            or response.status in retry_options.statuses
+                        )
+                        and retry_budget.try_retry()
+                    ):
+                        response.raise_for_status()
+                        return await response.json(content_type=None)
+
+                delay = decorrelated_jitter(
+                    base=retry_options.start_timeout,
+                    previous=delay,
+                    cap=retry_options.max_timeout,
+                )
+                logger.warning(
+                    "Retrying %s %s after response code %s in %.2fs, attempt %s out of %s",
+                    method,
+                    url,
+                    response.status,
+                    delay,
+                    attempt + 1,
+                    retry_options.attempts,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def _get_circuit_breaker(self, url: str) -> CircuitBreaker:
+        """Get process-wide circuit breaker of url endpoint"""
+        url_parts = urlsplit(url)
+        return circuit_breaker_registry.get(
+            endpoint=f"{url_parts.netloc}{url_parts.path}",
+            failure_threshold=self._base_settings.HTTP_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            recovery_timeout=self._base_settings.HTTP_CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+            is_failure=is_endpoint_failure,
+        )
+
+    @asynccontextmanager
+    async def _get_client_session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """
+        Yields app-scoped session if it was provided, else short-lived one.
+        App-scoped session is not closed here, it keeps connections alive between requests
+        """
+        if self._client_session is not None and not self._client_session.closed:
+            yield self._client_session
+            return
 
         async with aiohttp.ClientSession() as session:
-            retry_client = RetryClient(
-                client_session=session,
-                retry_options=self._retry_options,
-                logger=logger,
-                raise_for_status=True,
-            )
-            response = await retry_client.get(
-                url,
-                headers=headers,
-                ssl=self._base_settings.DEFAULT_VERIFY_SSL,
-            )
-            return await response.json(content_type=None)
+            yield session
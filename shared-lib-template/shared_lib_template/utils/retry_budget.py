@@ -0,0 +1,109 @@
+import logging
+import random
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+def decorrelated_jitter(base: float, previous: float, cap: float) -> float:
+    """
+    Delay before next retry: random between `base` and three previous delays,
+    capped. Retries of concurrent callers spread out instead of coming in waves
+    """
+    return min(cap, random.uniform(base, max(previous, base) * 3))
+
+
+class RetryBudget:
+    """
+    Process-wide budget of retries.
+
+    Retry is allowed while retries within last `window` seconds make at most `ratio`
+    of requests, plus `min_retries_per_second` so that rarely used process still
+    retries. When dependency fails for everyone, retries are cut at this share of
+    load instead of multiplying it by number of attempts of every layer.
+
+    Usage:
+        retry_budget.record_request()
+        ...
+        if retry_budget.try_retry():
+            retry()
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_retries_per_second: float = 1,
+        window: int = 10,
+    ) -> None:
+        self.configure(
+            ratio=ratio,
+            min_retries_per_second=min_retries_per_second,
+            window=window,
+        )
+        self._requests = 0
+        self._retries = 0
+        self._rejected = 0
+
+    def configure(
+        self, ratio: float, min_retries_per_second: float, window: int
+    ) -> None:
+        """Set budget options, counted requests and retries are reset"""
+        if window <= 0:
+            raise ValueError(f"Retry budget window must be positive, got {window}")
+        if ratio < 0 or min_retries_per_second < 0:
+            raise ValueError(
+                "Retry budget ratio and minimal retries must not be negative"
+            )
+
+        self._ratio = ratio
+        self._min_retries = min_retries_per_second * window
+        self._window = window
+        # Requests and retries of every second of window, by second modulo window
+        self._window_requests = [0] * window
+        self._window_retries = [0] * window
+        self._second = int(time.monotonic())
+
+    def record_request(self) -> None:
+        """Count first attempt of request"""
+        self._advance()
+        self._window_requests[self._second % self._window] += 1
+        self._requests += 1
+
+    def try_retry(self) -> bool:
+        """Take retry from budget. Returns `False` if budget is exhausted"""
+        self._advance()
+        budget = self._min_retries + self._ratio * sum(self._window_requests)
+
+        if sum(self._window_retries) >= budget:
+            self._rejected += 1
+            logger.warning("Retry budget is exhausted, %.0f retries in window", budget)
+            return False
+
+        self._window_retries[self._second % self._window] += 1
+        self._retries += 1
+
+        return True
+
+    def metrics(self) -> dict[str, float]:
+        """Requests, retries and retries rejected by exhausted budget"""
+        return {
+            "requests": self._requests,
+            "retries": self._retries,
+            "rejected": self._rejected,
+        }
+
+    def _advance(self) -> None:
+        """Clear counters of seconds that left window"""
+        second = int(time.monotonic())
+
+        for passed in range(
+            self._second + 1, min(second, self._second + self._window) + 1
+        ):
+            self._window_requests[passed % self._window] = 0
+            self._window_retries[passed % self._window] = 0
+
+        self._second = max(second, self._second)
+
+
+retry_budget = RetryBudget()
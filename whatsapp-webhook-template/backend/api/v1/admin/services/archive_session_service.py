@@ -39,11 +39,12 @@ class ArchiveSessionService:
 
         logger.info("Archiving sessions for users %s", user_ids)
 
-        for user_id in user_ids:
-            await self._session_repository.archive_user_sessions(
-                user_id=user_id,
-                archive_flag=True,
-            )
+        async with self._postgres_conn.unit_of_work():
+            for user_id in user_ids:
+                await self._session_repository.archive_user_sessions(
+                    user_id=user_id,
+                    archive_flag=True,
+                )
 
         return True
 
@@ -1,10 +1,10 @@
 import hashlib
+import hmac
 import logging
 
-from fastapi import Body, Header, Query, status
+from fastapi import Header, Query, Request, status
 
 from backend.api.v1.auth import constants
-from backend.api.v1.webhook.models import WhatsappWebhookUpdates
 from backend.core.utils import raise_http_exception
 from backend.settings import get_settings
 
@@ -19,12 +19,12 @@ class WhatsappTokenValidatorService:
         self,
         token: str | None = None,
         signature: str | None = None,
-        data: WhatsappWebhookUpdates | None = None,
+        body: bytes | None = None,
     ) -> None:
         self._settings = get_settings()
         self._token = token
         self._signature = signature
-        self._data = data
+        self._body = body
 
     async def validate(self) -> None:
         """Process of token validation"""
@@ -41,10 +41,10 @@ class WhatsappTokenValidatorService:
         is_valid_token = self._token and self._is_valid_token(token=self._token)
         is_valid_signature = not self._settings.WHATSAPP_VALIDATE_SIGNATURE or (
             self._signature
-            and self._data
+            and self._body
             and self._is_valid_signature(
                 signature=self._signature,
-                data=self._data,
+                body=self._body,
             )
         )
         if not (is_valid_token or is_valid_signature):
@@ -59,22 +59,24 @@ class WhatsappTokenValidatorService:
         """Validate token"""
         return token == self._settings.WHATSAPP_WEBHOOK_TOKEN
 
-    def _is_valid_signature(self, signature: str, data: WhatsappWebhookUpdates) -> bool:
-        """Validate signature"""
+    def _is_valid_signature(self, signature: str, body: bytes) -> bool:
+        """Validate HMAC-SHA256 signature of raw request body"""
         if not self._settings.WHATSAPP_VALIDATE_SIGNATURE and not self._token:
             logger.warning(
                 "Skipping message signature check as flag WHATSAPP_VALIDATE_SIGNATURE disabled"
             )
             return True
 
-        sha256_hash = hashlib.sha256()
-        sha256_hash.update(
-            data.model_dump_json().encode("utf-8")
-        )  # TODO: figure out whatsapp encoding  # pylint: disable=W0511
-        sha256_hash.update(self._settings.WHATSAPP_WEBHOOK_TOKEN.encode("utf-8"))
-        calculated_signature = sha256_hash.hexdigest()
+        secret = (
+            self._settings.WHATSAPP_APP_SECRET or self._settings.WHATSAPP_WEBHOOK_TOKEN
+        )
+        calculated_signature = hmac.new(
+            secret.encode("utf-8"), body, hashlib.sha256
+        ).hexdigest()
 
-        is_valid_signature = signature.removeprefix("sha256=") == calculated_signature
+        is_valid_signature = hmac.compare_digest(
+            signature.removeprefix("sha256="), calculated_signature
+        )
 
         if not is_valid_signature:
             logger.debug(
@@ -91,13 +93,13 @@ class WhatsappTokenValidator:
 
     async def __call__(
         self,
+        request: Request,
         token: str = Query(None, alias="hub.verify_token", include_in_schema=False),
         signature: str = Header(
             None, alias="x-hub-signature-256", include_in_schema=False
         ),
-        data: WhatsappWebhookUpdates = Body(None, include_in_schema=False),
     ):
         _validator_service = WhatsappTokenValidatorService(
-            token=token, signature=signature, data=data
+            token=token, signature=signature, body=await request.body()
         )
         await _validator_service.validate()
@@ -5,3 +5,4 @@ class APIResponseMessageTemplate(AppStringEnum):
     """Template messages for API response"""
 
     VERSION_INFO = "App vesrion"
+    METRICS_INFO = "App worker metrics"
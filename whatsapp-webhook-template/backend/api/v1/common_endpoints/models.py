@@ -15,3 +15,10 @@ class AppVersionAPIResponse(APIResponse):
 
     message: str = constants.APIResponseMessageTemplate.VERSION_INFO
     payload: AppVersionPayload
+
+
+class AppMetricsAPIResponse(APIResponse):
+    """App worker metrics API response"""
+
+    message: str = constants.APIResponseMessageTemplate.METRICS_INFO
+    payload: dict[str, dict[str, float]]
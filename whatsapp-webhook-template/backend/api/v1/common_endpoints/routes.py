@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends
 
 from backend.api.v1.auth.services.token_validator import AppTokenValidator
 from backend.api.v1.common_endpoints import examples, models
+from backend.core.metrics import collect_metrics
 from backend.core.utils import make_response
 from backend.settings import Settings, get_settings
 
@@ -33,6 +34,25 @@ async def get_app_version(settings: Settings = Depends(get_settings)):
     )
 
 
+@router.get(
+    "/metrics",
+    response_model=models.AppMetricsAPIResponse,
+    name="info_get_app_metrics",
+    responses={
+        401: examples.default_unauthorized_example_response,
+        403: examples.default_forbidden_example_response,
+    },
+    dependencies=[
+        Depends(AppTokenValidator()),
+    ],
+)
+async def get_app_metrics():
+    """Get app worker metrics"""
+    return await make_response(
+        api_response=models.AppMetricsAPIResponse(payload=collect_metrics())
+    )
+
+
 @health_check_router.get(
     "/health_check",
     name="common_health_check",
@@ -5,6 +5,7 @@ class APIResponseMessageTemplate(AppStringEnum):
     """Template messages for API response"""
 
     VERSION_INFO = "App vesrion"
+    INVALID_WEBHOOK_UPDATES = "Request body is not Whatsapp webhook updates"
 
 
 MESSAGING_PRODUCT = "whatsapp"
@@ -15,3 +16,8 @@ OPENAI_ASSISTANT_DATE_FORMAT = "%-d %b %Y"
 FIRST_USER_MESSAGE_TEMPLATE = "{message}\n\nTODAY UTC: {date}. Rely on this date!"
 
 CONCATENATED_BOT_MESSAGE_PLACEHOLDER = "Replied in message with id {message_id}"
+
+# Idempotency key of bot reply, echoed back in statuses of sent reply
+REPLY_CALLBACK_DATA_PREFIX = "reply:"
+
+MESSAGE_PROCESSING_CHANNEL = "webhook_message_processing"
@@ -20,3 +20,19 @@ can_not_access_api_example_response = generate_example_response(
     response_examples=_can_not_access_api_example,
     description=HTTPCodesMessage.HTTP_500_INTERNAL_SERVER_ERROR,
 )
+
+
+_invalid_webhook_updates_example = {
+    "summary": "invalid webhook updates",
+    "value": {
+        "status": "error",
+        "status_code": 422,
+        "message": "Request body is not Whatsapp webhook updates",
+        "payload": None,
+    },
+}
+
+invalid_webhook_updates_example_response = generate_example_response(
+    response_examples=_invalid_webhook_updates_example,
+    description=HTTPCodesMessage.HTTP_422_UNPROCESSABLE_ENTITY,
+)
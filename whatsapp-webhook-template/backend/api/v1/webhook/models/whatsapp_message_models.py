@@ -40,6 +40,7 @@ class WhatsappEntryChangeValueStatus(BaseModel):
     status: str
     timestamp: str
     recipient_id: str
+    biz_opaque_callback_data: str | None = None
 
 
 class WhatsappEntryChangeValue(BaseModel):
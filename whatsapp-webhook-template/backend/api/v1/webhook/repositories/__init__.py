@@ -1,9 +1,15 @@
 from backend.api.v1.webhook.repositories.gpt_response import GptResponseRepository
 from backend.api.v1.webhook.repositories.message import MessageRepository
+from backend.api.v1.webhook.repositories.message_pending import (
+    MessagePendingRepository,
+)
 from backend.api.v1.webhook.repositories.message_processing import (
     MessageProcessingRepository,
 )
 from backend.api.v1.webhook.repositories.message_status import MessageStatusRepository
+from backend.api.v1.webhook.repositories.send_rate_limit import (
+    SendRateLimitRepository,
+)
 from backend.api.v1.webhook.repositories.session import SessionRepository
 from backend.api.v1.webhook.repositories.user import UserRepository
 
@@ -11,8 +17,10 @@ from backend.api.v1.webhook.repositories.user import UserRepository
 __all__ = [
     "GptResponseRepository",
     "MessageRepository",
+    "MessagePendingRepository",
     "MessageProcessingRepository",
     "MessageStatusRepository",
+    "SendRateLimitRepository",
     "SessionRepository",
     "UserRepository",
 ]
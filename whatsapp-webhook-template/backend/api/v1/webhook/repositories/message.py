@@ -1,12 +1,122 @@
-from pydantic import TypeAdapter
-from shared_lib_template.db import PostgresConnectorInterface
+from shared_lib_template.db import PostgresConnectorInterface, register_statement
 
-from backend.core.constants import MessageStatus
-from backend.core.models import MessageInfo
-from backend.core.models.repository.delivered_message_info import DeliveredMessageInfo
+from backend.core.constants import (
+    CommunicationChannel,
+    MessageProcessingStep,
+    MessageStatus,
+)
+from backend.core.mapping import map_row, map_rows
+from backend.core.models import MessageInfo, MessageIngestInfo
 from backend.core.models.repository.dialog_history import DialogHistory
 
 
+INGEST_MESSAGES_QUERY = register_statement(
+    name="message.ingest_messages",
+    query="""
+        select
+            user_id,
+            session_id,
+            is_new_session,
+            message_id,
+            status_id,
+            is_duplicate,
+            processing_step,
+            bot_message
+          from webhook.ingest_messages($1, $2, $3, $4, $5, $6, $7, $8, $9)
+    """,
+)
+
+
+GET_MESSAGE_HISTORY_QUERY = register_statement(
+    name="message.get_message_history",
+    query="""
+        select user_message, bot_message
+          from webhook.message m
+          join webhook.message_status ms
+            on ms.message_id = m.message_id
+           and ms.status in ($1, $2, $3)
+         where m.session_id = $4
+         order by m.received_timestamp
+    """,
+    replica=True,
+)
+
+
+GET_MESSAGE_STATUS_QUERY = register_statement(
+    name="message.get_message_status",
+    query="""
+        select ms.status
+          from webhook.message m
+          join webhook.message_status ms
+            on ms.message_id = m.message_id
+         where m.message_id = $1
+    """,
+)
+
+
+UPDATE_MESSAGE_REPLIED_TIMESTAMP_QUERY = register_statement(
+    name="message.update_message_replied_timestamp",
+    query="""
+        update webhook.message
+           set replied_timestamp = to_timestamp($1),
+               wa_reply_message_id = coalesce($3, wa_reply_message_id),
+               processing_step = $4
+         where message_id = $2
+    """,
+)
+
+
+UPDATE_MESSAGE_PROCESSING_STEP_QUERY = register_statement(
+    name="message.update_message_processing_step",
+    query="""
+        update webhook.message
+           set processing_step = $1
+         where message_id = $2
+    """,
+)
+
+
+RECORD_REPLY_MESSAGE_IDS_QUERY = register_statement(
+    name="message.record_reply_message_ids",
+    query="""
+        update webhook.message m
+           set wa_reply_message_id = r.wa_reply_message_id,
+               replied_timestamp = coalesce(m.replied_timestamp, to_timestamp(r.timestamp)),
+               processing_step = $4
+          from unnest($1::int[], $2::varchar[], $3::bigint[])
+               as r(message_id, wa_reply_message_id, timestamp)
+         where m.message_id = r.message_id
+           and m.wa_reply_message_id is null
+           and not exists (
+                select 1
+                  from webhook.message mr
+                 where mr.wa_reply_message_id = r.wa_reply_message_id
+           )
+        returning m.message_id
+    """,
+)
+
+
+UPDATE_MESSAGE_BOT_RESPONSE_QUERY = register_statement(
+    name="message.update_message_bot_response",
+    query="""
+        update webhook.message
+           set bot_message = $1
+         where message_id = $2
+    """,
+)
+
+
+UPDATE_MESSAGE_CONCATENATED_MESSAGE_ID_QUERY = register_statement(
+    name="message.update_message_concatenated_message_id",
+    query="""
+        update webhook.message
+           set concatenated_message_id = $1
+         where message_id = $2
+    """,
+)
+
+
 class MessageRepository:
     """Service to work with messages"""
 
@@ -39,17 +149,47 @@ class MessageRepository:
 
         result = await self._conn.get_query_result_as_dict(query, wa_message_id)
 
-        return TypeAdapter(MessageInfo).validate_python(result) if result else None
+        return map_row(MessageInfo, result)
+
+    async def ingest_messages(
+        self,
+        user_name: str,
+        phone_number: str,
+        phone_number_id: str,
+        channel: CommunicationChannel,
+        wa_message_ids: list[str],
+        user_messages: list[str],
+        received_timestamps: list[int],
+        status: MessageStatus,
+        status_timestamp: int,
+    ) -> list[MessageIngestInfo]:
+        """
+        Ingest inbound messages of one user in one round trip, in given order
+        (see `webhook.ingest_messages` DB function): get or create user, skip message
+        if it is already processing or replied, get active session or create new one,
+        create message, processing and status entries. Retried messages are returned
+        with their last completed processing step and stored bot reply
+        """
+        query = INGEST_MESSAGES_QUERY
+
+        result = await self._conn.get_query_result_as_list(
+            query,
+            user_name,
+            phone_number,
+            phone_number_id,
+            channel,
+            wa_message_ids,
+            user_messages,
+            received_timestamps,
+            status,
+            status_timestamp,
+        )
+
+        return map_rows(MessageIngestInfo, result)
 
     async def get_message_status(self, message_id: int) -> str:
         """Get message status by id"""
-        query = """
-            select ms.status
-              from webhook.message m
-              join webhook.message_status ms
-                on ms.message_id = m.message_id
-             where m.message_id = $1
-        """
+        query = GET_MESSAGE_STATUS_QUERY
 
         result = await self._conn.get_query_result_as_dict(query, message_id)
 
@@ -80,53 +220,49 @@ class MessageRepository:
         return result["message_id"] if result else None
 
     async def get_message_history(self, session_id: int) -> list[DialogHistory]:
-        """Get session dialog history"""
-        query = """
-            select user_message, bot_message
-              from webhook.message m
-              join webhook.message_status ms
-                on ms.message_id = m.message_id
-               and ms.status in ($1, $2, $3)
-             where m.session_id = $4
-             order by m.received_timestamp
-        """
-
+        """Get session dialog history, may be read from replica"""
         result = await self._conn.get_query_result_as_list(
-            query,
+            GET_MESSAGE_HISTORY_QUERY,
             MessageStatus.DELIVERED,
             MessageStatus.OPENED,
             MessageStatus.CONCATENATED,
             session_id,
         )
 
-        return TypeAdapter(list[DialogHistory]).validate_python(result)
+        return map_rows(DialogHistory, result)
 
-    async def get_user_delivered_messages(
+    async def update_processing_step(
         self,
-        phone_number: str,
-    ) -> list[DeliveredMessageInfo]:
-        """Get all messages in status `delivered`"""
-        query = """
-            select
-                m.message_id,
-                ms.status_id message_status_id,
-                u.user_id
-              from webhook.message_status ms
-              join webhook.message m
-                on ms.message_id = m.message_id
-              join webhook.session s
-                on s.session_id = m.session_id
-              join webhook.user u
-                on u.user_id = s.user_id
-               and u.phone_number = $1
-             where ms.status = $2
+        message_id: int,
+        processing_step: str,
+    ) -> None:
+        """Checkpoint last completed processing step of message"""
+        query = UPDATE_MESSAGE_PROCESSING_STEP_QUERY
+
+        await self._conn.execute_query(query, processing_step, message_id)
+
+    async def record_reply_message_ids(
+        self,
+        message_ids: list[int | None],
+        wa_reply_message_ids: list[str],
+        timestamps: list[int],
+    ) -> list[int]:
+        """
+        Checkpoint replies known only from status webhooks: reply was sent but its
+        Whatsapp id was not saved. Statuses without replied message id are ignored.
+        Returns updated message ids
         """
+        query = RECORD_REPLY_MESSAGE_IDS_QUERY
 
         result = await self._conn.get_query_result_as_list(
-            query, phone_number, MessageStatus.DELIVERED
+            query,
+            message_ids,
+            wa_reply_message_ids,
+            timestamps,
+            MessageProcessingStep.REPLIED,
         )
 
-        return TypeAdapter(list[DeliveredMessageInfo]).validate_python(result)
+        return [row["message_id"] for row in result]
 
     async def update_message(
         self,
@@ -134,10 +270,13 @@ class MessageRepository:
         replied_timestamp: int | None = None,
         bot_message: str | None = None,
         concatenated_message_id: int | None = None,
+        wa_reply_message_id: str | None = None,
     ) -> None:
         """Update message instance"""
         if replied_timestamp:
-            await self._update_message_replied_timestamp(message_id, replied_timestamp)
+            await self._update_message_replied_timestamp(
+                message_id, replied_timestamp, wa_reply_message_id
+            )
 
         if bot_message:
             await self._update_message_bot_response(message_id, bot_message)
@@ -152,18 +291,17 @@ class MessageRepository:
         self,
         message_id: int,
         replied_timestamp: int,
+        wa_reply_message_id: str | None = None,
     ) -> None:
-        """Updates message reply timestamp"""
-        query = """
-            update webhook.message
-               set replied_timestamp = to_timestamp($1)
-             where message_id = $2
-        """
+        """Updates message reply timestamp and Whatsapp id of reply, checkpoints reply"""
+        query = UPDATE_MESSAGE_REPLIED_TIMESTAMP_QUERY
 
         await self._conn.execute_query(
             query,
             replied_timestamp,
             message_id,
+            wa_reply_message_id,
+            MessageProcessingStep.REPLIED,
         )
 
     async def _update_message_bot_response(
@@ -172,11 +310,7 @@ class MessageRepository:
         bot_message: str,
     ) -> None:
         """Updates message bot reply"""
-        query = """
-            update webhook.message
-               set bot_message = $1
-             where message_id = $2
-        """
+        query = UPDATE_MESSAGE_BOT_RESPONSE_QUERY
 
         await self._conn.execute_query(
             query,
@@ -190,11 +324,7 @@ class MessageRepository:
         concatenated_message_id: int,
     ) -> None:
         """Updates message concatenated message id"""
-        query = """
-            update webhook.message
-               set concatenated_message_id = $1
-             where message_id = $2
-        """
+        query = UPDATE_MESSAGE_CONCATENATED_MESSAGE_ID_QUERY
 
         await self._conn.execute_query(
             query,
@@ -0,0 +1,149 @@
+from shared_lib_template.db import PostgresConnectorInterface, register_statement
+
+from backend.core.mapping import map_rows
+from backend.core.models import MessagePendingInfo
+
+
+CREATE_MESSAGE_PENDING_QUERY = register_statement(
+    name="message_pending.create_message_pending",
+    query="""
+        insert into webhook.message_pending(entry)
+        values ($1::jsonb)
+        returning message_pending_id
+    """,
+)
+
+
+CLAIM_MESSAGES_PENDING_QUERY = register_statement(
+    name="message_pending.claim_messages_pending",
+    query="""
+        update webhook.message_pending mp
+           set attempts = mp.attempts + 1,
+               available_at = now() + make_interval(secs => $2)
+         where mp.message_pending_id in (
+                select message_pending_id
+                  from webhook.message_pending
+                 where available_at <= now()
+                 order by available_at
+                 limit $1
+                   for update skip locked
+         )
+        returning
+            mp.message_pending_id,
+            mp.entry,
+            mp.attempts
+    """,
+)
+
+
+RELEASE_MESSAGE_PENDING_QUERY = register_statement(
+    name="message_pending.release_message_pending",
+    query="""
+        update webhook.message_pending
+           set available_at = now() + make_interval(secs => $2)
+         where message_pending_id = $1
+    """,
+)
+
+
+EXTEND_MESSAGES_PENDING_QUERY = register_statement(
+    name="message_pending.extend_messages_pending",
+    query="""
+        update webhook.message_pending
+           set available_at = now() + make_interval(secs => $2)
+         where message_pending_id = any($1::int[])
+    """,
+)
+
+
+PARK_MESSAGE_PENDING_QUERY = register_statement(
+    name="message_pending.park_message_pending",
+    query="""
+        update webhook.message_pending
+           set attempts = greatest(attempts - 1, 0),
+               available_at = now() + make_interval(secs => $2)
+         where message_pending_id = $1
+    """,
+)
+
+
+DELETE_MESSAGE_PENDING_QUERY = register_statement(
+    name="message_pending.delete_message_pending",
+    query="""
+        delete from webhook.message_pending
+         where message_pending_id = $1
+    """,
+)
+
+
+class MessagePendingRepository:
+    """Service to work with pending webhook updates queue"""
+
+    def __init__(
+        self,
+        conn: PostgresConnectorInterface,
+    ) -> None:
+        self._conn = conn
+
+    async def create_message_pending(self, entry: str) -> int:
+        """Put raw JSON webhook updates to queue"""
+        query = CREATE_MESSAGE_PENDING_QUERY
+
+        result = await self._conn.get_query_result_as_dict(query, entry)
+
+        return result["message_pending_id"]
+
+    async def claim_messages_pending(
+        self,
+        limit: int,
+        visibility_timeout: float,
+    ) -> list[MessagePendingInfo]:
+        """
+        Lock available updates, skipping ones locked by other consumers.
+        Claimed updates are hidden from other consumers for `visibility_timeout` seconds
+        """
+        query = CLAIM_MESSAGES_PENDING_QUERY
+
+        result = await self._conn.get_query_result_as_list(
+            query, limit, visibility_timeout
+        )
+
+        return map_rows(MessagePendingInfo, result)
+
+    async def release_message_pending(
+        self,
+        message_pending_id: int,
+        delay: float,
+    ) -> None:
+        """Return updates to queue, available again after `delay` seconds"""
+        query = RELEASE_MESSAGE_PENDING_QUERY
+
+        await self._conn.execute_query(query, message_pending_id, delay)
+
+    async def extend_messages_pending(
+        self,
+        message_pending_ids: list[int],
+        visibility_timeout: float,
+    ) -> None:
+        """Keep claimed updates hidden from other consumers for `visibility_timeout`
+        more seconds"""
+        query = EXTEND_MESSAGES_PENDING_QUERY
+
+        await self._conn.execute_query(query, message_pending_ids, visibility_timeout)
+
+    async def park_message_pending(
+        self,
+        message_pending_id: int,
+        delay: float,
+    ) -> None:
+        """Return updates to queue without counting failed attempt,
+        available again after `delay` seconds"""
+        query = PARK_MESSAGE_PENDING_QUERY
+
+        await self._conn.execute_query(query, message_pending_id, delay)
+
+    async def delete_message_pending(self, message_pending_id: int) -> None:
+        """Remove processed updates from queue"""
+        query = DELETE_MESSAGE_PENDING_QUERY
+
+        await self._conn.execute_query(query, message_pending_id)
@@ -1,9 +1,98 @@
-from pydantic import TypeAdapter
-from shared_lib_template.db import PostgresConnectorInterface
+from shared_lib_template.db import PostgresConnectorInterface, register_statement
 
+from backend.core.mapping import map_rows
 from backend.core.models import MessageProcessingInfo
 
 
+IS_MESSAGE_PROCESSING_QUERY = register_statement(
+    name="message_processing.is_message_processing",
+    query="""
+        select 1
+          from webhook.message_processing
+         where message_id = $1
+    """,
+)
+
+
+GET_PROCESSING_MESSAGES_QUERY = register_statement(
+    name="message_processing.get_processing_messages",
+    query="""
+        select distinct
+            mp.message_id,
+            m.user_message,
+            m.received_timestamp,
+            m.concatenated_message_id
+          from webhook.message_processing mp
+          join webhook.session s
+            on s.session_id = mp.session_id
+           and not s.is_archived
+          join webhook.message m
+            on m.message_id = mp.message_id
+         where mp.session_id = $1
+         order by m.received_timestamp
+    """,
+)
+
+
+CLAIM_PROCESSING_MESSAGES_QUERY = register_statement(
+    name="message_processing.claim_processing_messages",
+    query="""
+        with claimed as (
+            update webhook.message m
+               set concatenated_message_id = lm.message_id
+              from webhook.message lm
+             where lm.message_id = $2
+               and m.session_id = $1
+               and m.message_id <> lm.message_id
+               and m.concatenated_message_id is null
+               and m.bot_message is null
+               and (m.received_timestamp, m.message_id) < (lm.received_timestamp, lm.message_id)
+               and exists (
+                    select 1
+                      from webhook.message_processing mp
+                     where mp.message_id = m.message_id
+               )
+            returning
+                m.message_id,
+                m.user_message,
+                m.received_timestamp,
+                m.concatenated_message_id
+        )
+        select message_id, user_message, concatenated_message_id
+          from claimed
+         order by received_timestamp, message_id
+    """,
+)
+
+
+CREATE_PROCESSING_MESSAGE_QUERY = register_statement(
+    name="message_processing.create_processing_message",
+    query="""
+        insert into webhook.message_processing(message_id, session_id)
+        values ($1, $2)
+    """,
+)
+
+
+DELETE_MESSAGE_PROCESSING_ENTRIES_QUERY = register_statement(
+    name="message_processing.delete_message_processing_entries",
+    query="""
+        delete from webhook.message_processing
+         where message_id = any($1::int[])
+    """,
+)
+
+
+DELETE_EXPIRED_MESSAGE_PROCESSING_ENTRIES_QUERY = register_statement(
+    name="message_processing.delete_expired_message_processing_entries",
+    query="""
+        delete from webhook.message_processing
+         where created_at < now() - make_interval(secs => $1)
+        returning message_id
+    """,
+)
+
+
 class MessageProcessingRepository:
     """Service to work with message processing"""
 
@@ -18,11 +107,7 @@ class MessageProcessingRepository:
         message_id: int,
     ) -> bool:
         """Get phone_number_id from DB"""
-        query = """
-            select 1
-              from webhook.message_processing
-             where message_id = $1
-        """
+        query = IS_MESSAGE_PROCESSING_QUERY
 
         result = await self._conn.get_query_result_as_dict(query, message_id)
 
@@ -34,43 +119,55 @@ class MessageProcessingRepository:
     ) -> list[MessageProcessingInfo]:
         """Get processing messages for active session"""
 
-        query = """
-            select distinct
-                mp.message_id,
-                m.user_message,
-                m.received_timestamp,
-                m.concatenated_message_id
-              from webhook.message_processing mp
-              join webhook.session s
-                on s.session_id = mp.session_id
-               and not s.is_archived
-              join webhook.message m
-                on m.message_id = mp.message_id
-             where mp.session_id = $1
-             order by m.received_timestamp
-        """
+        query = GET_PROCESSING_MESSAGES_QUERY
 
         result = await self._conn.get_query_result_as_list(query, session_id)
 
-        return TypeAdapter(list[MessageProcessingInfo]).validate_python(result)
+        return map_rows(MessageProcessingInfo, result)
+
+    async def claim_processing_messages(
+        self,
+        session_id: int,
+        message_id: int,
+    ) -> list[MessageProcessingInfo]:
+        """
+        Mark not replied processing messages received before `message_id` as concatenated into it.
+        Returns claimed messages, each message can be claimed only once
+        """
+
+        query = CLAIM_PROCESSING_MESSAGES_QUERY
+
+        result = await self._conn.get_query_result_as_list(
+            query, session_id, message_id
+        )
+
+        return map_rows(MessageProcessingInfo, result)
 
     async def create_processing_message(self, message_id: int, session_id: int) -> None:
         """Create message processing entry in DB"""
-        query = """
-            insert into webhook.message_processing(message_id, session_id)
-            values ($1, $2)
-        """
+        query = CREATE_PROCESSING_MESSAGE_QUERY
 
         await self._conn.execute_query(query, message_id, session_id)
 
-    async def delete_message_processing_entry(
+    async def delete_message_processing_entries(
         self,
-        message_id: int,
+        message_ids: list[int],
     ) -> None:
-        """Updates message status"""
-        query = """
-            delete from webhook.message_processing
-             where message_id = $1
+        """Delete processing entries of messages in one statement"""
+        query = DELETE_MESSAGE_PROCESSING_ENTRIES_QUERY
+
+        await self._conn.execute_query(query, message_ids)
+
+    async def delete_expired_message_processing_entries(
+        self,
+        ttl: float,
+    ) -> list[int]:
         """
+        Delete processing entries older than `ttl` seconds, left by crashed workers.
+        Returns ids of released messages
+        """
+        query = DELETE_EXPIRED_MESSAGE_PROCESSING_ENTRIES_QUERY
+
+        result = await self._conn.get_query_result_as_list(query, ttl)
 
-        await self._conn.execute_query(query, message_id)
+        return [row["message_id"] for row in result]
@@ -1,4 +1,86 @@
-from shared_lib_template.db import PostgresConnectorInterface
+from shared_lib_template.db import PostgresConnectorInterface, register_statement
+
+from backend.core.constants import MessageStatus
+
+
+# Status of replied message only moves forward in this order, whether it comes from
+# reply sending or from reply status webhook. Statuses outside of it rank lowest
+MESSAGE_STATUS_RANK: list[str] = [
+    MessageStatus.DELIVERED,
+    MessageStatus.FAILED_TO_SEND,
+    MessageStatus.OPENED,
+]
+
+
+UPDATE_MESSAGE_STATUS_QUERY = register_statement(
+    name="message_status.update_message_status",
+    query="""
+        update webhook.message_status
+           set status = $1
+         where status_id = $2
+    """,
+)
+
+
+UPDATE_MESSAGE_STATUS_AND_PROCESSING_STEP_QUERY = register_statement(
+    name="message_status.update_message_status_and_processing_step",
+    query="""
+        with updated_status as (
+            update webhook.message_status
+               set status = $1
+             where status_id = $2
+        )
+        update webhook.message m
+           set processing_step = $3
+          from webhook.message_status ms
+         where ms.status_id = $2
+           and m.message_id = ms.message_id
+    """,
+)
+
+
+UPDATE_SENT_MESSAGE_STATUS_QUERY = register_statement(
+    name="message_status.update_sent_message_status",
+    query="""
+        with updated_status as (
+            update webhook.message_status
+               set status = $1
+             where status_id = $2
+               and array_position($3::varchar[], $1)
+                   > coalesce(array_position($3::varchar[], status), 0)
+        )
+        update webhook.message m
+           set processing_step = $4
+          from webhook.message_status ms
+         where ms.status_id = $2
+           and m.message_id = ms.message_id
+    """,
+)
+
+
+UPDATE_REPLY_STATUSES_QUERY = register_statement(
+    name="message_status.update_reply_statuses",
+    query="""
+        update webhook.message_status ms
+           set status = s.status,
+               timestamp = to_timestamp(s.timestamp)
+          from (
+                select distinct on (m.message_id)
+                    m.message_id,
+                    u.status,
+                    u.timestamp
+                  from unnest($1::varchar[], $2::varchar[], $3::bigint[])
+                       as u(wa_reply_message_id, status, timestamp)
+                  join webhook.message m
+                    on m.wa_reply_message_id = u.wa_reply_message_id
+                 order by m.message_id, array_position($4::varchar[], u.status) desc
+          ) s
+         where ms.message_id = s.message_id
+           and array_position($4::varchar[], s.status)
+               > coalesce(array_position($4::varchar[], ms.status), 0)
+        returning ms.message_id
+    """,
+)
 
 
 class MessageStatusRepository:
@@ -73,10 +155,58 @@ class MessageStatusRepository:
         status: str,
     ) -> None:
         """Updates message status"""
-        query = """
-            update webhook.message_status
-               set status = $1
-             where status_id = $2
-        """
+        query = UPDATE_MESSAGE_STATUS_QUERY
 
         await self._conn.execute_query(query, status, status_id)
+
+    async def update_message_status_and_processing_step(
+        self,
+        status_id: int,
+        status: str,
+        processing_step: str,
+    ) -> None:
+        """Updates message status and checkpoints processing step in one statement"""
+        query = UPDATE_MESSAGE_STATUS_AND_PROCESSING_STEP_QUERY
+
+        await self._conn.execute_query(query, status, status_id, processing_step)
+
+    async def update_sent_message_status(
+        self,
+        status_id: int,
+        status: str,
+        processing_step: str,
+    ) -> None:
+        """
+        Updates status by result of reply sending and checkpoints processing step
+        in one statement. Status only moves forward (see `MESSAGE_STATUS_RANK`),
+        so status from reply status webhook that came before sending result is not
+        rolled back, while processing step is checkpointed anyway
+        """
+        query = UPDATE_SENT_MESSAGE_STATUS_QUERY
+
+        await self._conn.execute_query(
+            query, status, status_id, MESSAGE_STATUS_RANK, processing_step
+        )
+
+    async def update_reply_statuses(
+        self,
+        wa_reply_message_ids: list[str],
+        statuses: list[MessageStatus],
+        timestamps: list[int],
+    ) -> list[int]:
+        """
+        Apply statuses of outbound messages in one statement, keyed by reply Whatsapp id.
+        Status only moves forward (see `MESSAGE_STATUS_RANK`), so late or repeated
+        webhooks do not roll it back. Returns updated message ids
+        """
+        query = UPDATE_REPLY_STATUSES_QUERY
+
+        result = await self._conn.get_query_result_as_list(
+            query,
+            wa_reply_message_ids,
+            statuses,
+            timestamps,
+            MESSAGE_STATUS_RANK,
+        )
+
+        return [row["message_id"] for row in result]
@@ -0,0 +1,54 @@
+from shared_lib_template.db import PostgresConnectorInterface, register_statement
+
+
+RESERVE_SEND_TOKEN_QUERY = register_statement(
+    name="send_rate_limit.reserve_send_token",
+    query="""
+        insert into webhook.send_rate_limit as l (key, tokens, updated_at)
+        values ($1, $3::float8 - 1, clock_timestamp())
+            on conflict (key) do update
+           set tokens = least(
+                   $3::float8,
+                   l.tokens + extract(epoch from clock_timestamp() - l.updated_at)::float8 * $2::float8
+               ) - 1,
+               updated_at = clock_timestamp()
+        returning greatest(-l.tokens / $2::float8, 0) as delay
+    """,
+)
+
+
+DELETE_IDLE_SEND_RATE_LIMITS_QUERY = register_statement(
+    name="send_rate_limit.delete_idle_send_rate_limits",
+    query="""
+        delete from webhook.send_rate_limit
+         where updated_at < now() - make_interval(secs => $1)
+    """,
+)
+
+
+class SendRateLimitRepository:
+    """Service to work with token buckets of outbound messages shared by workers"""
+
+    def __init__(self, conn: PostgresConnectorInterface) -> None:
+        self._conn = conn
+
+    async def reserve_send_token(
+        self,
+        key: str,
+        rate: float,
+        burst: int,
+    ) -> float | None:
+        """
+        Take token from bucket refilled with `rate` tokens per second up to `burst`.
+        Tokens are taken in debt, returns seconds to wait before taken token
+        is available, `None` if bucket is not available
+        """
+        result = await self._conn.get_query_result_as_dict(
+            RESERVE_SEND_TOKEN_QUERY, key, rate, burst
+        )
+
+        return result["delay"] if result else None
+
+    async def delete_idle_send_rate_limits(self, idle_seconds: float) -> None:
+        """Delete buckets not used for `idle_seconds`, ones refilled to burst"""
+        await self._conn.execute_query(DELETE_IDLE_SEND_RATE_LIMITS_QUERY, idle_seconds)
@@ -1,14 +1,40 @@
 import logging
 
-from pydantic import TypeAdapter
-from shared_lib_template.db import PostgresConnectorInterface
+from shared_lib_template.db import PostgresConnectorInterface, register_statement
 
+from backend.core.mapping import map_row
 from backend.core.models import UserInfo
 
 
 logger = logging.getLogger(__name__)
 
 
+GET_USER_IDS_BY_PHONE_NUMBER_QUERY = register_statement(
+    name="user.get_user_ids_by_phone_number",
+    query="""
+        select user_id
+          from webhook.user
+         where phone_number = $1
+    """,
+    replica=True,
+)
+
+
+GET_USER_FULL_INFO_QUERY = register_statement(
+    name="user.get_user_full_info",
+    query="""
+        select
+            user_id,
+            user_name,
+            phone_number,
+            phone_number_id
+          from webhook.user
+         where user_id = $1
+    """,
+    replica=True,
+)
+
+
 class UserRepository:
     """Service to work with users"""
 
@@ -86,14 +112,10 @@ class UserRepository:
         self,
         phone_number: str,
     ) -> list[int]:
-        """Get user_ids from DB by phone number"""
-        query = """
-            select user_id
-              from webhook.user
-             where phone_number = $1
-        """
-
-        result = await self._conn.get_query_result_as_list(query, phone_number)
+        """Get user_ids from DB by phone number, may be read from replica"""
+        result = await self._conn.get_query_result_as_list(
+            GET_USER_IDS_BY_PHONE_NUMBER_QUERY, phone_number
+        )
 
         return [v["user_id"] for v in result]
 
@@ -132,18 +154,9 @@ class UserRepository:
         return result["phone_number_id"] if result else None
 
     async def get_user_full_info(self, user_id: int) -> UserInfo | None:
-        """Get full user info by ID"""
-        query = """
-            select
-                user_id,
-                user_name,
-                phone_number,
-                phone_number_id,
-                opt_in_status
-              from webhook.user
-             where user_id = $1
-        """
-
-        result = await self._conn.get_query_result_as_dict(query, user_id)
+        """Get full user info by ID, may be read from replica"""
+        result = await self._conn.get_query_result_as_dict(
+            GET_USER_FULL_INFO_QUERY, user_id
+        )
 
-        return TypeAdapter(UserInfo).validate_python(result) if result else None
+        return map_row(UserInfo, result)
@@ -1,8 +1,7 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, Header, Query, Request
+from fastapi import APIRouter, Depends, Header, Query, Request
 
 from backend.api.v1.auth.services import WhatsappTokenValidator
 from backend.api.v1.webhook import examples
-from backend.api.v1.webhook.models import WhatsappWebhookUpdates
 from backend.api.v1.webhook.services import WhatsappService
 
 
@@ -42,6 +41,7 @@ async def whatsapp_webhook_health_check(
     responses={
         401: examples.default_unauthorized_example_response,
         403: examples.default_forbidden_example_response,
+        422: examples.invalid_webhook_updates_example_response,
         500: examples.can_not_access_api_example_response,
     },
     dependencies=[
@@ -50,15 +50,12 @@ async def whatsapp_webhook_health_check(
 )
 async def whatsapp_webhook_process(
     request: Request,
-    data: WhatsappWebhookUpdates,
-    background_tasks: BackgroundTasks,
     service: WhatsappService = Depends(),
     signature: str = Header(None, alias="x-hub-signature-256"),  # pylint: disable=W0613
 ):
-    """Whatsapp Webhooks service processings"""
+    """Whatsapp Webhooks service processings. Body is validated by queue consumer"""
     await service.process_updates(
-        data=data,
+        body=await request.body(),
         app=request.app,
-        background_tasks=background_tasks,
     )
     return "OK"
@@ -1,10 +1,24 @@
+import json
 import logging
+from typing import Any
 
-from fastapi import BackgroundTasks, FastAPI
+from fastapi import FastAPI, status
+from shared_lib_template.db.postgres import get_postgres_connector
 
-from backend.api.v1.webhook.models import WhatsappWebhookUpdates
+from backend.api.v1.webhook.constants import APIResponseMessageTemplate
+from backend.api.v1.webhook.repositories import MessagePendingRepository
+from backend.core.constants import MessageQueueOverflowPolicy
+from backend.core.utils import raise_http_exception
 from backend.settings import get_settings
-from backend.tasks.message_processing import process_message
+from backend.tasks.message_processing.message_queue_consumer import (
+    get_message_queue_consumer,
+)
+from backend.tasks.message_processing.processing_scheduler import (
+    get_processing_scheduler,
+)
+from backend.tasks.message_processing.recent_message_filter import (
+    get_recent_message_filter,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -19,13 +33,117 @@ class WhatsappService:
     async def process_updates(
         self,
         app: FastAPI,
-        data: WhatsappWebhookUpdates,
-        background_tasks: BackgroundTasks,
+        body: bytes,
     ) -> None:
-        """Process Whatsapp updates"""
+        """
+        Put raw Whatsapp updates to processing queue after cheap structural check.
+        Redelivered updates whose messages were all recently ingested are not queued
+        """
 
         logger.info("Received webhook from whatsapp")
 
-        background_tasks.add_task(process_message, data, app)
+        data = _parse_whatsapp_webhook_updates(body=body)
+        if data is None:
+            await raise_http_exception(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                message=APIResponseMessageTemplate.INVALID_WEBHOOK_UPDATES,
+            )
 
-        logger.info("Webhook processed, created background processing task")
+        recent_message_filter = get_recent_message_filter(app=app)
+        if recent_message_filter and recent_message_filter.is_all_duplicates(
+            _get_message_ids_without_statuses(data=data)
+        ):
+            logger.info("Webhook messages were recently ingested, skipping")
+            return
+
+        processing_scheduler = get_processing_scheduler(app=app)
+        if processing_scheduler and processing_scheduler.is_full():
+            processing_scheduler.record_overflow()
+            if not await self._apply_overflow_policy():
+                return
+
+        postgres_conn = get_postgres_connector(logger=logger, app=app)
+        try:
+            message_pending_id = await MessagePendingRepository(
+                conn=postgres_conn
+            ).create_message_pending(entry=body.decode("utf-8"))
+        finally:
+            await postgres_conn.close()
+
+        if message_queue_consumer := get_message_queue_consumer(app=app):
+            await message_queue_consumer.wakeup()
+
+        logger.info("Webhook processed, queued pending message %s", message_pending_id)
+
+    async def _apply_overflow_policy(self) -> bool:
+        """Handle update received while processing queue is full. Returns whether to enqueue it"""
+        overflow_policy = self._settings.WHATSAPP_MESSAGE_QUEUE_OVERFLOW_POLICY
+
+        if overflow_policy == MessageQueueOverflowPolicy.SHED:
+            logger.warning("Processing queue is full, webhook update is dropped")
+            return False
+
+        if overflow_policy == MessageQueueOverflowPolicy.REJECT:
+            await raise_http_exception(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                message="Processing queue is full, retry later",
+                headers={
+                    "Retry-After": str(
+                        self._settings.WHATSAPP_MESSAGE_QUEUE_RETRY_AFTER_SECONDS
+                    )
+                },
+            )
+
+        logger.warning(
+            "Processing queue is full, webhook update is spilled to database"
+        )
+        return True
+
+
+def _parse_whatsapp_webhook_updates(body: bytes) -> dict | None:
+    """
+    Parse JSON body if it has webhook updates shape, fields are validated by queue consumer.
+    Returns `None` if it has not
+    """
+    try:
+        data: Any = json.loads(body)
+    except ValueError:
+        return None
+
+    is_updates = (
+        isinstance(data, dict)
+        and isinstance(data.get("object"), str)
+        and isinstance(data.get("entry", []), list)
+        and all(
+            isinstance(entry, dict) and isinstance(entry.get("changes", []), list)
+            for entry in data.get("entry", [])
+        )
+    )
+
+    return data if is_updates else None
+
+
+def _get_message_ids_without_statuses(data: dict) -> list[str]:
+    """
+    Get Whatsapp ids of messages of all entry changes. Returns empty list if updates
+    have statuses or message without id, so they are queued anyway
+    """
+    wa_message_ids = []
+
+    for entry in data.get("entry", []):
+        for change in entry.get("changes", []):
+            value = change.get("value") if isinstance(change, dict) else None
+            if not isinstance(value, dict):
+                return []
+
+            if value.get("statuses"):
+                return []
+
+            for message in value.get("messages") or []:
+                wa_message_id = message.get("id") if isinstance(message, dict) else None
+                if not isinstance(wa_message_id, str):
+                    return []
+
+                wa_message_ids.append(wa_message_id)
+
+    return wa_message_ids
@@ -1,3 +1,8 @@
+from backend.core.constants.message_processing_step import MessageProcessingStep
+from backend.core.constants.message_queue_overflow_policy import (
+    MessageQueueOverflowPolicy,
+)
+from backend.core.constants.whatsapp_message_status import WhatsappMessageStatus
 from backend.core.constants.whatsapp_message_type import WhatsappMessageType
 from backend.core.constants.whatsapp_template_language import WhatsappTemplateLanguage
 from shared_lib_template.constants import (
@@ -7,6 +12,7 @@ from shared_lib_template.constants import (
     CommunicationChannel,
     HTTPCodesMessage,
     MessageStatus,
+    TransactionIsolationLevel,
 )
 
 
@@ -15,8 +21,12 @@ __all__ = [
     "ApplicationMode",
     "CommunicationChannel",
     "HTTPCodesMessage",
+    "MessageProcessingStep",
+    "MessageQueueOverflowPolicy",
     "RETRY_STATUSES",
     "MessageStatus",
+    "TransactionIsolationLevel",
+    "WhatsappMessageStatus",
     "WhatsappMessageType",
     "WhatsappTemplateLanguage",
 ]
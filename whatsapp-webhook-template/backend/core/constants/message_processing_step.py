@@ -0,0 +1,10 @@
+from shared_lib_template.constants.base import AppStringEnum
+
+
+class MessageProcessingStep(AppStringEnum):
+    """Last completed step of inbound message processing, retries resume after it"""
+
+    RECEIVED = "received"
+    READ_MARKED = "read_marked"
+    REPLIED = "replied"
+    STATUS_UPDATED = "status_updated"
@@ -0,0 +1,9 @@
+from shared_lib_template.constants.base import AppStringEnum
+
+
+class MessageQueueOverflowPolicy(AppStringEnum):
+    """What to do with incoming webhook when processing queue is full"""
+
+    SPILL = "spill"
+    REJECT = "reject"
+    SHED = "shed"
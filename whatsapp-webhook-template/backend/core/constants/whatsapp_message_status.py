@@ -0,0 +1,10 @@
+from shared_lib_template.constants.base import AppStringEnum
+
+
+class WhatsappMessageStatus(AppStringEnum):
+    """Status of outbound Whatsapp message from status webhook"""
+
+    SENT = "sent"
+    DELIVERED = "delivered"
+    READ = "read"
+    FAILED = "failed"
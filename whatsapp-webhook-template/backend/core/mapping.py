@@ -0,0 +1,27 @@
+from functools import lru_cache
+from typing import Any, Mapping, Sequence, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+
+M = TypeVar("M", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(type_: Any) -> TypeAdapter:
+    """Get process-wide adapter of type. Building adapter compiles its validator,
+    so it must not be done per call"""
+    return TypeAdapter(type_)
+
+
+def map_row(model: type[M], row: Mapping[str, Any] | None) -> M | None:
+    """Build model from query result row, `None` for empty result"""
+    if not row:
+        return None
+
+    return get_type_adapter(model).validate_python(row)
+
+
+def map_rows(model: type[M], rows: Sequence[Mapping[str, Any]]) -> list[M]:
+    """Build models from query result rows in one validator call"""
+    return get_type_adapter(list[model]).validate_python(rows)  # type: ignore[valid-type]
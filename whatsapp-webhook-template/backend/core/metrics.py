@@ -0,0 +1,32 @@
+import logging
+from typing import Callable
+
+
+logger = logging.getLogger(__name__)
+
+MetricsSource = Callable[[], dict[str, float]]
+
+_metrics_sources: dict[str, MetricsSource] = {}
+
+
+def register_metrics_source(name: str, source: MetricsSource) -> None:
+    """Register process-wide metrics source, replaces source with the same name"""
+    _metrics_sources[name] = source
+
+
+def unregister_metrics_source(name: str) -> None:
+    """Remove metrics source"""
+    _metrics_sources.pop(name, None)
+
+
+def collect_metrics() -> dict[str, dict[str, float]]:
+    """Collect current values of all registered metrics sources"""
+    metrics = {}
+
+    for name, source in _metrics_sources.items():
+        try:
+            metrics[name] = source()
+        except Exception as e:
+            logger.error("Failed to collect %s metrics: %s", name, e)
+
+    return metrics
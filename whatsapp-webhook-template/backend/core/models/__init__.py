@@ -1,7 +1,8 @@
 from backend.core.models.api_response import APIResponse, ErrorAPIResponse
-from backend.core.models.repository.delivered_message_info import DeliveredMessageInfo
 from backend.core.models.repository.dialog_history import DialogHistory
 from backend.core.models.repository.message_info import MessageInfo
+from backend.core.models.repository.message_ingest import MessageIngestInfo
+from backend.core.models.repository.message_pending import MessagePendingInfo
 from backend.core.models.repository.message_processing import (
     MessageProcessingCallbackInfo,
     MessageProcessingInfo,
@@ -14,9 +15,10 @@ from backend.core.models.repository.user_info import UserInfo
 __all__ = [
     "APIResponse",
     "ErrorAPIResponse",
-    "DeliveredMessageInfo",
     "DialogHistory",
     "MessageInfo",
+    "MessageIngestInfo",
+    "MessagePendingInfo",
     "MessageProcessingCallbackInfo",
     "MessageProcessingInfo",
     "ProcessEntryCallback",
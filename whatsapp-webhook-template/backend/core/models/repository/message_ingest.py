@@ -0,0 +1,15 @@
+from backend.core.constants import MessageProcessingStep
+from pydantic import BaseModel
+
+
+class MessageIngestInfo(BaseModel):
+    """Result of inbound message ingest"""
+
+    user_id: int
+    session_id: int | None = None
+    is_new_session: bool = False
+    message_id: int
+    status_id: int | None = None
+    is_duplicate: bool
+    processing_step: str = MessageProcessingStep.RECEIVED
+    bot_message: str | None = None
@@ -1,8 +1,9 @@
-from pydantic import BaseModel
+from typing import Any
 
-from backend.api.v1.webhook.models import WhatsappWebhookUpdates
+from pydantic import BaseModel, Json
 
 
 class MessagePendingInfo(BaseModel):
     message_pending_id: int
-    entry: WhatsappWebhookUpdates
+    entry: Json[dict[str, Any]]
+    attempts: int
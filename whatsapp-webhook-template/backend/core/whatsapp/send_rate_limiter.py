@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import time
+
+from backend.api.v1.webhook.repositories import SendRateLimitRepository
+from backend.core.metrics import register_metrics_source
+from backend.settings import get_settings
+from fastapi import FastAPI
+from shared_lib_template.db.postgres import get_postgres_connector
+
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled with `rate` tokens per second up to `burst`.
+
+    Tokens are taken in debt: caller gets token at once and waits returned delay,
+    so waiting callers are served in order and throughput settles at `rate`
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take token. Returns seconds to wait before token is available"""
+        now = time.monotonic()
+        self._tokens = (
+            min(self._burst, self._tokens + (now - self._updated_at) * self._rate) - 1
+        )
+        self._updated_at = now
+
+        return max(-self._tokens / self._rate, 0)
+
+    def is_full(self) -> bool:
+        """Check bucket is refilled, so it may be dropped"""
+        elapsed = time.monotonic() - self._updated_at
+        return self._tokens + elapsed * self._rate >= self._burst
+
+
+class SendRateLimiter:
+    """
+    Paces outbound Whatsapp messages by business phone number and by recipient.
+
+    Sends wait for recipient token first and for phone number token then, so sends
+    to throttled recipient do not hold phone number throughput. With `is_shared`
+    buckets are kept in Postgres and shared by all workers, local buckets are used
+    when Postgres is not available.
+    """
+
+    def __init__(
+        self,
+        app: FastAPI,
+        rate: float,
+        burst: int,
+        recipient_rate: float,
+        recipient_burst: int,
+        is_shared: bool = False,
+        max_buckets: int = 10000,
+    ) -> None:
+        self._app = app
+        self._rate = rate
+        self._burst = burst
+        self._recipient_rate = recipient_rate
+        self._recipient_burst = recipient_burst
+        self._is_shared = is_shared
+        self._max_buckets = max_buckets
+        self._buckets: dict[str, TokenBucket] = {}
+        # Bucket idle for this time is refilled, it is equal to new one
+        self._idle_seconds = max(burst / rate, recipient_burst / recipient_rate)
+        self._task: asyncio.Task | None = None
+        self._sends = 0
+        self._throttled = 0
+        self._wait_seconds = 0.0
+
+    def start(self) -> None:
+        """Start cleanup of idle shared buckets"""
+        if not self._is_shared:
+            return None
+
+        self._task = asyncio.create_task(
+            self._delete_idle_buckets_periodically(), name="send-rate-limiter"
+        )
+
+    async def close(self) -> None:
+        """Stop cleanup of idle shared buckets"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def acquire(self, phone_number_id: str, phone_number: str) -> float:
+        """Wait for send slot of business phone number and recipient.
+        Returns waited seconds"""
+        waited = await self._wait(
+            key=f"recipient:{phone_number_id}:{phone_number}",
+            rate=self._recipient_rate,
+            burst=self._recipient_burst,
+        )
+        waited += await self._wait(
+            key=f"phone_number_id:{phone_number_id}",
+            rate=self._rate,
+            burst=self._burst,
+        )
+        self._sends += 1
+
+        return waited
+
+    def metrics(self) -> dict[str, float]:
+        """Number of sends, throttled sends, total wait and local buckets"""
+        return {
+            "sends": self._sends,
+            "throttled": self._throttled,
+            "wait_seconds": self._wait_seconds,
+            "buckets": len(self._buckets),
+        }
+
+    async def _wait(self, key: str, rate: float, burst: int) -> float:
+        delay = await self._reserve(key=key, rate=rate, burst=burst)
+        if delay <= 0:
+            return 0
+
+        logger.debug("Send to %s is throttled for %.3f s", key, delay)
+        self._throttled += 1
+        self._wait_seconds += delay
+        await asyncio.sleep(delay)
+
+        return delay
+
+    async def _reserve(self, key: str, rate: float, burst: int) -> float:
+        if self._is_shared:
+            postgres_conn = get_postgres_connector(logger=logger, app=self._app)
+            delay = None
+            try:
+                delay = await SendRateLimitRepository(
+                    conn=postgres_conn
+                ).reserve_send_token(key=key, rate=rate, burst=burst)
+            except Exception as e:
+                logger.error("Failed to reserve shared send token: %s", e)
+            finally:
+                await postgres_conn.close()
+
+            if delay is not None:
+                return delay
+
+            logger.warning("Shared send rate limit of %s is unavailable", key)
+
+        return self._get_bucket(key=key, rate=rate, burst=burst).reserve()
+
+    def _get_bucket(self, key: str, rate: float, burst: int) -> TokenBucket:
+        if (bucket := self._buckets.get(key)) is not None:
+            return bucket
+
+        if len(self._buckets) >= self._max_buckets:
+            self._buckets = {k: b for k, b in self._buckets.items() if not b.is_full()}
+
+        bucket = self._buckets[key] = TokenBucket(rate=rate, burst=burst)
+
+        return bucket
+
+    async def _delete_idle_buckets_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._idle_seconds)
+
+            postgres_conn = get_postgres_connector(logger=logger, app=self._app)
+            try:
+                await SendRateLimitRepository(
+                    conn=postgres_conn
+                ).delete_idle_send_rate_limits(idle_seconds=self._idle_seconds)
+            except Exception as e:
+                logger.error("Failed to delete idle send rate limits: %s", e)
+            finally:
+                await postgres_conn.close()
+
+
+def create_send_rate_limiter(app: FastAPI) -> SendRateLimiter:
+    """Create and start app-scoped send rate limiter"""
+    settings = get_settings()
+
+    send_rate_limiter = SendRateLimiter(
+        app=app,
+        rate=settings.WHATSAPP_SEND_RATE,
+        burst=settings.WHATSAPP_SEND_BURST,
+        recipient_rate=settings.WHATSAPP_RECIPIENT_SEND_RATE,
+        recipient_burst=settings.WHATSAPP_RECIPIENT_SEND_BURST,
+        is_shared=settings.WHATSAPP_SEND_RATE_LIMIT_SHARED,
+    )
+    register_metrics_source("send_rate_limiter", send_rate_limiter.metrics)
+    send_rate_limiter.start()
+
+    return send_rate_limiter
+
+
+def get_send_rate_limiter(app: FastAPI) -> SendRateLimiter | None:
+    """Get app-scoped send rate limiter"""
+    return getattr(app, "send_rate_limiter", None)
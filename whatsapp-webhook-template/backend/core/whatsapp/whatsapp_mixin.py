@@ -1,12 +1,14 @@
 import logging
 from typing import Any
 
+import aiohttp
 from backend.api.v1.webhook.constants import MESSAGING_PRODUCT
 from backend.api.v1.webhook.models import WhatsappMessageCallback
 from backend.core.constants import ApplicationMode, WhatsappTemplateLanguage
+from backend.core.mapping import get_type_adapter
+from backend.core.whatsapp.send_rate_limiter import SendRateLimiter
 from backend.settings import get_settings
-from pydantic import TypeAdapter
-from shared_lib_template.utils import HttpRequestMixin
+from shared_lib_template.utils import CircuitBreakerOpenError, HttpRequestMixin
 
 
 logger = logging.getLogger(__name__)
@@ -20,8 +22,11 @@ class WhatsappMixin(HttpRequestMixin):
         retry_attempts: int | None = None,
         start_timeout: float | None = None,
         headers: dict | None = None,
+        client_session: aiohttp.ClientSession | None = None,
+        send_rate_limiter: SendRateLimiter | None = None,
     ) -> None:
         self._settings = get_settings()
+        self._send_rate_limiter = send_rate_limiter
 
         # fmt: off
         super().__init__(
@@ -29,6 +34,7 @@ class WhatsappMixin(HttpRequestMixin):
             retry_attempts=retry_attempts or self._settings.WHATSAPP_API_RETRY_COUNT,
             start_timeout=start_timeout or self._settings.WHATSAPP_API_RETRY_START_TIMEOUT,
             headers=headers or {"Authorization": f"Bearer {self._settings.WHATSAPP_API_TOKEN}"},
+            client_session=client_session,
         )
         # fmt: on
 
@@ -37,7 +43,8 @@ class WhatsappMixin(HttpRequestMixin):
         phone_number_id: str,
         wa_message_id: str,
     ) -> bool:
-        """Mark message as read. Returns `True` if success, else `False"""
+        """Mark message as read. Returns `True` if success, else `False`.
+        Raises `CircuitBreakerOpenError` while Whatsapp API is unavailable"""
         if (
             self._settings.APP_MODE != ApplicationMode.PROD
             and not self._settings.WHATSAPP_ENABLE_PROD_INTEGRAION
@@ -68,6 +75,9 @@ class WhatsappMixin(HttpRequestMixin):
 
             return result.get("success", False)
 
+        except CircuitBreakerOpenError:
+            raise
+
         except Exception as e:
             logger.error("Failed to mark message as read: %s", e)
             return False
@@ -81,10 +91,14 @@ class WhatsappMixin(HttpRequestMixin):
             str | None
         ) = None,  # TODO: enum for templates  # pylint: disable=W0511
         template_language: WhatsappTemplateLanguage = WhatsappTemplateLanguage.EN,
+        idempotency_key: str | None = None,
     ) -> WhatsappMessageCallback | bool | None:
         """
         Send reply to user message.
-        Returns `WhatsappMessageCallback` object if message sent or `True` if integration disabled else `None`
+        Returns `WhatsappMessageCallback` object if message sent or `True` if integration disabled else `None`.
+        Raises `CircuitBreakerOpenError` while Whatsapp API is unavailable.
+        `idempotency_key` is echoed back in statuses of sent message, so send whose
+        response was lost can be recognized
         """
         if (not text and not template) or (text and template):
             logger.warning(
@@ -124,13 +138,25 @@ class WhatsappMixin(HttpRequestMixin):
                 "language": {"code": template_language},
             }
 
+        if idempotency_key:
+            body["biz_opaque_callback_data"] = idempotency_key
+
+        if self._send_rate_limiter is not None:
+            await self._send_rate_limiter.acquire(
+                phone_number_id=phone_number_id,
+                phone_number=phone_number,
+            )
+
         try:
             result = await self.post(
                 url=url,
                 json=body,
             )
 
-            return TypeAdapter(WhatsappMessageCallback).validate_python(result)
+            return get_type_adapter(WhatsappMessageCallback).validate_python(result)
+
+        except CircuitBreakerOpenError:
+            raise
 
         except Exception as e:
             logger.error("Failed to send message: %s", e)
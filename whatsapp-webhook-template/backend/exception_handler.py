@@ -52,7 +52,9 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
         request.method,
     )
 
-    return await make_response(api_response=http_exception_response)
+    return await make_response(
+        api_response=http_exception_response, headers=exc.headers
+    )
 
 
 async def unexpected_exception_handler(
@@ -2,8 +2,11 @@ import logging
 from functools import lru_cache
 from importlib.metadata import distribution
 
+from pydantic import Field
 from shared_lib_template.base_settings import WhatsappBaseSettings
 
+from backend.core.constants import MessageQueueOverflowPolicy
+
 
 logger = logging.getLogger(__name__)
 
@@ -15,15 +18,49 @@ class Settings(WhatsappBaseSettings):
     WHATSAPP_WEBHOOK_TOKEN: str
     WHATSAPP_API_TOKEN: str
     WHATSAPP_VALIDATE_SIGNATURE: bool = True
+    WHATSAPP_APP_SECRET: str | None = None
     WHATSAPP_API_RETRY_COUNT: int = 5
     WHATSAPP_API_RETRY_START_TIMEOUT: float = 1
     WHATSAPP_API_VERIFY_SSL: bool = True
     WHATSAPP_API_BASE_URL: str = "https://graph.facebook.com/v19.0"
     WHATSAPP_API_MESSAGES_URL: str = "{url}/{phone_number_id}/messages"
     WHATSAPP_CONCATENATED_MESSAGE_WAITING_SECONDS: int = 30
+    WHATSAPP_CONCATENATED_MESSAGE_IDLE_SECONDS: float = 3
     WHATSAPP_MESSAGE_PROCESSING_RETRIES: int = 3
     WHATSAPP_MESSAGE_PROCESSING_INTERVAL: int = 3
     WHATSAPP_MESSAGE_PROCESSING_EXPONENTIAL: int = 3
+    WHATSAPP_MESSAGE_PROCESSING_MAX_INTERVAL: float = 60
+    WHATSAPP_MESSAGE_QUEUE_CONCURRENCY: int = 50
+    WHATSAPP_MESSAGE_QUEUE_PHONE_NUMBER_ID_CONCURRENCY: int = 10
+    WHATSAPP_MESSAGE_QUEUE_SIZE: int = 20
+    WHATSAPP_MESSAGE_QUEUE_OVERFLOW_POLICY: MessageQueueOverflowPolicy = Field(
+        default=MessageQueueOverflowPolicy.SPILL
+    )
+    WHATSAPP_MESSAGE_QUEUE_RETRY_AFTER_SECONDS: int = 30
+    WHATSAPP_USER_LANES: int = 64
+    WHATSAPP_ENTRY_CONCURRENCY: int = 10
+    WHATSAPP_MESSAGE_QUEUE_POLL_INTERVAL: float = 1
+    # Claimed update is redelivered after it if worker died, it is extended while
+    # update is processed
+    WHATSAPP_MESSAGE_QUEUE_VISIBILITY_TIMEOUT: int = 300
+    WHATSAPP_MESSAGE_PROCESSING_TTL: int = 900
+    WHATSAPP_MESSAGE_PROCESSING_SWEEP_INTERVAL: int = 60
+    WHATSAPP_DUPLICATE_FILTER_SIZE: int = 100000
+    WHATSAPP_DUPLICATE_FILTER_WINDOW: float = 3600
+    # Messages per second of business phone number
+    WHATSAPP_SEND_RATE: float = 80
+    WHATSAPP_SEND_BURST: int = 80
+    # Whatsapp pair rate limit: 1 message per 6 seconds to the same user, bursts up to 45
+    WHATSAPP_RECIPIENT_SEND_RATE: float = 1 / 6
+    WHATSAPP_RECIPIENT_SEND_BURST: int = 45
+    WHATSAPP_READ_RECEIPT_WINDOW: float = 1
+    WHATSAPP_READ_RECEIPT_RETRIES: int = 5
+    WHATSAPP_READ_RECEIPT_RETRY_INTERVAL: float = 1
+    WHATSAPP_READ_RECEIPT_RETRY_EXPONENTIAL: float = 2
+    WHATSAPP_READ_RECEIPT_RETRY_MAX_INTERVAL: float = 30
+    WHATSAPP_READ_RECEIPT_CONCURRENCY: int = 20
+    # Share send rate limits between workers through Postgres
+    WHATSAPP_SEND_RATE_LIMIT_SHARED: bool = False
 
 
 @lru_cache()
@@ -1,6 +1,7 @@
 import asyncio
 import logging
 from datetime import datetime
+from typing import Awaitable, Callable, TypeVar
 
 from backend.api.v1.webhook.constants import (
     FIRST_USER_MESSAGE_TEMPLATE,
@@ -11,21 +12,53 @@ from backend.api.v1.webhook.repositories import (
     MessageRepository,
     MessageStatusRepository,
 )
-from backend.core.constants import CommunicationChannel, MessageStatus
+from backend.core.constants import (
+    CommunicationChannel,
+    MessageProcessingStep,
+    MessageStatus,
+)
 from backend.core.models import MessageProcessingCallbackInfo
 from backend.core.utils import get_current_timestamp
 from backend.settings import get_settings
+from backend.tasks.message_processing.session_message_debouncer import (
+    SessionMessageDebouncer,
+)
+from backend.tasks.message_processing.user_lane_executor import UserLaneExecutor
 
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class MessageProcessingMixin:
     """Base message processing service"""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        session_message_debouncer: SessionMessageDebouncer | None = None,
+        user_lane_executor: UserLaneExecutor | None = None,
+    ) -> None:
         self._settings = get_settings()
         self._messages_to_delete_from_processing: set[int] = set()
+        self._session_message_debouncer = session_message_debouncer
+        self._user_lane_executor = user_lane_executor
+
+    async def _run_in_user_lane(
+        self,
+        phone_number_id: str,
+        phone_number: str,
+        func: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Run user state changes serially with other work of the same user"""
+        if self._user_lane_executor is None:
+            return await func()
+
+        return await self._user_lane_executor.run(
+            phone_number_id=phone_number_id,
+            phone_number=phone_number,
+            func=func,
+        )
 
     async def _format_new_session_first_message(self, message: str) -> str:
         """Formatting message with current date"""
@@ -39,24 +72,42 @@ class MessageProcessingMixin:
         session_id: int,
         message_id: int,
         status_id: int,
+        user_message: str,
+        received_timestamp: int,
         is_new_session: bool,
-        message_repository: MessageRepository,
         message_status_repository: MessageStatusRepository,
         message_processing_repository: MessageProcessingRepository,
         waiting_interval: int,
     ) -> MessageProcessingCallbackInfo:
         """Check if need to stop message processing because of new incoming message"""
 
-        logger.info(
-            "Waiting %ss for new incoming message",
-            waiting_interval,
-        )
+        if self._session_message_debouncer:
+            logger.info("Waiting for session %s messages batch", session_id)
 
-        await asyncio.sleep(waiting_interval)
+            processing_messages = await self._session_message_debouncer.wait(
+                session_id=session_id,
+                message_id=message_id,
+                user_message=user_message,
+                received_timestamp=received_timestamp,
+            )
 
-        processing_messages = (
-            await message_processing_repository.get_processing_messages(session_id)
-        )
+            # Session messages could be received by other workers, batch is in DB
+            if self._settings.APP_WORKERS > 1:
+                # fmt: off
+                processing_messages = await message_processing_repository.get_processing_messages(session_id)
+                # fmt: on
+
+        else:
+            logger.info(
+                "Waiting %ss for new incoming message",
+                waiting_interval,
+            )
+
+            await asyncio.sleep(waiting_interval)
+
+            processing_messages = (
+                await message_processing_repository.get_processing_messages(session_id)
+            )
 
         logger.debug(
             "Processing messages (%s): %s",
@@ -74,27 +125,24 @@ class MessageProcessingMixin:
         processing_message_ids_to_clear: list[int] = []
 
         if need_to_check:
-            # 1. Message is last. Concat user messages
+            # 1. Message is last. Claim not replied earlier messages and concat them
             if message_id == processing_message_ids[-1]:
-                messages_to_concat: list[str] = []
-                for item in processing_messages:
-                    if message_id not in (
-                        item.concatenated_message_id,
-                        item.message_id,
-                    ):
-                        continue
-
-                    messages_to_concat.append(item.user_message)
-                    processing_message_ids_to_clear.append(item.message_id)
+                # fmt: off
+                claimed_messages = await message_processing_repository.claim_processing_messages(
+                    session_id=session_id,
+                    message_id=message_id,
+                )
+                # fmt: on
 
-                new_message_text = "\n".join(messages_to_concat)
+                new_message_text = "\n".join(
+                    [item.user_message for item in claimed_messages] + [user_message]
+                )
+                processing_message_ids_to_clear = [
+                    item.message_id for item in claimed_messages
+                ] + [message_id]
 
-            # 2. Message is first or in the middle. Stop processing and save metadata
+            # 2. Message is first or in the middle. Stop processing, last message replies
             else:
-                await message_repository.update_message(
-                    message_id=message_id,
-                    concatenated_message_id=processing_message_ids[-1],
-                )
                 await message_status_repository.update_message_status(
                     status_id=status_id, status=MessageStatus.CONCATENATED
                 )
@@ -123,15 +171,21 @@ class MessageProcessingMixin:
         message_status_repository: MessageStatusRepository,
         message_repository: MessageRepository,
         channel: CommunicationChannel,
+        wa_reply_message_id: str | None = None,
     ) -> None:
-        """Process success message sending. Send metadata in DB, process CRM integration and save metrics"""
-        await message_status_repository.update_message_status(
-            status_id=status_id,
-            status=MessageStatus.DELIVERED,
-        )
+        """
+        Process success message sending. Send metadata in DB, process CRM integration and save metrics.
+        Reply is checkpointed first, so retry does not send it again
+        """
         await message_repository.update_message(
             message_id=message_id,
             replied_timestamp=get_current_timestamp(),
+            wa_reply_message_id=wa_reply_message_id,
+        )
+        await message_status_repository.update_sent_message_status(
+            status_id=status_id,
+            status=MessageStatus.DELIVERED,
+            processing_step=MessageProcessingStep.STATUS_UPDATED,
         )
 
     async def _process_message_failed_callback(
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+
+from backend.api.v1.webhook.repositories import MessageProcessingRepository
+from backend.core.metrics import register_metrics_source
+from backend.settings import get_settings
+from fastapi import FastAPI
+from shared_lib_template.db.postgres import get_postgres_connector
+
+
+logger = logging.getLogger(__name__)
+
+
+class MessageProcessingSweeper:
+    """
+    Periodically removes orphaned `webhook.message_processing` entries.
+
+    Entries are deleted by processing itself, ones older than `ttl` seconds were left
+    by crashed workers and only slow down processing of their sessions.
+    """
+
+    def __init__(self, app: FastAPI, interval: float, ttl: float) -> None:
+        self._app = app
+        self._interval = interval
+        self._ttl = ttl
+        self._task: asyncio.Task | None = None
+        self._runs = 0
+        self._swept = 0
+
+    def start(self) -> None:
+        """Start sweeper"""
+        self._task = asyncio.create_task(
+            self._sweep_periodically(), name="message-processing-sweeper"
+        )
+        logger.info("Started message processing sweeper")
+
+    async def close(self) -> None:
+        """Stop sweeper"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def sweep(self) -> list[int]:
+        """Delete expired processing entries. Returns ids of released messages"""
+        postgres_conn = get_postgres_connector(logger=logger, app=self._app)
+
+        try:
+            message_ids = await MessageProcessingRepository(
+                conn=postgres_conn
+            ).delete_expired_message_processing_entries(ttl=self._ttl)
+        finally:
+            await postgres_conn.close()
+
+        self._runs += 1
+        self._swept += len(message_ids)
+
+        if message_ids:
+            logger.warning(
+                "Removed %s orphaned processing entries of messages: %s",
+                len(message_ids),
+                message_ids,
+            )
+
+        return message_ids
+
+    def metrics(self) -> dict[str, float]:
+        """Number of sweeps and removed entries"""
+        return {"runs": self._runs, "swept": self._swept}
+
+    async def _sweep_periodically(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error("Failed to sweep processing entries: %s", e)
+
+            await asyncio.sleep(self._interval)
+
+
+def create_message_processing_sweeper(app: FastAPI) -> MessageProcessingSweeper:
+    """Create and start app-scoped message processing sweeper"""
+    settings = get_settings()
+
+    sweeper = MessageProcessingSweeper(
+        app=app,
+        interval=settings.WHATSAPP_MESSAGE_PROCESSING_SWEEP_INTERVAL,
+        ttl=settings.WHATSAPP_MESSAGE_PROCESSING_TTL,
+    )
+    register_metrics_source("message_processing_sweeper", sweeper.metrics)
+    sweeper.start()
+
+    return sweeper
+
+
+def get_message_processing_sweeper(app: FastAPI) -> MessageProcessingSweeper | None:
+    """Get app-scoped message processing sweeper"""
+    return getattr(app, "message_processing_sweeper", None)
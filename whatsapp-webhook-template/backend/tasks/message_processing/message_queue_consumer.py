@@ -0,0 +1,316 @@
+import asyncio
+import logging
+from functools import partial
+from typing import Awaitable, Callable
+
+from backend.api.v1.webhook.models import WhatsappWebhookUpdates
+from backend.api.v1.webhook.repositories import MessagePendingRepository
+from backend.core.models import MessagePendingInfo
+from backend.core.utils import exponential_backoff
+from backend.settings import get_settings
+from backend.tasks.message_processing.processing_scheduler import ProcessingScheduler
+from fastapi import FastAPI
+from pydantic import ValidationError
+from shared_lib_template.db.postgres import get_postgres_connector
+from shared_lib_template.utils import (
+    CircuitBreakerOpenError,
+    decorrelated_jitter,
+    retry_budget,
+)
+
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[WhatsappWebhookUpdates, FastAPI], Awaitable[None]]
+
+
+class MessageQueueConsumer:
+    """
+    Drains `webhook.message_pending` queue into processing scheduler.
+
+    Updates are claimed only while scheduler queue has free slots, the rest stay
+    in the database until processing capacity frees up. Failed updates are retried
+    with jitter while process-wide retry budget allows, else after maximal interval.
+
+    Claimed updates stay hidden from other consumers while they wait in scheduler
+    queue and run: their visibility timeout is extended every third of it, so slow
+    processing (debounce wait, send pacing, HTTP retries) is not claimed twice.
+    Updates of stopped consumer are claimed again after visibility timeout.
+    """
+
+    def __init__(
+        self,
+        app: FastAPI,
+        handler: MessageHandler,
+        scheduler: ProcessingScheduler,
+        poll_interval: float,
+        visibility_timeout: float,
+        retries: int,
+        retry_interval: float,
+        retry_exponential: float,
+        retry_max_interval: float,
+    ) -> None:
+        self._app = app
+        self._handler = handler
+        self._scheduler = scheduler
+        self._poll_interval = poll_interval
+        self._visibility_timeout = visibility_timeout
+        self._retries = retries
+        self._retry_interval = retry_interval
+        self._retry_exponential = retry_exponential
+        self._retry_max_interval = retry_max_interval
+        self._condition = asyncio.Condition()
+        self._task: asyncio.Task | None = None
+        self._heartbeat_task: asyncio.Task | None = None
+        # Claimed updates which are not processed yet
+        self._claimed_ids: set[int] = set()
+
+    def start(self) -> None:
+        """Start consumer"""
+        self._task = asyncio.create_task(self._consume(), name="message-queue-consumer")
+        self._heartbeat_task = asyncio.create_task(
+            self._extend_claimed_periodically(), name="message-queue-heartbeat"
+        )
+        logger.info("Started message queue consumer")
+
+    async def close(self) -> None:
+        """Stop consumer. Not finished updates return to queue after visibility timeout"""
+        tasks = [task for task in (self._task, self._heartbeat_task) if task]
+        if not tasks:
+            return
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._heartbeat_task = None
+
+    async def wakeup(self) -> None:
+        """Wake idle consumer instead of waiting for next poll"""
+        async with self._condition:
+            self._condition.notify()
+
+    async def _consume(self) -> None:
+        while True:
+            await self._scheduler.wait_for_free_slots()
+
+            try:
+                messages_pending = await self._claim(limit=self._scheduler.free_slots)
+
+            except Exception as e:
+                logger.error("Failed to claim pending messages: %s", e)
+                messages_pending = []
+
+            if not messages_pending:
+                await self._wait()
+                continue
+
+            for message_pending in messages_pending:
+                data = await self._validate(message_pending=message_pending)
+                if data is None:
+                    continue
+
+                self._claimed_ids.add(message_pending.message_pending_id)
+                self._scheduler.submit(
+                    keys=get_phone_number_ids(data=data),
+                    run=partial(
+                        self._process, message_pending=message_pending, data=data
+                    ),
+                )
+
+    async def _wait(self) -> None:
+        async with self._condition:
+            try:
+                await asyncio.wait_for(
+                    self._condition.wait(), timeout=self._poll_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _extend_claimed_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._visibility_timeout / 3)
+            if not self._claimed_ids:
+                continue
+
+            postgres_conn = get_postgres_connector(logger=logger, app=self._app)
+            try:
+                await MessagePendingRepository(
+                    conn=postgres_conn
+                ).extend_messages_pending(
+                    message_pending_ids=list(self._claimed_ids),
+                    visibility_timeout=self._visibility_timeout,
+                )
+            except Exception as e:
+                logger.error("Failed to extend claimed pending messages: %s", e)
+            finally:
+                await postgres_conn.close()
+
+    async def _claim(self, limit: int) -> list[MessagePendingInfo]:
+        postgres_conn = get_postgres_connector(logger=logger, app=self._app)
+        try:
+            return await MessagePendingRepository(
+                conn=postgres_conn
+            ).claim_messages_pending(
+                limit=limit,
+                visibility_timeout=self._visibility_timeout,
+            )
+        finally:
+            await postgres_conn.close()
+
+    async def _validate(
+        self, message_pending: MessagePendingInfo
+    ) -> WhatsappWebhookUpdates | None:
+        """Build updates model from raw entry, invalid entries are removed from queue"""
+        try:
+            return WhatsappWebhookUpdates.model_validate(message_pending.entry)
+
+        except ValidationError as e:
+            logger.error(
+                "Pending message %s is not valid Whatsapp updates, dropping: %s",
+                message_pending.message_pending_id,
+                e,
+            )
+
+        postgres_conn = get_postgres_connector(logger=logger, app=self._app)
+        try:
+            await MessagePendingRepository(conn=postgres_conn).delete_message_pending(
+                message_pending_id=message_pending.message_pending_id,
+            )
+        except Exception as e:
+            logger.error(
+                "Failed to delete pending message %s: %s",
+                message_pending.message_pending_id,
+                e,
+            )
+        finally:
+            await postgres_conn.close()
+
+        return None
+
+    async def _process(
+        self, message_pending: MessagePendingInfo, data: WhatsappWebhookUpdates
+    ) -> None:
+        """
+        Process pending message, on failure put it back to queue with backoff.
+        Message is parked without spending attempt while circuit breaker is open
+        """
+        logger.info(
+            "Processing pending message %s, attempt %s out of %s",
+            message_pending.message_pending_id,
+            message_pending.attempts,
+            self._retries,
+        )
+
+        postgres_conn = get_postgres_connector(logger=logger, app=self._app)
+        message_pending_repository = MessagePendingRepository(conn=postgres_conn)
+
+        if message_pending.attempts <= 1:
+            retry_budget.record_request()
+
+        try:
+            try:
+                await self._handler(data, self._app)
+
+            except CircuitBreakerOpenError as e:
+                wait_time = max(e.retry_after, self._poll_interval)
+                logger.warning(
+                    "Pending message %s is parked for %.1fs: %s",
+                    message_pending.message_pending_id,
+                    wait_time,
+                    e,
+                )
+                await message_pending_repository.park_message_pending(
+                    message_pending_id=message_pending.message_pending_id,
+                    delay=wait_time,
+                )
+                return
+
+            except Exception as e:
+                if message_pending.attempts >= self._retries:
+                    logger.error(
+                        "Pending message %s processing failed after %s attempts: %s",
+                        message_pending.message_pending_id,
+                        message_pending.attempts,
+                        e,
+                    )
+                    await message_pending_repository.delete_message_pending(
+                        message_pending_id=message_pending.message_pending_id,
+                    )
+                    return
+
+                wait_time = decorrelated_jitter(
+                    base=self._retry_interval,
+                    previous=exponential_backoff(
+                        interval=self._retry_interval,
+                        exponential=self._retry_exponential,
+                        retry_number=message_pending.attempts - 1,
+                    ),
+                    cap=self._retry_max_interval,
+                )
+                if not retry_budget.try_retry():
+                    wait_time = self._retry_max_interval
+                logger.error(
+                    "An error occured while processing pending message %s, retrying in %ss: %s",
+                    message_pending.message_pending_id,
+                    wait_time,
+                    e,
+                )
+                await message_pending_repository.release_message_pending(
+                    message_pending_id=message_pending.message_pending_id,
+                    delay=wait_time,
+                )
+                return
+
+            await message_pending_repository.delete_message_pending(
+                message_pending_id=message_pending.message_pending_id,
+            )
+
+        except Exception as e:
+            logger.error(
+                "Failed to update pending message %s: %s",
+                message_pending.message_pending_id,
+                e,
+            )
+
+        finally:
+            self._claimed_ids.discard(message_pending.message_pending_id)
+            await postgres_conn.close()
+
+
+def get_phone_number_ids(data: WhatsappWebhookUpdates) -> set[str]:
+    """Get business phone numbers webhook update is addressed to"""
+    return {
+        change.value.metadata.phone_number_id
+        for entry in data.entry
+        for change in entry.changes
+    }
+
+
+def create_message_queue_consumer(
+    app: FastAPI,
+    handler: MessageHandler,
+    scheduler: ProcessingScheduler,
+) -> MessageQueueConsumer:
+    """Create and start app-scoped message queue consumer"""
+    settings = get_settings()
+
+    consumer = MessageQueueConsumer(
+        app=app,
+        handler=handler,
+        scheduler=scheduler,
+        poll_interval=settings.WHATSAPP_MESSAGE_QUEUE_POLL_INTERVAL,
+        visibility_timeout=settings.WHATSAPP_MESSAGE_QUEUE_VISIBILITY_TIMEOUT,
+        retries=settings.WHATSAPP_MESSAGE_PROCESSING_RETRIES,
+        retry_interval=settings.WHATSAPP_MESSAGE_PROCESSING_INTERVAL,
+        retry_exponential=settings.WHATSAPP_MESSAGE_PROCESSING_EXPONENTIAL,
+        retry_max_interval=settings.WHATSAPP_MESSAGE_PROCESSING_MAX_INTERVAL,
+    )
+    consumer.start()
+
+    return consumer
+
+
+def get_message_queue_consumer(app: FastAPI) -> MessageQueueConsumer | None:
+    """Get app-scoped message queue consumer"""
+    return getattr(app, "message_queue_consumer", None)
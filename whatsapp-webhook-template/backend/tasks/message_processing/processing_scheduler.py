@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from backend.core.metrics import register_metrics_source
+from backend.settings import get_settings
+from fastapi import FastAPI
+
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[], Awaitable[None]]
+
+
+class ProcessingQueueFullError(Exception):
+    """Processing queue has no free slots"""
+
+
+@dataclass
+class _ScheduledJob:
+    """Job waiting in processing queue"""
+
+    keys: frozenset[str]
+    run: Job
+    enqueued_at: float
+
+
+class ProcessingScheduler:
+    """
+    Bounded processing queue with global and per-key concurrency limits.
+
+    Queued jobs are started in FIFO order, jobs with a key at its limit are skipped,
+    so one busy `phone_number_id` does not hold back the others.
+    """
+
+    def __init__(self, concurrency: int, key_concurrency: int, queue_size: int) -> None:
+        self._concurrency = concurrency
+        self._key_concurrency = key_concurrency
+        self._queue_size = queue_size
+        self._queue: deque[_ScheduledJob] = deque()
+        self._running = 0
+        self._running_by_key: Counter[str] = Counter()
+        self._queue_changed = asyncio.Event()
+        self._slot_freed = asyncio.Event()
+        self._tasks: set[asyncio.Task] = set()
+        self._dispatcher: asyncio.Task | None = None
+        self._started = 0
+        self._overflowed = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    @property
+    def free_slots(self) -> int:
+        """Number of jobs queue can accept"""
+        return max(self._queue_size - len(self._queue), 0)
+
+    def is_full(self) -> bool:
+        return not self.free_slots
+
+    def start(self) -> None:
+        """Start dispatching queued jobs"""
+        self._dispatcher = asyncio.create_task(
+            self._dispatch(), name="processing-scheduler"
+        )
+
+    async def close(self) -> None:
+        """Stop dispatching and cancel running jobs, queued jobs are dropped"""
+        tasks = list(self._tasks)
+        if self._dispatcher:
+            tasks.append(self._dispatcher)
+
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queue.clear()
+        self._dispatcher = None
+
+    def submit(self, keys: set[str], run: Job) -> None:
+        """Put job to queue. Raises `ProcessingQueueFullError` if queue is full"""
+        if self.is_full():
+            raise ProcessingQueueFullError(
+                f"Processing queue is full, {len(self._queue)} jobs are waiting"
+            )
+
+        self._queue.append(
+            _ScheduledJob(keys=frozenset(keys), run=run, enqueued_at=time.monotonic())
+        )
+        self._queue_changed.set()
+
+    def record_overflow(self) -> None:
+        """Count update hit overflow policy because queue is full"""
+        self._overflowed += 1
+
+    async def wait_for_free_slots(self) -> None:
+        """Wait until queue can accept jobs"""
+        while self.is_full():
+            self._slot_freed.clear()
+            await self._slot_freed.wait()
+
+    def metrics(self) -> dict[str, float]:
+        """Queue depth, running jobs and queue wait time"""
+        return {
+            "queue_depth": len(self._queue),
+            "queue_size": self._queue_size,
+            "running": self._running,
+            "concurrency": self._concurrency,
+            "started": self._started,
+            "overflowed": self._overflowed,
+            "wait_seconds_avg": (
+                self._wait_seconds_total / self._started if self._started else 0
+            ),
+            "wait_seconds_max": self._wait_seconds_max,
+        }
+
+    async def _dispatch(self) -> None:
+        while True:
+            job = self._pop_runnable_job()
+            if job is None:
+                self._queue_changed.clear()
+                await self._queue_changed.wait()
+                continue
+
+            wait_seconds = time.monotonic() - job.enqueued_at
+            self._started += 1
+            self._wait_seconds_total += wait_seconds
+            self._wait_seconds_max = max(self._wait_seconds_max, wait_seconds)
+
+            self._running += 1
+            self._running_by_key.update(job.keys)
+            self._slot_freed.set()
+
+            task = asyncio.create_task(self._run(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _pop_runnable_job(self) -> _ScheduledJob | None:
+        if self._running >= self._concurrency:
+            return None
+
+        for index, job in enumerate(self._queue):
+            if all(
+                self._running_by_key[key] < self._key_concurrency for key in job.keys
+            ):
+                del self._queue[index]
+                return job
+
+        return None
+
+    async def _run(self, job: _ScheduledJob) -> None:
+        try:
+            await job.run()
+
+        except Exception as e:
+            logger.error("Unhandled error in scheduled job: %s", e)
+
+        finally:
+            self._running -= 1
+            for key in job.keys:
+                self._running_by_key[key] -= 1
+                if not self._running_by_key[key]:
+                    del self._running_by_key[key]
+
+            self._queue_changed.set()
+
+
+def create_processing_scheduler() -> ProcessingScheduler:
+    """Create and start app-scoped processing scheduler"""
+    settings = get_settings()
+
+    scheduler = ProcessingScheduler(
+        concurrency=settings.WHATSAPP_MESSAGE_QUEUE_CONCURRENCY,
+        key_concurrency=settings.WHATSAPP_MESSAGE_QUEUE_PHONE_NUMBER_ID_CONCURRENCY,
+        queue_size=settings.WHATSAPP_MESSAGE_QUEUE_SIZE,
+    )
+    scheduler.start()
+    register_metrics_source("processing_scheduler", scheduler.metrics)
+
+    return scheduler
+
+
+def get_processing_scheduler(app: FastAPI) -> ProcessingScheduler | None:
+    """Get app-scoped processing scheduler"""
+    return getattr(app, "processing_scheduler", None)
@@ -0,0 +1,211 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from backend.core.metrics import register_metrics_source
+from backend.core.utils import exponential_backoff
+from backend.core.whatsapp.whatsapp_mixin import WhatsappMixin
+from backend.settings import get_settings
+from fastapi import FastAPI
+from shared_lib_template.utils import (
+    CircuitBreakerOpenError,
+    decorrelated_jitter,
+    get_http_client_session,
+    retry_budget,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _ReadReceipt:
+    """Newest message of conversation waiting to be marked as read"""
+
+    phone_number_id: str
+    wa_message_id: str
+    timestamp: int
+    attempts: int = 0
+    timer: asyncio.TimerHandle | None = None
+
+
+class ReadReceiptDispatcher(WhatsappMixin):
+    """
+    Marks inbound messages as read off the processing path.
+
+    Read receipt of message covers earlier messages of conversation, so only
+    the newest message submitted within `window` seconds is marked. Failed receipts
+    are retried with jittered backoff unless newer message of conversation supersedes
+    them or process-wide retry budget is exhausted.
+    """
+
+    def __init__(
+        self,
+        app: FastAPI,
+        window: float,
+        retries: int,
+        retry_interval: float,
+        retry_exponential: float,
+        retry_max_interval: float,
+        concurrency: int,
+    ) -> None:
+        super().__init__(client_session=get_http_client_session(app=app))
+        self._window = window
+        self._retries = retries
+        self._retry_interval = retry_interval
+        self._retry_exponential = retry_exponential
+        self._retry_max_interval = retry_max_interval
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._receipts: dict[tuple[str, str], _ReadReceipt] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._is_closed = False
+        self._submitted = 0
+        self._coalesced = 0
+        self._sent = 0
+        self._failed = 0
+        self._dropped = 0
+
+    def submit(
+        self,
+        phone_number_id: str,
+        phone_number: str,
+        wa_message_id: str,
+        timestamp: int,
+    ) -> None:
+        """Mark message as read within window, unless newer message of user comes"""
+        self._submitted += 1
+        key = (phone_number_id, phone_number)
+
+        if (receipt := self._receipts.get(key)) is not None:
+            self._coalesced += 1
+            if timestamp >= receipt.timestamp:
+                receipt.wa_message_id = wa_message_id
+                receipt.timestamp = timestamp
+                receipt.attempts = 0
+            return None
+
+        self._schedule(
+            key=key,
+            receipt=_ReadReceipt(
+                phone_number_id=phone_number_id,
+                wa_message_id=wa_message_id,
+                timestamp=timestamp,
+            ),
+            delay=self._window,
+        )
+
+    async def close(self) -> None:
+        """Send waiting receipts without retries and wait for sent ones"""
+        self._is_closed = True
+
+        for key, receipt in list(self._receipts.items()):
+            if receipt.timer is not None:
+                receipt.timer.cancel()
+            self._dispatch(key=key)
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def metrics(self) -> dict[str, float]:
+        """Submitted, coalesced, sent, failed and dropped receipts, waiting receipts"""
+        return {
+            "submitted": self._submitted,
+            "coalesced": self._coalesced,
+            "sent": self._sent,
+            "failed": self._failed,
+            "dropped": self._dropped,
+            "waiting": len(self._receipts),
+        }
+
+    def _schedule(
+        self, key: tuple[str, str], receipt: _ReadReceipt, delay: float
+    ) -> None:
+        self._receipts[key] = receipt
+        receipt.timer = asyncio.get_running_loop().call_later(
+            delay, self._dispatch, key
+        )
+
+    def _dispatch(self, key: tuple[str, str]) -> None:
+        if (receipt := self._receipts.pop(key, None)) is None:
+            return None
+
+        task = asyncio.create_task(self._send(key=key, receipt=receipt))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, key: tuple[str, str], receipt: _ReadReceipt) -> None:
+        retry_after = 0.0
+
+        async with self._semaphore:
+            try:
+                is_marked = await self._mark_message_as_read(
+                    phone_number_id=receipt.phone_number_id,
+                    wa_message_id=receipt.wa_message_id,
+                )
+            except CircuitBreakerOpenError as e:
+                is_marked = False
+                retry_after = e.retry_after
+
+        if is_marked:
+            self._sent += 1
+            return None
+
+        self._failed += 1
+
+        if key in self._receipts:
+            return None  # newer message receipt covers failed one
+
+        if (
+            self._is_closed
+            or receipt.attempts >= self._retries
+            or not retry_budget.try_retry()
+        ):
+            logger.error(
+                "Failed to mark message %s as read after %s attempts",
+                receipt.wa_message_id,
+                receipt.attempts + 1,
+            )
+            self._dropped += 1
+            return None
+
+        delay = max(
+            decorrelated_jitter(
+                base=self._retry_interval,
+                previous=exponential_backoff(
+                    interval=self._retry_interval,
+                    exponential=self._retry_exponential,
+                    retry_number=receipt.attempts,
+                ),
+                cap=self._retry_max_interval,
+            ),
+            retry_after,
+        )
+        receipt.attempts += 1
+        logger.warning(
+            "Failed to mark message %s as read, retrying in %.1fs",
+            receipt.wa_message_id,
+            delay,
+        )
+        self._schedule(key=key, receipt=receipt, delay=delay)
+
+
+def create_read_receipt_dispatcher(app: FastAPI) -> ReadReceiptDispatcher:
+    """Create app-scoped read receipt dispatcher"""
+    settings = get_settings()
+
+    dispatcher = ReadReceiptDispatcher(
+        app=app,
+        window=settings.WHATSAPP_READ_RECEIPT_WINDOW,
+        retries=settings.WHATSAPP_READ_RECEIPT_RETRIES,
+        retry_interval=settings.WHATSAPP_READ_RECEIPT_RETRY_INTERVAL,
+        retry_exponential=settings.WHATSAPP_READ_RECEIPT_RETRY_EXPONENTIAL,
+        retry_max_interval=settings.WHATSAPP_READ_RECEIPT_RETRY_MAX_INTERVAL,
+        concurrency=settings.WHATSAPP_READ_RECEIPT_CONCURRENCY,
+    )
+    register_metrics_source("read_receipts", dispatcher.metrics)
+
+    return dispatcher
+
+
+def get_read_receipt_dispatcher(app: FastAPI) -> ReadReceiptDispatcher | None:
+    """Get app-scoped read receipt dispatcher"""
+    return getattr(app, "read_receipt_dispatcher", None)
@@ -0,0 +1,99 @@
+import logging
+import time
+
+from backend.core.metrics import register_metrics_source
+from backend.settings import get_settings
+from fastapi import FastAPI
+
+
+logger = logging.getLogger(__name__)
+
+
+class RecentMessageFilter:
+    """
+    Memory-bounded filter of recently ingested Whatsapp message ids.
+
+    Ids are kept in two generations, current generation becomes previous one every
+    `window` seconds or when it holds `size / 2` ids, so an id is remembered for
+    at least one window unless filter is overflowed. Filter has no false positives,
+    database stays the authority on misses.
+    """
+
+    def __init__(self, size: int, window: float) -> None:
+        self._generation_size = max(size // 2, 1)
+        self._window = window
+        self._current: set[str] = set()
+        self._previous: set[str] = set()
+        self._rotated_at = time.monotonic()
+        self._rejected = 0
+
+    def __contains__(self, wa_message_id: str) -> bool:
+        self._rotate_if_needed()
+        return wa_message_id in self._current or wa_message_id in self._previous
+
+    def is_duplicate(self, wa_message_id: str) -> bool:
+        """Check message id was ingested recently, counts rejected duplicates"""
+        if wa_message_id not in self:
+            return False
+
+        self._rejected += 1
+        return True
+
+    def is_all_duplicates(self, wa_message_ids: list[str]) -> bool:
+        """
+        Check all message ids were ingested recently, they are counted as rejected
+        duplicates if so. Returns `False` for empty list
+        """
+        if not wa_message_ids or not all(
+            wa_message_id in self for wa_message_id in wa_message_ids
+        ):
+            return False
+
+        self._rejected += len(wa_message_ids)
+        return True
+
+    def add(self, wa_message_id: str) -> None:
+        """Remember ingested message id"""
+        self._rotate_if_needed()
+        self._current.add(wa_message_id)
+
+    def discard(self, wa_message_id: str) -> None:
+        """Forget message id, so redelivery of failed message is processed again"""
+        self._current.discard(wa_message_id)
+        self._previous.discard(wa_message_id)
+
+    def metrics(self) -> dict[str, float]:
+        """Number of remembered ids and rejected duplicates"""
+        return {
+            "size": len(self._current) + len(self._previous),
+            "rejected": self._rejected,
+        }
+
+    def _rotate_if_needed(self) -> None:
+        if (
+            len(self._current) < self._generation_size
+            and time.monotonic() - self._rotated_at < self._window
+        ):
+            return None
+
+        self._previous = self._current
+        self._current = set()
+        self._rotated_at = time.monotonic()
+
+
+def create_recent_message_filter() -> RecentMessageFilter:
+    """Create app-scoped recent message filter"""
+    settings = get_settings()
+
+    message_filter = RecentMessageFilter(
+        size=settings.WHATSAPP_DUPLICATE_FILTER_SIZE,
+        window=settings.WHATSAPP_DUPLICATE_FILTER_WINDOW,
+    )
+    register_metrics_source("duplicate_filter", message_filter.metrics)
+
+    return message_filter
+
+
+def get_recent_message_filter(app: FastAPI) -> RecentMessageFilter | None:
+    """Get app-scoped recent message filter"""
+    return getattr(app, "recent_message_filter", None)
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+from backend.core.models import MessageProcessingInfo
+from backend.settings import get_settings
+from fastapi import FastAPI
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _SessionBatch:
+    """Messages of one session waiting for flush"""
+
+    deadline: float
+    flushed: asyncio.Future
+    messages: list[tuple[int, int, str]] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+class SessionMessageDebouncer:
+    """
+    In-process per-session coalescing buffer.
+
+    Every new message of a session resets the idle timer. Batch is flushed after
+    `idle_seconds` without new messages or `max_wait_seconds` after the first one.
+    """
+
+    def __init__(self, idle_seconds: float, max_wait_seconds: float) -> None:
+        self._idle_seconds = idle_seconds
+        self._max_wait_seconds = max_wait_seconds
+        self._batches: dict[int, _SessionBatch] = {}
+
+    def add(
+        self,
+        session_id: int,
+        message_id: int,
+        user_message: str,
+        received_timestamp: int,
+    ) -> asyncio.Future:
+        """Add message to session batch. Returns future resolved with flushed batch"""
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+
+        batch = self._batches.get(session_id)
+        if batch is None:
+            batch = _SessionBatch(
+                deadline=now + self._max_wait_seconds,
+                flushed=loop.create_future(),
+            )
+            self._batches[session_id] = batch
+
+        batch.messages.append((received_timestamp, message_id, user_message))
+        self._reset_timer(session_id=session_id, batch=batch)
+
+        return batch.flushed
+
+    async def wait(
+        self,
+        session_id: int,
+        message_id: int,
+        user_message: str,
+        received_timestamp: int,
+    ) -> list[MessageProcessingInfo]:
+        """Add message to session batch and wait for flush. Returns batch messages in receiving order"""
+        flushed = self.add(
+            session_id=session_id,
+            message_id=message_id,
+            user_message=user_message,
+            received_timestamp=received_timestamp,
+        )
+
+        return await asyncio.shield(flushed)
+
+    def notify(self, session_id: int) -> None:
+        """Reset idle timer of session batch on message received by another worker"""
+        batch = self._batches.get(session_id)
+        if batch:
+            self._reset_timer(session_id=session_id, batch=batch)
+
+    def close(self) -> None:
+        """Flush all pending batches"""
+        for session_id in list(self._batches):
+            self._flush(session_id)
+
+    def _reset_timer(self, session_id: int, batch: _SessionBatch) -> None:
+        if batch.timer:
+            batch.timer.cancel()
+
+        batch.timer = asyncio.get_running_loop().call_later(
+            max(min(self._idle_seconds, batch.deadline - time.monotonic()), 0),
+            self._flush,
+            session_id,
+        )
+
+    def _flush(self, session_id: int) -> None:
+        batch = self._batches.pop(session_id, None)
+        if batch is None:
+            return
+
+        if batch.timer:
+            batch.timer.cancel()
+
+        messages = sorted(batch.messages)
+
+        logger.debug("Flushing %s messages of session %s", len(messages), session_id)
+
+        if not batch.flushed.done():
+            batch.flushed.set_result(
+                [
+                    MessageProcessingInfo(
+                        message_id=message_id, user_message=user_message
+                    )
+                    for _, message_id, user_message in messages
+                ]
+            )
+
+
+def create_session_message_debouncer() -> SessionMessageDebouncer:
+    """Create app-scoped session message debouncer"""
+    settings = get_settings()
+
+    return SessionMessageDebouncer(
+        idle_seconds=settings.WHATSAPP_CONCATENATED_MESSAGE_IDLE_SECONDS,
+        max_wait_seconds=settings.WHATSAPP_CONCATENATED_MESSAGE_WAITING_SECONDS,
+    )
+
+
+def get_session_message_debouncer(app: FastAPI) -> SessionMessageDebouncer | None:
+    """Get app-scoped session message debouncer"""
+    return getattr(app, "session_message_debouncer", None)
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+
+import asyncpg
+from backend.api.v1.webhook.constants import MESSAGE_PROCESSING_CHANNEL
+from backend.tasks.message_processing.session_message_debouncer import (
+    SessionMessageDebouncer,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class SessionMessageListener:
+    """
+    Listens for messages created by any app worker and wakes waiting sessions.
+    Holds one pool connection while app is running.
+    """
+
+    def __init__(
+        self,
+        pool: asyncpg.pool.Pool,
+        debouncer: SessionMessageDebouncer,
+        reconnect_interval: float = 1,
+    ) -> None:
+        self._pool = pool
+        self._debouncer = debouncer
+        self._reconnect_interval = reconnect_interval
+        self._connection: asyncpg.pool.PoolConnectionProxy | None = None
+        self._reconnect_task: asyncio.Task | None = None
+        self._is_closed = False
+
+    async def start(self) -> None:
+        """Acquire connection and start listening"""
+        self._connection = await self._pool.acquire()
+        self._connection.add_termination_listener(self._on_termination)
+        await self._connection.add_listener(
+            MESSAGE_PROCESSING_CHANNEL, self._on_notification
+        )
+        logger.info("Listening %s channel", MESSAGE_PROCESSING_CHANNEL)
+
+    async def close(self) -> None:
+        """Stop listening and release connection"""
+        self._is_closed = True
+
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+
+        if self._connection is None:
+            return
+
+        connection, self._connection = self._connection, None
+        if not connection.is_closed():
+            connection.remove_termination_listener(self._on_termination)
+            await connection.remove_listener(
+                MESSAGE_PROCESSING_CHANNEL, self._on_notification
+            )
+
+        await self._pool.release(connection)
+
+    def _on_notification(
+        self,
+        connection: asyncpg.Connection,  # pylint: disable=W0613
+        pid: int,  # pylint: disable=W0613
+        channel: str,  # pylint: disable=W0613
+        payload: str,
+    ) -> None:
+        self._debouncer.notify(session_id=int(payload))
+
+    def _on_termination(
+        self, connection: asyncpg.Connection  # pylint: disable=W0613
+    ) -> None:
+        if self._is_closed:
+            return
+
+        logger.error("Listener connection lost, reconnecting")
+        self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        if self._connection is not None:
+            await self._pool.release(self._connection)
+            self._connection = None
+
+        while not self._is_closed:
+            try:
+                await self.start()
+                return
+
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.error("Listener reconnection failed: %s", e)
+                await asyncio.sleep(self._reconnect_interval)
+
+
+async def create_session_message_listener(
+    pool: asyncpg.pool.Pool,
+    debouncer: SessionMessageDebouncer,
+) -> SessionMessageListener:
+    """Create and start session message listener"""
+    listener = SessionMessageListener(pool=pool, debouncer=debouncer)
+    await listener.start()
+
+    return listener
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import zlib
+from typing import Awaitable, Callable, TypeVar
+
+from backend.core.metrics import register_metrics_source
+from backend.settings import get_settings
+from fastapi import FastAPI
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class UserLaneExecutor:
+    """
+    Sharded executor for per-user work.
+
+    `(phone_number_id, phone_number)` is hashed to one of `lanes` lanes. Work in one
+    lane runs serially in arrival order, lanes run in parallel.
+    """
+
+    def __init__(self, lanes: int) -> None:
+        self._locks = [asyncio.Lock() for _ in range(lanes)]
+        self._waiting = 0
+
+    def get_lane(self, phone_number_id: str, phone_number: str) -> int:
+        """Get stable lane number of user"""
+        key = f"{phone_number_id}:{phone_number}".encode()
+        return zlib.crc32(key) % len(self._locks)
+
+    async def run(
+        self,
+        phone_number_id: str,
+        phone_number: str,
+        func: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Run `func` in user lane after all work submitted to the lane earlier"""
+        lock = self._locks[
+            self.get_lane(phone_number_id=phone_number_id, phone_number=phone_number)
+        ]
+
+        self._waiting += 1
+        try:
+            await lock.acquire()
+        finally:
+            self._waiting -= 1
+
+        try:
+            return await func()
+        finally:
+            lock.release()
+
+    def metrics(self) -> dict[str, float]:
+        """Number of lanes, busy lanes and work waiting for its lane"""
+        return {
+            "lanes": len(self._locks),
+            "busy": sum(lock.locked() for lock in self._locks),
+            "waiting": self._waiting,
+        }
+
+
+def create_user_lane_executor() -> UserLaneExecutor:
+    """Create app-scoped user lane executor"""
+    settings = get_settings()
+
+    executor = UserLaneExecutor(lanes=settings.WHATSAPP_USER_LANES)
+    register_metrics_source("user_lanes", executor.metrics)
+
+    return executor
+
+
+def get_user_lane_executor(app: FastAPI) -> UserLaneExecutor | None:
+    """Get app-scoped user lane executor"""
+    return getattr(app, "user_lane_executor", None)
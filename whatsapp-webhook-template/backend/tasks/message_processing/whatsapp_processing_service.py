@@ -1,87 +1,136 @@
+import asyncio
 import logging
+from functools import partial
 from pprint import pformat
 
+from backend.api.v1.webhook.constants import REPLY_CALLBACK_DATA_PREFIX
 from backend.api.v1.webhook.models import (
     WhatsappEntry,
+    WhatsappEntryChangeValue,
+    WhatsappEntryChangeValueMessage,
+    WhatsappEntryChangeValueStatus,
     WhatsappEntryMessageInfo,
+    WhatsappMessageCallback,
     WhatsappWebhookUpdates,
 )
 from backend.api.v1.webhook.repositories import (
     MessageProcessingRepository,
     MessageRepository,
     MessageStatusRepository,
-    SessionRepository,
-    UserRepository,
 )
 from backend.core.constants import (
     CommunicationChannel,
+    MessageProcessingStep,
     MessageStatus,
+    WhatsappMessageStatus,
     WhatsappMessageType,
 )
-from backend.core.models import ProcessEntryCallback
+from backend.core.models import (
+    MessageIngestInfo,
+    MessageProcessingCallbackInfo,
+    ProcessEntryCallback,
+)
 from backend.core.utils import get_current_timestamp, is_older_than_24_hours
+from backend.core.whatsapp.send_rate_limiter import get_send_rate_limiter
 from backend.core.whatsapp.whatsapp_mixin import WhatsappMixin
 from backend.settings import get_settings
 from backend.tasks.message_processing.exceptions import MessageProcessingError
 from backend.tasks.message_processing.message_processing_service_base import (
     MessageProcessingMixin,
 )
+from backend.tasks.message_processing.read_receipt_dispatcher import (
+    get_read_receipt_dispatcher,
+)
+from backend.tasks.message_processing.recent_message_filter import (
+    get_recent_message_filter,
+)
+from backend.tasks.message_processing.session_message_debouncer import (
+    get_session_message_debouncer,
+)
+from backend.tasks.message_processing.user_lane_executor import (
+    get_user_lane_executor,
+)
 from fastapi import FastAPI
 from shared_lib_template.db.postgres import get_postgres_connector
+from shared_lib_template.utils import CircuitBreakerOpenError, get_http_client_session
 
 
 logger = logging.getLogger(__name__)
 
+# Status of bot reply by Whatsapp status of outbound message
+WHATSAPP_REPLY_STATUSES: dict[str, MessageStatus] = {
+    WhatsappMessageStatus.SENT: MessageStatus.DELIVERED,
+    WhatsappMessageStatus.DELIVERED: MessageStatus.DELIVERED,
+    WhatsappMessageStatus.READ: MessageStatus.OPENED,
+    WhatsappMessageStatus.FAILED: MessageStatus.FAILED_TO_SEND,
+}
+
 
 class WhatsappMessageProcessingService(MessageProcessingMixin, WhatsappMixin):
     """Whatsapp webhook processing runner"""
 
     def __init__(self, app: FastAPI) -> None:
         self._settings = get_settings()
+        self._app = app
+        # Shared by concurrent entry tasks, mutated only between awaits
         self._errors: list[str] = []
         self._messages_to_delete_from_processing: set[int] = set()
-        self._postgres_conn = get_postgres_connector(logger=logger, app=app)
+        self._circuit_breaker_error: CircuitBreakerOpenError | None = None
+        self._entry_semaphore = asyncio.Semaphore(
+            self._settings.WHATSAPP_ENTRY_CONCURRENCY
+        )
+        self._recent_message_filter = get_recent_message_filter(app=app)
+        self._read_receipt_dispatcher = get_read_receipt_dispatcher(app=app)
 
-        super().__init__()
-        super(MessageProcessingMixin, self).__init__()
+        super().__init__(
+            session_message_debouncer=get_session_message_debouncer(app=app),
+            user_lane_executor=get_user_lane_executor(app=app),
+        )
+        super(MessageProcessingMixin, self).__init__(
+            client_session=get_http_client_session(app=app),
+            send_rate_limiter=get_send_rate_limiter(app=app),
+        )
 
     async def process_updates(
         self,
         data: WhatsappWebhookUpdates,
     ) -> None:
-        """Process Whatsapp updates"""
+        """
+        Process Whatsapp updates. Updates of different users are processed concurrently.
+        Raises `CircuitBreakerOpenError` if messages were not processed because Whatsapp
+        API is unavailable, so updates are parked until it recovers
+        """
         logger.info("Found %s updates, processing...", len(data.entry))
         logger.debug("Entries: %s", data.model_dump_json(indent=2))
 
-        session_repository = SessionRepository(conn=self._postgres_conn)
-        user_repository = UserRepository(conn=self._postgres_conn)
-        message_status_repository = MessageStatusRepository(conn=self._postgres_conn)
-        message_repository = MessageRepository(conn=self._postgres_conn)
-        message_processing_repository = MessageProcessingRepository(
-            conn=self._postgres_conn
-        )
+        user_messages: dict[tuple[str, str], list[WhatsappEntryMessageInfo]] = {}
+        reply_statuses: list[tuple[str, MessageStatus, int, int | None]] = []
+
+        for entry in data.entry:
+            await self._collect_entry_updates(
+                entry=entry,
+                user_messages=user_messages,
+                reply_statuses=reply_statuses,
+            )
 
         try:
-            for entry in data.entry:
-                try:
-                    processing_info = await self._process_entry(
-                        entry=entry,
-                        session_repository=session_repository,
-                        user_repository=user_repository,
-                        message_status_repository=message_status_repository,
-                        message_repository=message_repository,
-                        message_processing_repository=message_processing_repository,
+            await asyncio.gather(
+                self._process_reply_statuses(reply_statuses=reply_statuses),
+                *(
+                    self._process_user_updates(
+                        phone_number_id=phone_number_id,
+                        phone_number=phone_number,
+                        messages=messages,
                     )
+                    for (
+                        phone_number_id,
+                        phone_number,
+                    ), messages in user_messages.items()
+                ),
+            )
 
-                    if processing_info:
-                        self._messages_to_delete_from_processing.update(
-                            processing_info.message_ids
-                        )
-
-                except Exception as e:
-                    error_message = f"Error processing entry {entry.id_}. {str(e)}"
-                    logger.error(error_message)
-                    await self._add_error(error=error_message)
+            if self._circuit_breaker_error is not None:
+                raise self._circuit_breaker_error
 
             if not self._errors:
                 logger.info("Updates successfully processed")
@@ -93,210 +142,377 @@ class WhatsappMessageProcessingService(MessageProcessingMixin, WhatsappMixin):
             raise MessageProcessingError(error_message)
 
         finally:
-            for message_id in self._messages_to_delete_from_processing:
-                await message_processing_repository.delete_message_processing_entry(
-                    message_id=message_id,
-                )
+            postgres_conn = get_postgres_connector(logger=logger, app=self._app)
+            message_processing_repository = MessageProcessingRepository(
+                conn=postgres_conn
+            )
 
-            await self._postgres_conn.close()
+            try:
+                if self._messages_to_delete_from_processing:
+                    await message_processing_repository.delete_message_processing_entries(
+                        message_ids=list(self._messages_to_delete_from_processing),
+                    )
+            finally:
+                await postgres_conn.close()
 
-    async def _process_entry(
+    async def _collect_entry_updates(
         self,
         entry: WhatsappEntry,
-        session_repository: SessionRepository,
-        user_repository: UserRepository,
-        message_status_repository: MessageStatusRepository,
-        message_repository: MessageRepository,
-        message_processing_repository: MessageProcessingRepository,
-    ) -> ProcessEntryCallback | None:
-        """Processing whatsapp entry"""
-        if (
-            len(entry.changes) == 0
-            or len(entry.changes[0].value.messages) == 0
-            or len(entry.changes[0].value.contacts) == 0
+        user_messages: dict[tuple[str, str], list[WhatsappEntryMessageInfo]],
+        reply_statuses: list[tuple[str, MessageStatus, int, int | None]],
+    ) -> None:
+        """
+        Group messages of all entry changes by user, in receiving order, and collect
+        statuses of bot replies by their Whatsapp id, with replied message id if reply
+        was sent with idempotency key
+        """
+        if not any(
+            change.value.messages and change.value.contacts or change.value.statuses
+            for change in entry.changes
         ):
-            if (
-                len(entry.changes[0].value.statuses) > 0
-                and entry.changes[0].value.statuses[0].status == "read"
-            ):
-                logger.info("Processing message read status")
-
-                # fmt: off
-                delivered_messages = await message_repository.get_user_delivered_messages(
-                    phone_number=entry.changes[0].value.statuses[0].recipient_id,
+            logger.debug("Entry message %s is empty", entry.id_)
+            return None
+
+        for change in entry.changes:
+            phone_number_id = change.value.metadata.phone_number_id
+
+            for status in change.value.statuses:
+                message_status = WHATSAPP_REPLY_STATUSES.get(status.status)
+
+                if message_status is None:
+                    logger.debug("Status %s is not tracked, skipping", status.status)
+                    continue
+
+                reply_statuses.append(
+                    (
+                        status.id_,
+                        message_status,
+                        int(status.timestamp),
+                        self._get_replied_message_id(status=status),
+                    )
                 )
-                # fmt: on
 
-                for message in delivered_messages:
-                    await message_status_repository.update_message_status(
-                        status_id=message.message_status_id,
-                        status=MessageStatus.OPENED,
+            if not change.value.contacts:
+                continue
+
+            for message in change.value.messages:
+                if (
+                    self._recent_message_filter
+                    and self._recent_message_filter.is_duplicate(message.id_)
+                ):
+                    logger.info(
+                        "Message %s was recently ingested, skipping", message.id_
+                    )
+                    continue
+
+                try:
+                    entry_info = await self._get_entry_message_info(
+                        value=change.value, message=message
+                    )
+                except Exception as e:
+                    error_message = f"Error processing entry {entry.id_}. {str(e)}"
+                    logger.error(error_message)
+                    await self._add_error(error=error_message)
+                    continue
+
+                if entry_info.type_ in (
+                    WhatsappMessageType.REACTION,
+                    WhatsappMessageType.IMAGE,
+                    WhatsappMessageType.DOCUMENT,
+                    WhatsappMessageType.AUDIO,
+                    WhatsappMessageType.STICKER,
+                    WhatsappMessageType.VIDEO,
+                ):
+                    logger.warning(
+                        "Message type is %s, skipping. Message id %s",
+                        entry_info.type_,
+                        entry_info.wa_message_id,
+                    )
+                    continue
+
+                if is_older_than_24_hours(entry_info.timestamp):
+                    logger.warning(
+                        "can not process entry `%s`, message `%s` due to expired session",
+                        entry.id_,
+                        entry_info.wa_message_id,
                     )
+                    continue
 
                 logger.info(
-                    "Messages marked as opened and metrics event created: %s",
-                    delivered_messages,
+                    "Get message from user (%s, %s): %s",
+                    entry_info.user_name,
+                    entry_info.phone_number,
+                    entry_info.text,
                 )
 
-            logger.debug("Entry message %s is empty", entry.id_)
+                user_messages.setdefault(
+                    (phone_number_id, entry_info.phone_number), []
+                ).append(entry_info)
+
+    async def _process_reply_statuses(
+        self,
+        reply_statuses: list[tuple[str, MessageStatus, int, int | None]],
+    ) -> None:
+        """
+        Apply statuses of bot replies from all entries in one statement. Replies whose
+        Whatsapp id was not saved are checkpointed first, so their retry is not sent
+        """
+        if not reply_statuses:
             return None
 
-        entry_info = await self._get_entry_message_info(entry=entry)
+        wa_reply_message_ids, statuses, timestamps, replied_message_ids = map(
+            list, zip(*reply_statuses)
+        )
+        postgres_conn = get_postgres_connector(logger=logger, app=self._app)
 
-        if entry_info.type_ in (
-            WhatsappMessageType.REACTION,
-            WhatsappMessageType.IMAGE,
-            WhatsappMessageType.DOCUMENT,
-            WhatsappMessageType.AUDIO,
-            WhatsappMessageType.STICKER,
-            WhatsappMessageType.VIDEO,
-        ):
-            logger.warning(
-                "Message type is %s, skipping. Message id %s",
-                entry_info.type_,
-                entry_info.wa_message_id,
+        try:
+            if any(replied_message_ids):
+                recorded_message_ids = await MessageRepository(
+                    conn=postgres_conn
+                ).record_reply_message_ids(
+                    message_ids=replied_message_ids,
+                    wa_reply_message_ids=wa_reply_message_ids,
+                    timestamps=timestamps,
+                )
+                if recorded_message_ids:
+                    logger.info(
+                        "Recorded replies of messages from statuses: %s",
+                        recorded_message_ids,
+                    )
+
+            message_ids = await MessageStatusRepository(
+                conn=postgres_conn
+            ).update_reply_statuses(
+                wa_reply_message_ids=wa_reply_message_ids,
+                statuses=statuses,
+                timestamps=timestamps,
+            )
+            logger.info(
+                "Applied %s reply statuses, updated messages: %s",
+                len(reply_statuses),
+                message_ids,
             )
-            return None
 
-        user_id = await user_repository.get_user_id(
-            user_name=entry_info.user_name,
-            phone_number=entry_info.phone_number,
-            phone_number_id=entry_info.phone_number_id,
-        )
+        except Exception as e:
+            error_message = f"Error processing reply statuses. {str(e)}"
+            logger.error(error_message)
+            await self._add_error(error=error_message)
 
-        if is_older_than_24_hours(entry_info.timestamp):
-            logger.warning(
-                "can not process entry `%s`, message `%s` due to expired session",
-                entry.id_,
-                entry_info.wa_message_id,
+        finally:
+            await postgres_conn.close()
+
+    async def _process_user_updates(
+        self,
+        phone_number_id: str,
+        phone_number: str,
+        messages: list[WhatsappEntryMessageInfo],
+    ) -> None:
+        """
+        Process messages of one user: ingest all of them in one round trip, then
+        process them concurrently as one batch. Entry semaphore is held until batch
+        is processed, so it bounds debounce waits and Whatsapp API calls as well
+        """
+        async with self._entry_semaphore:
+            # Connector holds connection state, so every task needs its own
+            postgres_conn = get_postgres_connector(logger=logger, app=self._app)
+            message_repository = MessageRepository(conn=postgres_conn)
+
+            try:
+                ingest_infos = await self._run_in_user_lane(
+                    phone_number_id=phone_number_id,
+                    phone_number=phone_number,
+                    func=partial(
+                        message_repository.ingest_messages,
+                        user_name=messages[-1].user_name,
+                        phone_number=phone_number,
+                        phone_number_id=phone_number_id,
+                        channel=CommunicationChannel.WHATSAPP,
+                        wa_message_ids=[item.wa_message_id for item in messages],
+                        user_messages=[item.text for item in messages],
+                        received_timestamps=[item.timestamp for item in messages],
+                        status=MessageStatus.PROCESSING,
+                        status_timestamp=get_current_timestamp(),
+                    ),
+                )
+
+            except Exception as e:
+                error_message = (
+                    f"Error processing updates of user {phone_number}. {str(e)}"
+                )
+                logger.error(error_message)
+                await self._add_error(error=error_message)
+                return None
+
+            finally:
+                await postgres_conn.close()
+
+            if len(ingest_infos) != len(messages):
+                error_message = "Messages were not created, skipping user updates"
+                logger.error(error_message)
+                await self._add_error(error_message)
+                return None
+
+            if self._recent_message_filter:
+                for entry_info, ingest_info in zip(messages, ingest_infos):
+                    if not ingest_info.is_duplicate:
+                        self._recent_message_filter.add(entry_info.wa_message_id)
+
+            # Messages wait for each other to be concatenated, so they are not serialized
+            await asyncio.gather(
+                *(
+                    self._process_user_message(
+                        entry_info=entry_info, ingest_info=ingest_info
+                    )
+                    for entry_info, ingest_info in zip(messages, ingest_infos)
+                )
             )
 
-            return None
+    async def _process_user_message(
+        self,
+        entry_info: WhatsappEntryMessageInfo,
+        ingest_info: MessageIngestInfo,
+    ) -> None:
+        """Process ingested message, errors are collected per message"""
+        postgres_conn = get_postgres_connector(logger=logger, app=self._app)
 
-        message_info = await message_repository.get_message(
-            wa_message_id=entry_info.wa_message_id,
-        )
-        message_id = message_info.message_id if message_info else None
-
-        if message_id and (
-            await message_processing_repository.is_message_processing(message_id)
-            or await message_repository.get_message_status(message_id)
-            in (
-                MessageStatus.DELIVERED,
-                MessageStatus.OPENED,
+        try:
+            processing_info = await self._process_message(
+                entry_info=entry_info,
+                ingest_info=ingest_info,
+                message_status_repository=MessageStatusRepository(conn=postgres_conn),
+                message_repository=MessageRepository(conn=postgres_conn),
+                message_processing_repository=MessageProcessingRepository(
+                    conn=postgres_conn
+                ),
             )
-        ):
+
+            if processing_info:
+                self._messages_to_delete_from_processing.update(
+                    processing_info.message_ids
+                )
+
+        except CircuitBreakerOpenError as e:
             logger.warning(
-                "Message %s is already processing or processed, skipping",
-                entry_info.wa_message_id,
+                "Message %s is not processed: %s", entry_info.wa_message_id, e
             )
-            return None
+            self._circuit_breaker_error = e
+            self._forget_recent_message(wa_message_id=entry_info.wa_message_id)
 
-        logger.info(
-            "Get message from user (%s, %s): %s",
-            entry_info.user_name,
-            entry_info.phone_number,
-            entry_info.text,
-        )
+        except Exception as e:
+            error_message = (
+                f"Error processing message {entry_info.wa_message_id}. {str(e)}"
+            )
+            logger.error(error_message)
+            await self._add_error(error=error_message)
+            self._forget_recent_message(wa_message_id=entry_info.wa_message_id)
 
-        session_info = await session_repository.get_active_session_info(
-            user_id=user_id,
-            timestamp=entry_info.timestamp,
-            channel=CommunicationChannel.WHATSAPP,
-        )
-        logger.info("Working with session (id=%s)", session_info.session_id)
+        finally:
+            await postgres_conn.close()
 
-        if not message_id:
-            message_id = await message_repository.create_message(
-                session_id=session_info.session_id,
-                received_timestamp=entry_info.timestamp,
-                user_message=entry_info.text,
-                wa_message_id=entry_info.wa_message_id,
+    async def _process_message(
+        self,
+        entry_info: WhatsappEntryMessageInfo,
+        ingest_info: MessageIngestInfo,
+        message_status_repository: MessageStatusRepository,
+        message_repository: MessageRepository,
+        message_processing_repository: MessageProcessingRepository,
+    ) -> ProcessEntryCallback | None:
+        """Processing ingested whatsapp message"""
+        if (
+            ingest_info.is_duplicate
+            or ingest_info.session_id is None
+            or ingest_info.status_id is None
+        ):
+            logger.warning(
+                "Message %s is already processing or processed, skipping",
+                entry_info.wa_message_id,
             )
-            if not message_id:
-                error_message = "Message was not created, skipping entry"
-                logger.error(error_message)
-                await self._add_error(error_message)
-
-                return None
+            return None
 
-        await message_processing_repository.create_processing_message(
-            message_id=message_id, session_id=session_info.session_id
-        )
+        user_id = ingest_info.user_id
+        session_id = ingest_info.session_id
+        message_id = ingest_info.message_id
+        status_id = ingest_info.status_id
         self._messages_to_delete_from_processing.add(message_id)
 
-        status_id = await message_status_repository.get_message_status_id(
-            message_id=message_id,
-            status=MessageStatus.PROCESSING,
-            timestamp=get_current_timestamp(),
-        )
-
+        logger.info("Working with session (id=%s)", session_id)
         logger.info(
             "Created message in DB. message_id=%s, status_id=%s",
             message_id,
             status_id,
         )
 
-        is_message_marked_as_read = await self._mark_message_as_read(
-            phone_number_id=entry_info.phone_number_id,
-            wa_message_id=entry_info.wa_message_id,
-        )
-        logger.info("Message marking as read status: %s", is_message_marked_as_read)
-
-        if not is_message_marked_as_read:
-            error_message = (
-                f"Message marking as read failed for message with id {message_id}"
+        if ingest_info.processing_step != MessageProcessingStep.RECEIVED:
+            logger.info(
+                "Resuming message %s after step `%s`",
+                message_id,
+                ingest_info.processing_step,
             )
-            logger.error(error_message)
-            await self._add_error(error_message)
 
-            return None
+        if ingest_info.processing_step == MessageProcessingStep.REPLIED:
+            await message_status_repository.update_sent_message_status(
+                status_id=status_id,
+                status=MessageStatus.DELIVERED,
+                processing_step=MessageProcessingStep.STATUS_UPDATED,
+            )
 
-        await message_status_repository.update_message_status(
-            status_id=status_id,
-            status=MessageStatus.READ,
-        )
+            return ProcessEntryCallback(message_ids=[message_id])
 
-        if session_info.is_new_session:
-            entry_info.text = await self._format_new_session_first_message(
-                entry_info.text
-            )
+        if ingest_info.processing_step == MessageProcessingStep.RECEIVED:
+            if not await self._mark_as_read(entry_info=entry_info):
+                error_message = (
+                    f"Message marking as read failed for message with id {message_id}"
+                )
+                logger.error(error_message)
+                await self._add_error(error_message)
+                self._forget_recent_message(wa_message_id=entry_info.wa_message_id)
 
-        logger.debug("Prepared message to OpenAI: `%s`", entry_info.text)
+                return None
 
-        processing_info = await self._wait_for_new_messages(
-            session_id=session_info.session_id,
-            is_new_session=session_info.is_new_session,
-            message_id=message_id,
-            status_id=status_id,
-            message_repository=message_repository,
-            message_status_repository=message_status_repository,
-            message_processing_repository=message_processing_repository,
-            waiting_interval=self._settings.WHATSAPP_CONCATENATED_MESSAGE_WAITING_SECONDS,
-        )
+            await message_status_repository.update_message_status_and_processing_step(
+                status_id=status_id,
+                status=MessageStatus.READ,
+                processing_step=MessageProcessingStep.READ_MARKED,
+            )
 
-        if processing_info.need_to_stop:
-            self._messages_to_delete_from_processing.discard(message_id)
+        if ingest_info.bot_message is not None:
+            # Reply of failed attempt already covers concatenated messages
+            bot_reply = ingest_info.bot_message
+            message_ids_to_clear = [message_id]
 
-            return ProcessEntryCallback(
-                message_ids=processing_info.processing_message_ids_to_clear,
+        else:
+            processing_info = await self._prepare_reply(
+                entry_info=entry_info,
+                ingest_info=ingest_info,
+                session_id=session_id,
+                status_id=status_id,
+                message_status_repository=message_status_repository,
+                message_processing_repository=message_processing_repository,
             )
 
-        if processing_info.new_message_text:
-            entry_info.text = processing_info.new_message_text
+            if processing_info.need_to_stop:
+                self._messages_to_delete_from_processing.discard(message_id)
 
-        # Put your answer logic here
-        bot_reply = entry_info.text
+                return ProcessEntryCallback(
+                    message_ids=processing_info.processing_message_ids_to_clear,
+                )
 
-        await message_repository.update_message(
-            message_id=message_id,
-            bot_message=bot_reply,
-        )
+            # Put your answer logic here
+            bot_reply = entry_info.text
+            message_ids_to_clear = processing_info.processing_message_ids_to_clear or [
+                message_id
+            ]
+
+            await message_repository.update_message(
+                message_id=message_id,
+                bot_message=bot_reply,
+            )
 
         message_callback = await self._send_message(
             phone_number=entry_info.phone_number,
             phone_number_id=entry_info.phone_number_id,
             text=bot_reply,
+            idempotency_key=f"{REPLY_CALLBACK_DATA_PREFIX}{message_id}",
         )
 
         logger.info("Message sending status: %s", bool(message_callback))
@@ -310,6 +526,12 @@ class WhatsappMessageProcessingService(MessageProcessingMixin, WhatsappMixin):
                 message_status_repository=message_status_repository,
                 message_repository=message_repository,
                 channel=CommunicationChannel.WHATSAPP,
+                wa_reply_message_id=(
+                    message_callback.messages[0].id_
+                    if isinstance(message_callback, WhatsappMessageCallback)
+                    and message_callback.messages
+                    else None
+                ),
             )
 
         else:
@@ -320,26 +542,109 @@ class WhatsappMessageProcessingService(MessageProcessingMixin, WhatsappMixin):
                 user_id=user_id,
                 channel=CommunicationChannel.WHATSAPP,
             )
+            # Retry resumes message from read mark and sends stored reply
+            await self._add_error(
+                f"Message sending failed for message with id {message_id}"
+            )
+            self._forget_recent_message(wa_message_id=entry_info.wa_message_id)
+
             return None
 
-        return ProcessEntryCallback(
-            message_ids=processing_info.processing_message_ids_to_clear or [message_id],
+        return ProcessEntryCallback(message_ids=message_ids_to_clear)
+
+    async def _prepare_reply(
+        self,
+        entry_info: WhatsappEntryMessageInfo,
+        ingest_info: MessageIngestInfo,
+        session_id: int,
+        status_id: int,
+        message_status_repository: MessageStatusRepository,
+        message_processing_repository: MessageProcessingRepository,
+    ) -> MessageProcessingCallbackInfo:
+        """
+        Wait for newer messages of session to concatenate them into this one.
+        Text of message to reply is left in `entry_info`
+        """
+        user_message = entry_info.text
+
+        if ingest_info.is_new_session:
+            entry_info.text = await self._format_new_session_first_message(
+                entry_info.text
+            )
+
+        logger.debug("Prepared message to OpenAI: `%s`", entry_info.text)
+
+        processing_info = await self._wait_for_new_messages(
+            session_id=session_id,
+            is_new_session=ingest_info.is_new_session,
+            message_id=ingest_info.message_id,
+            status_id=status_id,
+            user_message=user_message,
+            received_timestamp=entry_info.timestamp,
+            message_status_repository=message_status_repository,
+            message_processing_repository=message_processing_repository,
+            waiting_interval=self._settings.WHATSAPP_CONCATENATED_MESSAGE_WAITING_SECONDS,
         )
 
+        if processing_info.new_message_text:
+            entry_info.text = processing_info.new_message_text
+
+        return processing_info
+
+    async def _mark_as_read(self, entry_info: WhatsappEntryMessageInfo) -> bool:
+        """
+        Mark message as read. With read receipt dispatcher receipt is sent in background
+        and coalesced with newer messages of user, else it is sent at once
+        """
+        if self._read_receipt_dispatcher is not None:
+            self._read_receipt_dispatcher.submit(
+                phone_number_id=entry_info.phone_number_id,
+                phone_number=entry_info.phone_number,
+                wa_message_id=entry_info.wa_message_id,
+                timestamp=entry_info.timestamp,
+            )
+            return True
+
+        is_message_marked_as_read = await self._mark_message_as_read(
+            phone_number_id=entry_info.phone_number_id,
+            wa_message_id=entry_info.wa_message_id,
+        )
+        logger.info("Message marking as read status: %s", is_message_marked_as_read)
+
+        return is_message_marked_as_read
+
+    @staticmethod
+    def _get_replied_message_id(status: WhatsappEntryChangeValueStatus) -> int | None:
+        """Get id of replied message from idempotency key of bot reply"""
+        callback_data = status.biz_opaque_callback_data or ""
+        message_id = callback_data.removeprefix(REPLY_CALLBACK_DATA_PREFIX)
+
+        if message_id == callback_data or not message_id.isdigit():
+            return None
+
+        return int(message_id)
+
+    def _forget_recent_message(self, wa_message_id: str) -> None:
+        """Let retry or redelivery of failed message pass recent message filter"""
+        if self._recent_message_filter:
+            self._recent_message_filter.discard(wa_message_id)
+
     async def _get_entry_message_info(
-        self, entry: WhatsappEntry
+        self,
+        value: WhatsappEntryChangeValue,
+        message: WhatsappEntryChangeValueMessage,
     ) -> WhatsappEntryMessageInfo:
-        """Get model of entry metadata from entry instance"""
+        """Get model of message metadata from entry change value"""
 
         text = None
 
-        if entry.changes[0].value.messages[0].text:
-            text = entry.changes[0].value.messages[0].text.body
+        if message.text:
+            text = message.text.body
 
-        if entry.changes[0].value.messages[0].button:
-            text = entry.changes[0].value.messages[0].button.text
+        if message.button:
+            text = message.button.text
 
-        if text is None and entry.changes[0].value.messages[0].type_ in (
+        if text is None and message.type_ in (
             WhatsappMessageType.REACTION,
             WhatsappMessageType.IMAGE,
             WhatsappMessageType.DOCUMENT,
@@ -352,14 +657,23 @@ class WhatsappMessageProcessingService(MessageProcessingMixin, WhatsappMixin):
         if text is None:
             raise ValueError("Message text not provided")
 
+        user_name = next(
+            (
+                contact.profile.name
+                for contact in value.contacts
+                if contact.wa_id == message.from_
+            ),
+            value.contacts[0].profile.name,
+        )
+
         return WhatsappEntryMessageInfo(
             text=text,
-            user_name=entry.changes[0].value.contacts[0].profile.name,
-            phone_number=entry.changes[0].value.messages[0].from_,
-            phone_number_id=entry.changes[0].value.metadata.phone_number_id,
-            timestamp=entry.changes[0].value.messages[0].timestamp,
-            wa_message_id=entry.changes[0].value.messages[0].id_,
-            type_=entry.changes[0].value.messages[0].type_,
+            user_name=user_name,
+            phone_number=message.from_,
+            phone_number_id=value.metadata.phone_number_id,
+            timestamp=message.timestamp,
+            wa_message_id=message.id_,
+            type_=message.type_,
         )
 
     async def _add_error(self, error: str) -> None:
@@ -33,3 +33,17 @@ async def test_info():
     response = client.get(url)
 
     assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test_metrics():
+    """Tests metrics endpoint"""
+    client = TestClient(app)
+    url = client.app.url_path_for("info_get_app_metrics")
+
+    response = client.get(url, headers={"Authorization": "Bearer test"})
+    assert response.status_code == status.HTTP_200_OK
+    assert isinstance(response.json()["payload"], dict)
+
+    response = client.get(url)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,95 @@
+import hashlib
+import hmac
+import json
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from backend.api.v1.webhook.repositories import MessagePendingRepository
+from backend.api.v1.webhook.services.whatsapp_service import WhatsappService
+from backend.settings import get_settings
+from backend.tasks.message_processing.recent_message_filter import (
+    RecentMessageFilter,
+)
+from main import app
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+@pytest.mark.asyncio
+async def test_webhook_signature_and_body_check(monkeypatch):
+    """Tests webhook checks HMAC of raw body and rejects body without updates shape"""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "WHATSAPP_VALIDATE_SIGNATURE", True)
+    monkeypatch.setattr(settings, "WHATSAPP_APP_SECRET", "secret")
+
+    client = TestClient(app)
+    url = client.app.url_path_for("webhook_post_whatsapp_webhook_process")
+    body = b'{"object": "whatsapp_business_account", "entry": {}}'
+    signature = hmac.new(b"secret", body, hashlib.sha256).hexdigest()
+
+    response = client.post(
+        url, content=body, headers={"x-hub-signature-256": "sha256=wrong"}
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    response = client.post(
+        url, content=body, headers={"x-hub-signature-256": f"sha256={signature}"}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_webhook_skips_recently_ingested_messages(monkeypatch):
+    """Tests webhook is not queued when all its messages were recently ingested
+    and it has no statuses"""
+    queued: list[str] = []
+
+    async def _create_message_pending(self, entry: str) -> int:
+        queued.append(entry)
+        return len(queued)
+
+    monkeypatch.setattr(
+        MessagePendingRepository, "create_message_pending", _create_message_pending
+    )
+
+    recent_message_filter = RecentMessageFilter(size=10, window=60)
+    recent_message_filter.add("wamid.1")
+    recent_message_filter.add("wamid.2")
+    fastapi_app = FastAPI()
+    fastapi_app.connection_pool = None  # type: ignore
+    fastapi_app.recent_message_filter = recent_message_filter  # type: ignore
+
+    def _body(wa_message_ids: list[str], statuses: list[dict]) -> bytes:
+        return json.dumps(
+            {
+                "object": "whatsapp_business_account",
+                "entry": [
+                    {
+                        "id": "entry",
+                        "changes": [
+                            {"value": {"messages": [{"id": wa_message_id}]}}
+                            for wa_message_id in wa_message_ids
+                        ]
+                        + [{"value": {"statuses": statuses}}],
+                    }
+                ],
+            }
+        ).encode()
+
+    service = WhatsappService()
+    await service.process_updates(
+        app=fastapi_app, body=_body(["wamid.1", "wamid.2"], [])
+    )
+    assert not queued
+
+    await service.process_updates(
+        app=fastapi_app, body=_body(["wamid.1", "wamid.3"], [])
+    )
+    await service.process_updates(
+        app=fastapi_app, body=_body(["wamid.1"], [{"id": "wamid.reply"}])
+    )
+    await service.process_updates(app=fastapi_app, body=_body([], []))
+    assert len(queued) == 3
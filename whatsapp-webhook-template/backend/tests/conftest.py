@@ -0,0 +1,41 @@
+from typing import Any, AsyncIterator
+
+import asyncpg
+import pytest
+import pytest_asyncio
+from backend.config import configure_application
+from backend.settings import get_settings
+
+
+@pytest.fixture
+def postgres_connect_kwargs() -> dict[str, Any]:
+    """Connection options of test Postgres from settings"""
+    configure_application()
+    settings = get_settings()
+
+    return {
+        "host": settings.POSTGRES_HOST,
+        "port": settings.POSTGRES_PORT,
+        "user": settings.POSTGRES_USER,
+        "password": settings.POSTGRES_PASSWORD,
+        "database": settings.POSTGRES_DB,
+        "timeout": 5,
+    }
+
+
+@pytest_asyncio.fixture
+async def postgres_pool(
+    postgres_connect_kwargs: dict[str, Any],
+) -> AsyncIterator[asyncpg.Pool]:
+    """Connection pool of test Postgres, test is skipped if Postgres is not available"""
+    try:
+        pool = await asyncpg.create_pool(
+            min_size=1, max_size=5, **postgres_connect_kwargs
+        )
+    except (OSError, asyncpg.PostgresError) as e:
+        pytest.skip(f"Postgres is not available: {e}")
+
+    try:
+        yield pool
+    finally:
+        await pool.close()
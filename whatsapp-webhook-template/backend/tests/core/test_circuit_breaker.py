@@ -0,0 +1,125 @@
+import asyncio
+
+import aiohttp
+import pytest
+from shared_lib_template.constants import CircuitBreakerState
+from shared_lib_template.utils import CircuitBreakerOpenError
+from shared_lib_template.utils.circuit_breaker import CircuitBreaker
+from shared_lib_template.utils.http_request_mixin import is_endpoint_failure
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+async def _call(breaker: CircuitBreaker, error: Exception | None = None) -> None:
+    async with breaker.call():
+        if error is not None:
+            raise error
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_opens_and_recovers_through_probe():
+    """Tests breaker opens after consecutive failures, fails fast while open and
+    is closed by successful probe call"""
+    breaker = CircuitBreaker(
+        endpoint="graph.facebook.com/v19.0/1/messages",
+        failure_threshold=2,
+        recovery_timeout=0.05,
+        is_failure=is_endpoint_failure,
+    )
+    unavailable = aiohttp.ClientConnectionError("connection refused")
+    bad_request = aiohttp.ClientResponseError(None, (), status=400)  # type: ignore
+
+    for error in (unavailable, bad_request, unavailable, unavailable):
+        with pytest.raises(type(error)):
+            await _call(breaker, error)
+
+    assert breaker.state == CircuitBreakerState.OPEN
+    with pytest.raises(CircuitBreakerOpenError) as exc_info:
+        await _call(breaker)
+    assert 0 < exc_info.value.retry_after <= 0.05
+
+    await asyncio.sleep(0.05)
+    assert breaker.state == CircuitBreakerState.HALF_OPEN
+
+    probe_started = asyncio.Event()
+
+    async def _probe() -> None:
+        async with breaker.call():
+            probe_started.set()
+            await asyncio.sleep(0.01)
+
+    probe = asyncio.create_task(_probe())
+    await probe_started.wait()
+    with pytest.raises(CircuitBreakerOpenError):
+        await _call(breaker)
+    await probe
+
+    assert breaker.state == CircuitBreakerState.CLOSED
+    assert breaker.metrics() == {
+        "state": 0,
+        "rejected": 2,
+        "transitions.closed": 1,
+        "transitions.open": 1,
+        "transitions.half_open": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_ignores_calls_started_before_state_change():
+    """Tests late success of call started while breaker was closed neither closes
+    opened breaker nor lets second probe through while half-open"""
+    breaker = CircuitBreaker(
+        endpoint="graph.facebook.com/v19.0/1/messages",
+        failure_threshold=2,
+        recovery_timeout=0.05,
+    )
+    unavailable = aiohttp.ClientConnectionError("connection refused")
+    slow_call_started = asyncio.Event()
+    finish_events = [asyncio.Event() for _ in range(3)]
+
+    async def _slow_call(finish: asyncio.Event) -> None:
+        async with breaker.call():
+            slow_call_started.set()
+            await finish.wait()
+
+    slow_calls = [
+        asyncio.create_task(_slow_call(finish)) for finish in finish_events[:2]
+    ]
+    await slow_call_started.wait()
+
+    for _ in range(2):
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await _call(breaker, unavailable)
+    assert breaker.state == CircuitBreakerState.OPEN
+
+    # late success of call started while closed
+    finish_events[0].set()
+    await slow_calls[0]
+    assert breaker.state == CircuitBreakerState.OPEN
+
+    await asyncio.sleep(0.05)
+    assert breaker.state == CircuitBreakerState.HALF_OPEN
+
+    probe_started = asyncio.Event()
+
+    async def _probe() -> None:
+        async with breaker.call():
+            probe_started.set()
+            await finish_events[2].wait()
+            raise unavailable
+
+    probe = asyncio.create_task(_probe())
+    await probe_started.wait()
+
+    # call started while closed finishes during probe, probe is still running
+    finish_events[1].set()
+    await slow_calls[1]
+    assert breaker.state == CircuitBreakerState.HALF_OPEN
+    with pytest.raises(CircuitBreakerOpenError):
+        await _call(breaker)
+
+    finish_events[2].set()
+    with pytest.raises(aiohttp.ClientConnectionError):
+        await probe
+    assert breaker.state == CircuitBreakerState.OPEN
@@ -0,0 +1,101 @@
+import uuid
+
+import aiohttp
+import pytest
+from aiohttp import web
+from shared_lib_template.base_settings import WhatsappBaseSettings
+from shared_lib_template.utils import HttpRequestMixin, decorrelated_jitter
+from shared_lib_template.utils.circuit_breaker import CircuitBreakerOpenError
+from shared_lib_template.utils.retry_budget import RetryBudget, retry_budget
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+def test_retry_budget_bounds_retries_by_share_of_requests():
+    """Tests retries are allowed up to ratio of requests in window
+    and jittered delays stay within base and cap"""
+    budget = RetryBudget(ratio=0.5, min_retries_per_second=0.1, window=10)
+
+    for _ in range(4):
+        budget.record_request()
+
+    assert [budget.try_retry() for _ in range(4)] == [True, True, True, False]
+    assert budget.metrics() == {"requests": 4, "retries": 3, "rejected": 1}
+
+    for previous in (0, 1, 5, 100):
+        assert 1 <= decorrelated_jitter(base=1, previous=previous, cap=10) <= 10
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"ratio": 0.2, "min_retries_per_second": 1, "window": 0},
+        {"ratio": 0.2, "min_retries_per_second": 1, "window": -1},
+        {"ratio": -0.2, "min_retries_per_second": 1, "window": 10},
+        {"ratio": 0.2, "min_retries_per_second": -1, "window": 10},
+    ],
+)
+def test_retry_budget_rejects_invalid_options(options: dict):
+    """Tests budget is not configured with empty window or negative retries"""
+    with pytest.raises(ValueError):
+        RetryBudget(**options)
+
+
+@pytest.mark.asyncio
+async def test_http_request_mixin_does_not_record_rejected_request():
+    """Tests request rejected by open circuit breaker does not add to retry budget"""
+    url = f"http://127.0.0.1:1/{uuid.uuid4().hex}/messages"
+    settings = WhatsappBaseSettings.model_construct(
+        DEFAULT_API_RETRY_COUNT=1,
+        DEFAULT_API_RETRY_START_TIMEOUT=0,
+        DEFAULT_API_RETRY_MAX_TIMEOUT=0,
+        HTTP_CIRCUIT_BREAKER_FAILURE_THRESHOLD=1,
+        HTTP_CIRCUIT_BREAKER_RECOVERY_TIMEOUT=60,
+    )
+    requests = retry_budget.metrics()["requests"]
+
+    with pytest.raises(aiohttp.ClientConnectionError):
+        await HttpRequestMixin(settings=settings).post(url=url, json={})
+    with pytest.raises(CircuitBreakerOpenError):
+        await HttpRequestMixin(settings=settings).post(url=url, json={})
+
+    assert retry_budget.metrics()["requests"] == requests + 1
+
+
+@pytest.mark.asyncio
+async def test_http_request_mixin_retries_within_budget():
+    """Tests server errors are retried until process-wide retry budget is exhausted"""
+    requests = 0
+
+    async def _unavailable(request: web.Request) -> web.Response:
+        nonlocal requests
+        requests += 1
+        return web.json_response({}, status=503)
+
+    app = web.Application()
+    app.router.add_post("/1/messages", _unavailable)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host="127.0.0.1", port=0)
+    await site.start()
+    url = f"http://127.0.0.1:{runner.addresses[0][1]}/1/messages"
+
+    settings = WhatsappBaseSettings.model_construct(
+        DEFAULT_API_RETRY_COUNT=10,
+        DEFAULT_API_RETRY_START_TIMEOUT=0,
+        DEFAULT_API_RETRY_MAX_TIMEOUT=0,
+        HTTP_CIRCUIT_BREAKER_FAILURE_THRESHOLD=100,
+    )
+    retry_budget.configure(ratio=1, min_retries_per_second=0.2, window=10)
+
+    try:
+        with pytest.raises(aiohttp.ClientResponseError):
+            await HttpRequestMixin(settings=settings).post(url=url, json={})
+
+        # one request and retries of ratio 1 plus two minimal retries
+        assert requests == 4
+
+    finally:
+        retry_budget.configure(ratio=0.2, min_retries_per_second=1, window=10)
+        await runner.cleanup()
@@ -0,0 +1,54 @@
+import logging
+
+import asyncpg
+import pytest
+from backend.api.v1.webhook.repositories import SendRateLimitRepository
+from backend.core.whatsapp.send_rate_limiter import TokenBucket
+from shared_lib_template.db.postgres import PostgresConnector
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+logger = logging.getLogger(__name__)
+
+
+def test_token_bucket_queues_sends_over_burst():
+    """Tests sends over burst wait in order, one token interval each"""
+    bucket = TokenBucket(rate=10, burst=2)
+
+    delays = [bucket.reserve() for _ in range(5)]
+
+    assert delays[:2] == [0, 0]
+    assert delays[2:] == pytest.approx([0.1, 0.2, 0.3], abs=0.01)
+    assert not bucket.is_full()
+
+
+@pytest.mark.asyncio
+async def test_shared_send_rate_limit_queues_sends_over_burst(
+    postgres_pool: asyncpg.Pool,
+):
+    """Tests shared bucket in Postgres gives the same delays as local one"""
+    if not await postgres_pool.fetchval(
+        "select to_regclass('webhook.send_rate_limit') is not null"
+    ):
+        pytest.skip("Postgres schema is not migrated")
+
+    key = "phone_number_id:test"
+    await postgres_pool.execute(
+        "delete from webhook.send_rate_limit where key = $1", key
+    )
+    repository = SendRateLimitRepository(
+        conn=PostgresConnector(logger=logger, pool=postgres_pool)
+    )
+
+    delays = [
+        await repository.reserve_send_token(key=key, rate=10, burst=2) for _ in range(4)
+    ]
+
+    assert delays[:2] == [0, 0]
+    assert delays[2:] == pytest.approx([0.1, 0.2], abs=0.05)
+
+    await repository.delete_idle_send_rate_limits(idle_seconds=0)
+    assert not await postgres_pool.fetchval(
+        "select count(*) from webhook.send_rate_limit where key = $1", key
+    )
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import time
+import uuid
+
+import asyncpg
+import pytest
+from backend.api.v1.webhook.repositories import (
+    MessageProcessingRepository,
+    MessageRepository,
+    MessageStatusRepository,
+)
+from backend.core.constants import CommunicationChannel, MessageStatus
+from shared_lib_template.db.postgres import PostgresConnector
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+logger = logging.getLogger(__name__)
+
+
+async def _ingest(
+    conn: PostgresConnector, phone_number: str, wa_message_ids: list[str]
+):
+    return await MessageRepository(conn=conn).ingest_messages(
+        user_name="user",
+        phone_number=phone_number,
+        phone_number_id="phone_number_id",
+        channel=CommunicationChannel.WHATSAPP,
+        wa_message_ids=wa_message_ids,
+        user_messages=["hello"] * len(wa_message_ids),
+        received_timestamps=[int(time.time())] * len(wa_message_ids),
+        status=MessageStatus.PROCESSING,
+        status_timestamp=int(time.time()),
+    )
+
+
+async def _delete_user(conn: PostgresConnector, phone_number: str) -> None:
+    await conn.execute_query(
+        """
+        with deleted_user as (
+            delete from webhook.user where phone_number = $1 returning user_id
+        ), deleted_session as (
+            delete from webhook.session
+             where user_id in (select user_id from deleted_user)
+         returning session_id
+        ), deleted_message as (
+            delete from webhook.message
+             where session_id in (select session_id from deleted_session)
+         returning message_id
+        ), deleted_processing as (
+            delete from webhook.message_processing
+             where message_id in (select message_id from deleted_message)
+        )
+        delete from webhook.message_status
+         where message_id in (select message_id from deleted_message)
+        """,
+        phone_number,
+    )
+
+
+@pytest.mark.asyncio
+async def test_redelivered_message_of_archived_session_is_ingested_once(
+    postgres_pool: asyncpg.Pool,
+):
+    """Tests redelivered replied message of archived session is duplicate, and failed
+    one is retried in active session instead of failing batch on unique id"""
+    conn = PostgresConnector(logger=logger, pool=postgres_pool)
+    phone_number = f"test-{uuid.uuid4().hex[:12]}"
+    wa_message_ids = [f"wamid.{phone_number}.replied", f"wamid.{phone_number}.failed"]
+
+    try:
+        replied, failed = await _ingest(conn, phone_number, wa_message_ids)
+
+        message_status_repository = MessageStatusRepository(conn=conn)
+        await message_status_repository.update_message_status(
+            status_id=replied.status_id, status=MessageStatus.DELIVERED
+        )
+        await message_status_repository.update_message_status(
+            status_id=failed.status_id, status=MessageStatus.FAILED_TO_SEND
+        )
+        await MessageProcessingRepository(conn=conn).delete_message_processing_entries(
+            message_ids=[replied.message_id, failed.message_id]
+        )
+        await conn.execute_query(
+            "update webhook.session set is_archived = true where session_id = $1",
+            replied.session_id,
+        )
+
+        replied_retry, failed_retry = await _ingest(conn, phone_number, wa_message_ids)
+
+        assert replied_retry.is_duplicate
+        assert replied_retry.message_id == replied.message_id
+        assert not failed_retry.is_duplicate
+        assert failed_retry.message_id == failed.message_id
+        assert failed_retry.session_id != failed.session_id
+        assert failed_retry.is_new_session
+
+        message_info = await MessageRepository(conn=conn).get_message(
+            wa_message_id=wa_message_ids[1]
+        )
+        assert message_info is not None
+        assert message_info.session_id == failed_retry.session_id
+
+    finally:
+        await _delete_user(conn, phone_number)
+
+
+@pytest.mark.asyncio
+async def test_concurrently_ingested_message_is_duplicate(
+    postgres_pool: asyncpg.Pool,
+):
+    """Tests message ingested by two workers at once is created by one of them and
+    returned as duplicate to other one"""
+    first_conn = PostgresConnector(logger=logger, pool=postgres_pool)
+    second_conn = PostgresConnector(logger=logger, pool=postgres_pool)
+    phone_number = f"test-{uuid.uuid4().hex[:12]}"
+    wa_message_id = f"wamid.{phone_number}.concurrent"
+
+    async def is_ingest_waiting() -> bool:
+        return await postgres_pool.fetchval(
+            """
+            select exists (
+                select 1
+                  from pg_stat_activity
+                 where datname = current_database()
+                   and wait_event_type = 'Lock'
+            )
+            """
+        )
+
+    try:
+        # user and session already exist, as for any message but the first one
+        await _ingest(first_conn, phone_number, [f"wamid.{phone_number}.first"])
+
+        async with first_conn.unit_of_work():
+            [created] = await _ingest(first_conn, phone_number, [wa_message_id])
+            second_ingest = asyncio.create_task(
+                _ingest(second_conn, phone_number, [wa_message_id])
+            )
+
+            for _ in range(100):
+                if await is_ingest_waiting():
+                    break
+                await asyncio.sleep(0.05)
+            else:
+                pytest.fail("Second ingest does not wait for first one")
+
+        [duplicate] = await second_ingest
+
+        assert not created.is_duplicate
+        assert duplicate.is_duplicate
+        assert duplicate.message_id == created.message_id
+        assert duplicate.status_id == created.status_id
+
+    finally:
+        await _delete_user(first_conn, phone_number)
+
+
+@pytest.mark.asyncio
+async def test_batch_is_ingested_in_one_session(postgres_pool: asyncpg.Pool):
+    """Tests messages of batch are ingested in given order into one session, and
+    message repeated in batch is returned as duplicate of its first occurrence"""
+    conn = PostgresConnector(logger=logger, pool=postgres_pool)
+    phone_number = f"test-{uuid.uuid4().hex[:12]}"
+    first, second = f"wamid.{phone_number}.first", f"wamid.{phone_number}.second"
+
+    try:
+        ingest_infos = await _ingest(conn, phone_number, [first, second, first])
+
+        assert [info.is_duplicate for info in ingest_infos] == [False, False, True]
+        assert ingest_infos[2].message_id == ingest_infos[0].message_id
+        assert ingest_infos[0].message_id < ingest_infos[1].message_id
+        assert ingest_infos[0].session_id == ingest_infos[1].session_id
+        assert all(info.is_new_session for info in ingest_infos[:2])
+
+    finally:
+        await _delete_user(conn, phone_number)
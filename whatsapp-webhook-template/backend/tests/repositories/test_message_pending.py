@@ -0,0 +1,100 @@
+import json
+import logging
+
+import asyncpg
+import pytest
+from backend.api.v1.webhook.repositories import MessagePendingRepository
+from shared_lib_template.db.postgres import PostgresConnector
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+logger = logging.getLogger(__name__)
+
+
+class _Rollback(Exception):
+    """Rolls test transaction back"""
+
+
+@pytest.mark.asyncio
+async def test_message_pending_queue_claim_release_park_and_delete(
+    postgres_pool: asyncpg.Pool,
+):
+    """Tests claimed updates are hidden until released, extended claim stays hidden,
+    parked update gets its attempt back and deleted update is gone"""
+    conn = PostgresConnector(logger=logger, pool=postgres_pool)
+    repository = MessagePendingRepository(conn=conn)
+
+    async def get_available_at() -> float:
+        # now() is fixed within transaction, so offsets are exact
+        result = await conn.get_query_result_as_dict(
+            """
+            select extract(epoch from available_at - now())::float as offset
+              from webhook.message_pending
+             where message_pending_id = $1
+            """,
+            message_pending_id,
+        )
+        return result["offset"]
+
+    try:
+        async with conn.unit_of_work():
+            await conn.execute_query("delete from webhook.message_pending")
+            message_pending_id = await repository.create_message_pending(
+                entry=json.dumps({"object": "whatsapp_business_account"})
+            )
+
+            [claimed] = await repository.claim_messages_pending(
+                limit=10, visibility_timeout=300
+            )
+            assert claimed.message_pending_id == message_pending_id
+            assert claimed.attempts == 1
+            assert claimed.entry == {"object": "whatsapp_business_account"}
+            assert await get_available_at() == 300
+            assert not await repository.claim_messages_pending(
+                limit=10, visibility_timeout=300
+            )
+
+            await repository.extend_messages_pending(
+                message_pending_ids=[message_pending_id], visibility_timeout=600
+            )
+            assert await get_available_at() == 600
+
+            await repository.release_message_pending(
+                message_pending_id=message_pending_id, delay=0
+            )
+            [claimed] = await repository.claim_messages_pending(
+                limit=10, visibility_timeout=300
+            )
+            assert claimed.attempts == 2
+
+            await repository.park_message_pending(
+                message_pending_id=message_pending_id, delay=30
+            )
+            assert await get_available_at() == 30
+            assert not await repository.claim_messages_pending(
+                limit=10, visibility_timeout=300
+            )
+
+            await repository.park_message_pending(
+                message_pending_id=message_pending_id, delay=0
+            )
+            [claimed] = await repository.claim_messages_pending(
+                limit=10, visibility_timeout=300
+            )
+            assert claimed.attempts == 1
+
+            await repository.delete_message_pending(
+                message_pending_id=message_pending_id
+            )
+            await repository.release_message_pending(
+                message_pending_id=message_pending_id, delay=0
+            )
+            assert not await repository.claim_messages_pending(
+                limit=10, visibility_timeout=300
+            )
+
+            raise _Rollback()
+
+    except _Rollback:
+        pass
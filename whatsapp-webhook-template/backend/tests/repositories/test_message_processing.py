@@ -0,0 +1,106 @@
+import logging
+import time
+import uuid
+
+import asyncpg
+import pytest
+from backend.api.v1.webhook.repositories import (
+    MessageProcessingRepository,
+    MessageRepository,
+)
+from backend.core.constants import CommunicationChannel, MessageStatus
+from backend.tasks.message_processing.message_processing_sweeper import (
+    MessageProcessingSweeper,
+)
+from fastapi import FastAPI
+from shared_lib_template.db.postgres import PostgresConnector
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.asyncio
+async def test_message_processing_entries_are_deleted_by_ids_and_ttl(
+    postgres_pool: asyncpg.Pool,
+):
+    """Tests processing entries are deleted in bulk by message ids, and sweeper
+    deletes only entries older than TTL"""
+    app = FastAPI()
+    app.connection_pool = postgres_pool  # type: ignore
+    conn = PostgresConnector(logger=logger, pool=postgres_pool)
+    phone_number = f"test-{uuid.uuid4().hex[:12]}"
+
+    try:
+        ingest_infos = await MessageRepository(conn=conn).ingest_messages(
+            user_name="user",
+            phone_number=phone_number,
+            phone_number_id="phone_number_id",
+            channel=CommunicationChannel.WHATSAPP,
+            wa_message_ids=[f"wamid.{phone_number}.{index}" for index in range(4)],
+            user_messages=["hello"] * 4,
+            received_timestamps=[int(time.time())] * 4,
+            status=MessageStatus.PROCESSING,
+            status_timestamp=int(time.time()),
+        )
+        message_ids = [item.message_id for item in ingest_infos]
+
+        async def get_processing_message_ids() -> list[int]:
+            rows = await conn.get_query_result_as_list(
+                """
+                select message_id
+                  from webhook.message_processing
+                 where message_id = any($1::int[])
+                 order by message_id
+                """,
+                message_ids,
+            )
+            return [row["message_id"] for row in rows]
+
+        assert await get_processing_message_ids() == message_ids
+
+        await MessageProcessingRepository(conn=conn).delete_message_processing_entries(
+            message_ids=[message_ids[0], message_ids[1], message_ids[1]]
+        )
+        assert await get_processing_message_ids() == message_ids[2:]
+
+        # entry of crashed worker is older than TTL, other one is still processing
+        await conn.execute_query(
+            """
+            update webhook.message_processing
+               set created_at = now() - interval '1 hour'
+             where message_id = $1
+            """,
+            message_ids[2],
+        )
+        sweeper = MessageProcessingSweeper(app=app, interval=60, ttl=600)
+
+        swept_message_ids = await sweeper.sweep()
+        assert message_ids[2] in swept_message_ids
+        assert message_ids[3] not in swept_message_ids
+        assert await get_processing_message_ids() == message_ids[3:]
+        assert sweeper.metrics() == {"runs": 1, "swept": len(swept_message_ids)}
+
+    finally:
+        await conn.execute_query(
+            """
+            with deleted_user as (
+                delete from webhook.user where phone_number = $1 returning user_id
+            ), deleted_session as (
+                delete from webhook.session
+                 where user_id in (select user_id from deleted_user)
+             returning session_id
+            ), deleted_message as (
+                delete from webhook.message
+                 where session_id in (select session_id from deleted_session)
+             returning message_id
+            ), deleted_processing as (
+                delete from webhook.message_processing
+                 where message_id in (select message_id from deleted_message)
+            )
+            delete from webhook.message_status
+             where message_id in (select message_id from deleted_message)
+            """,
+            phone_number,
+        )
@@ -0,0 +1,105 @@
+import logging
+import time
+import uuid
+
+import asyncpg
+import pytest
+from backend.api.v1.webhook.repositories import (
+    MessageProcessingRepository,
+    MessageRepository,
+    MessageStatusRepository,
+)
+from backend.core.constants import (
+    CommunicationChannel,
+    MessageProcessingStep,
+    MessageStatus,
+)
+from shared_lib_template.db.postgres import PostgresConnector
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.asyncio
+async def test_retried_message_resumes_from_checkpoint(postgres_pool: asyncpg.Pool):
+    """Tests retried message is ingested with its last completed step and bot reply,
+    and reply known from status webhook is checkpointed once"""
+    conn = PostgresConnector(logger=logger, pool=postgres_pool)
+    message_repository = MessageRepository(conn=conn)
+    phone_number = f"test-{uuid.uuid4().hex[:12]}"
+    wa_message_id = f"wamid.{phone_number}"
+
+    async def ingest():
+        return await message_repository.ingest_messages(
+            user_name="user",
+            phone_number=phone_number,
+            phone_number_id="phone_number_id",
+            channel=CommunicationChannel.WHATSAPP,
+            wa_message_ids=[wa_message_id],
+            user_messages=["hello"],
+            received_timestamps=[int(time.time())],
+            status=MessageStatus.PROCESSING,
+            status_timestamp=int(time.time()),
+        )
+
+    try:
+        [ingest_info] = await ingest()
+        assert ingest_info.processing_step == MessageProcessingStep.RECEIVED
+        assert ingest_info.bot_message is None
+
+        # first attempt marked message as read and failed to send reply
+        message_status_repository = MessageStatusRepository(conn=conn)
+        await message_status_repository.update_message_status_and_processing_step(
+            status_id=ingest_info.status_id,
+            status=MessageStatus.READ,
+            processing_step=MessageProcessingStep.READ_MARKED,
+        )
+        await message_repository.update_message(
+            message_id=ingest_info.message_id, bot_message="reply"
+        )
+        await message_status_repository.update_message_status(
+            status_id=ingest_info.status_id, status=MessageStatus.FAILED_TO_SEND
+        )
+        await MessageProcessingRepository(conn=conn).delete_message_processing_entries(
+            message_ids=[ingest_info.message_id]
+        )
+
+        [retry_info] = await ingest()
+        assert not retry_info.is_duplicate
+        assert retry_info.message_id == ingest_info.message_id
+        assert retry_info.processing_step == MessageProcessingStep.READ_MARKED
+        assert retry_info.bot_message == "reply"
+
+        record = message_repository.record_reply_message_ids
+        arguments = {
+            "message_ids": [retry_info.message_id, None],
+            "wa_reply_message_ids": [f"{wa_message_id}.reply", "wamid.other"],
+            "timestamps": [int(time.time())] * 2,
+        }
+        assert await record(**arguments) == [retry_info.message_id]
+        assert await record(**arguments) == []
+
+    finally:
+        await conn.execute_query(
+            """
+            with deleted_user as (
+                delete from webhook.user where phone_number = $1 returning user_id
+            ), deleted_session as (
+                delete from webhook.session
+                 where user_id in (select user_id from deleted_user)
+             returning session_id
+            ), deleted_message as (
+                delete from webhook.message
+                 where session_id in (select session_id from deleted_session)
+             returning message_id
+            ), deleted_processing as (
+                delete from webhook.message_processing
+                 where message_id in (select message_id from deleted_message)
+            )
+            delete from webhook.message_status
+             where message_id in (select message_id from deleted_message)
+            """,
+            phone_number,
+        )
@@ -0,0 +1,184 @@
+import logging
+import time
+import uuid
+
+import asyncpg
+import pytest
+from backend.api.v1.webhook.repositories import (
+    MessageProcessingRepository,
+    MessageRepository,
+    MessageStatusRepository,
+)
+from backend.core.constants import (
+    CommunicationChannel,
+    MessageProcessingStep,
+    MessageStatus,
+)
+from shared_lib_template.db.postgres import PostgresConnector
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.asyncio
+async def test_message_status_only_moves_forward(postgres_pool: asyncpg.Pool):
+    """Tests statuses of bot replies are applied in bulk by one rank regardless of
+    webhook order and duplicates, reply sending result coming out of order does not
+    roll back them, and retried message is marked as delivered"""
+    conn = PostgresConnector(logger=logger, pool=postgres_pool)
+    message_repository = MessageRepository(conn=conn)
+    message_status_repository = MessageStatusRepository(conn=conn)
+    phone_number = f"test-{uuid.uuid4().hex[:12]}"
+    wa_message_ids = [f"wamid.{phone_number}.{index}" for index in range(3)]
+    wa_reply_message_ids = [
+        f"{wa_message_id}.reply" for wa_message_id in wa_message_ids
+    ]
+
+    async def get_statuses() -> list[str]:
+        rows = await conn.get_query_result_as_list(
+            """
+            select ms.status
+              from webhook.message m
+              join webhook.message_status ms
+                on ms.message_id = m.message_id
+             where m.wa_message_id = any($1::varchar[])
+             order by m.wa_message_id
+            """,
+            wa_message_ids,
+        )
+        return [row["status"] for row in rows]
+
+    async def get_processing_steps() -> list[str]:
+        rows = await conn.get_query_result_as_list(
+            """
+            select processing_step
+              from webhook.message
+             where wa_message_id = any($1::varchar[])
+             order by wa_message_id
+            """,
+            wa_message_ids,
+        )
+        return [row["processing_step"] for row in rows]
+
+    try:
+        ingest_infos = await message_repository.ingest_messages(
+            user_name="user",
+            phone_number=phone_number,
+            phone_number_id="phone_number_id",
+            channel=CommunicationChannel.WHATSAPP,
+            wa_message_ids=wa_message_ids,
+            user_messages=["hello"] * 3,
+            received_timestamps=[int(time.time())] * 3,
+            status=MessageStatus.PROCESSING,
+            status_timestamp=int(time.time()),
+        )
+        for ingest_info, wa_reply_message_id in zip(ingest_infos, wa_reply_message_ids):
+            await message_repository.update_message(
+                message_id=ingest_info.message_id,
+                replied_timestamp=int(time.time()),
+                wa_reply_message_id=wa_reply_message_id,
+            )
+
+        # statuses of one reply come out of order and repeated within one webhook
+        first, second, third = wa_reply_message_ids
+        updated_message_ids = await message_status_repository.update_reply_statuses(
+            wa_reply_message_ids=[first, first, first, second, second, third],
+            statuses=[
+                MessageStatus.OPENED,
+                MessageStatus.DELIVERED,
+                MessageStatus.OPENED,
+                MessageStatus.DELIVERED,
+                MessageStatus.DELIVERED,
+                MessageStatus.FAILED_TO_SEND,
+            ],
+            timestamps=[int(time.time())] * 6,
+        )
+        assert sorted(updated_message_ids) == [item.message_id for item in ingest_infos]
+        assert await get_statuses() == [
+            MessageStatus.OPENED,
+            MessageStatus.DELIVERED,
+            MessageStatus.FAILED_TO_SEND,
+        ]
+
+        # late webhook does not roll statuses back
+        assert not await message_status_repository.update_reply_statuses(
+            wa_reply_message_ids=[first, second, third, "wamid.unknown"],
+            statuses=[MessageStatus.DELIVERED] * 4,
+            timestamps=[int(time.time())] * 4,
+        )
+
+        # reply sending result coming after reply status webhook does not roll back it
+        for ingest_info in ingest_infos:
+            await message_status_repository.update_sent_message_status(
+                status_id=ingest_info.status_id,
+                status=MessageStatus.DELIVERED,
+                processing_step=MessageProcessingStep.STATUS_UPDATED,
+            )
+        assert await get_statuses() == [
+            MessageStatus.OPENED,
+            MessageStatus.DELIVERED,
+            MessageStatus.FAILED_TO_SEND,
+        ]
+        # processing step is checkpointed in the same statement either way
+        assert (
+            await get_processing_steps() == [MessageProcessingStep.STATUS_UPDATED] * 3
+        )
+
+        # retried message is processing again, so its delivered reply is applied
+        failed = ingest_infos[2]
+        await message_repository.update_processing_step(
+            message_id=failed.message_id, processing_step=MessageProcessingStep.REPLIED
+        )
+        await MessageProcessingRepository(conn=conn).delete_message_processing_entries(
+            message_ids=[failed.message_id]
+        )
+        [retried] = await message_repository.ingest_messages(
+            user_name="user",
+            phone_number=phone_number,
+            phone_number_id="phone_number_id",
+            channel=CommunicationChannel.WHATSAPP,
+            wa_message_ids=[wa_message_ids[2]],
+            user_messages=["hello"],
+            received_timestamps=[int(time.time())],
+            status=MessageStatus.PROCESSING,
+            status_timestamp=int(time.time()),
+        )
+        assert not retried.is_duplicate
+        assert retried.status_id is not None
+        assert retried.status_id == failed.status_id
+
+        await message_status_repository.update_sent_message_status(
+            status_id=retried.status_id,
+            status=MessageStatus.DELIVERED,
+            processing_step=MessageProcessingStep.STATUS_UPDATED,
+        )
+        assert await get_statuses() == [
+            MessageStatus.OPENED,
+            MessageStatus.DELIVERED,
+            MessageStatus.DELIVERED,
+        ]
+
+    finally:
+        await conn.execute_query(
+            """
+            with deleted_user as (
+                delete from webhook.user where phone_number = $1 returning user_id
+            ), deleted_session as (
+                delete from webhook.session
+                 where user_id in (select user_id from deleted_user)
+             returning session_id
+            ), deleted_message as (
+                delete from webhook.message
+                 where session_id in (select session_id from deleted_session)
+             returning message_id
+            ), deleted_processing as (
+                delete from webhook.message_processing
+                 where message_id in (select message_id from deleted_message)
+            )
+            delete from webhook.message_status
+             where message_id in (select message_id from deleted_message)
+            """,
+            phone_number,
+        )
@@ -0,0 +1,48 @@
+import inspect
+from typing import Any
+
+import asyncpg
+import pytest
+from backend.api.v1.webhook.repositories.message_status import (
+    UPDATE_MESSAGE_STATUS_QUERY,
+)
+from shared_lib_template.db import prepare_registered_statements
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+def test_asyncpg_get_statement_signature():
+    """Tests private asyncpg method used to prepare statements into statement cache
+    still has expected signature"""
+    parameters = inspect.signature(asyncpg.Connection._get_statement).parameters
+
+    assert list(parameters)[:3] == ["self", "query", "timeout"]
+    assert parameters["use_cache"].kind == inspect.Parameter.KEYWORD_ONLY
+
+
+@pytest.mark.asyncio
+async def test_registered_statements_are_prepared_into_statement_cache(
+    postgres_connect_kwargs: dict[str, Any],
+):
+    """Tests registered statements are prepared on new connection and executing
+    one of them does not prepare it again"""
+    try:
+        connection = await asyncpg.connect(**postgres_connect_kwargs)
+    except (OSError, asyncpg.PostgresError) as e:
+        pytest.skip(f"Postgres is not available: {e}")
+
+    async def get_prepared_count() -> int:
+        return await connection.fetchval("select count(*) from pg_prepared_statements")
+
+    try:
+        await prepare_registered_statements(connection)
+        prepared_count = await get_prepared_count()
+        assert prepared_count > 0
+
+        await connection.execute(UPDATE_MESSAGE_STATUS_QUERY, "processing", 0)
+
+        assert await get_prepared_count() == prepared_count
+
+    finally:
+        await connection.close()
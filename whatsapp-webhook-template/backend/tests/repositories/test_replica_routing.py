@@ -0,0 +1,61 @@
+import logging
+from typing import Any
+
+import asyncpg
+import pytest
+from backend.api.v1.webhook.repositories import UserRepository
+from shared_lib_template.db.postgres import PostgresConnector
+from shared_lib_template.db.replicas import Replica, ReplicaRouter
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.asyncio
+async def test_replica_queries_are_routed_to_healthy_replica(
+    postgres_pool: asyncpg.Pool,
+    postgres_connect_kwargs: dict[str, Any],
+):
+    """Tests replica queries are read from healthy replica outside of unit of work
+    and fall back to primary when no replica is healthy"""
+    # primary itself plays replica role, it reports zero lag
+    replica = Replica(
+        name="replica",
+        pool=await asyncpg.create_pool(min_size=0, **postgres_connect_kwargs),
+    )
+    unavailable_replica = Replica(
+        name="unavailable",
+        pool=await asyncpg.create_pool(
+            min_size=0, **{**postgres_connect_kwargs, "host": "127.0.0.1", "port": 1}
+        ),
+    )
+    router = ReplicaRouter(
+        replicas=[replica, unavailable_replica], max_lag=5, check_interval=1
+    )
+
+    try:
+        await router.start()
+        assert replica.is_healthy and replica.lag == 0
+        assert not unavailable_replica.is_healthy
+
+        conn = PostgresConnector(
+            logger=logger, pool=postgres_pool, replica_router=router
+        )
+        repository = UserRepository(conn=conn)
+
+        assert await repository.get_user_ids_by_phone_number("no such phone") == []
+        assert replica.reads == 1
+
+        async with conn.unit_of_work():
+            await repository.get_user_full_info(user_id=-1)
+        assert replica.reads == 1
+
+        router.mark_failed(replica, ConnectionError("replica is down"))
+        assert await repository.get_user_full_info(user_id=-1) is None
+        assert replica.reads == 1
+        assert router.metrics()["fallbacks"] == 2
+
+    finally:
+        await router.close()
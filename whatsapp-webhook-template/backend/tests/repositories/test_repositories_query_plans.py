@@ -0,0 +1,207 @@
+import inspect
+import json
+import types
+import typing
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Any, AsyncIterator
+
+import asyncpg
+import pytest
+from backend.api.v1.webhook import repositories
+from shared_lib_template.db import PostgresConnectorInterface
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+SEED_QUERIES = (
+    """
+    insert into webhook.user(user_name, phone_number, phone_number_id)
+    select 'user ' || i, 'phone' || i, 'phone_id' || (i % 10)
+      from generate_series(1, 20000) i
+    """,
+    "analyze webhook.user",
+    """
+    insert into webhook.session(user_id, start_time, end_time, is_archived, communication_channel)
+    select u.user_id, now() - interval '1h', now() + interval '23h', u.user_id % 5 <> 0, 'whatsapp'
+      from webhook.user u
+    """,
+    "analyze webhook.session",
+    """
+    insert into webhook.message(session_id, received_timestamp, user_message, bot_message, wa_message_id)
+    select s.session_id, now(), 'message', 'reply', 'wamid.seed.' || s.session_id || '.' || i
+      from webhook.session s
+     cross join generate_series(1, 5) i
+    """,
+    "analyze webhook.message",
+    """
+    insert into webhook.message_status(message_id, status, timestamp)
+    select m.message_id, (array['replied', 'delivered', 'opened', 'failed'])[m.message_id % 4 + 1], now()
+      from webhook.message m
+    """,
+    """
+    insert into webhook.message_processing(message_id, session_id)
+    select m.message_id, m.session_id
+      from webhook.message m
+     where m.message_id % 10 = 0
+    """,
+    """
+    insert into webhook.gpt_response(message_id, prompt)
+    select m.message_id, 'prompt'
+      from webhook.message m
+     where m.message_id % 10 = 0
+    """,
+    """
+    insert into webhook.message_pending(entry, attempts, available_at)
+    select '{}'::jsonb, 1, now() + interval '5 minutes'
+      from generate_series(1, 20000) i
+    """,
+    """
+    insert into webhook.send_rate_limit(key, tokens, updated_at)
+    select 'recipient:phone_id:phone' || i, 1, now() + interval '1h'
+      from generate_series(1, 20000) i
+    """,
+    "analyze webhook.message_status",
+    "analyze webhook.message_processing",
+    "analyze webhook.gpt_response",
+    "analyze webhook.message_pending",
+    "analyze webhook.send_rate_limit",
+)
+
+
+class RecordingPostgresConnector(PostgresConnectorInterface):
+    """Collects repository queries instead of executing them"""
+
+    def __init__(self) -> None:
+        self.queries: list[tuple[str, tuple]] = []
+
+    async def connect(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def execute_query(self, query: str, *query_params) -> None:
+        self.queries.append((query, query_params))
+
+    async def get_query_result_as_list(
+        self, query: str, *query_params
+    ) -> list[dict[str, Any]]:
+        self.queries.append((query, query_params))
+        return []
+
+    async def get_query_result_as_dict(
+        self, query: str, *query_params
+    ) -> dict[str, Any]:
+        self.queries.append((query, query_params))
+        return {}
+
+    @asynccontextmanager
+    async def unit_of_work(
+        self, transaction=True, isolation=None
+    ) -> AsyncIterator[None]:
+        yield
+
+
+def _dummy_value(annotation: Any) -> Any:
+    """Build argument value from type annotation"""
+    if (
+        isinstance(annotation, types.UnionType)
+        or typing.get_origin(annotation) is typing.Union
+    ):
+        annotation = next(
+            arg for arg in typing.get_args(annotation) if arg is not type(None)
+        )
+
+    if typing.get_origin(annotation) is list:
+        return [_dummy_value(typing.get_args(annotation)[0])]
+
+    if inspect.isclass(annotation) and issubclass(annotation, Enum):
+        return next(iter(annotation))
+
+    if annotation is bool:
+        return True
+
+    if annotation in (int, float):
+        return 1
+
+    return "1"
+
+
+async def _record_repositories_queries() -> list[tuple[str, str, tuple]]:
+    """Call every repository method and collect executed queries"""
+    recorded: list[tuple[str, str, tuple]] = []
+
+    for repository_name in repositories.__all__:
+        repository_class = getattr(repositories, repository_name)
+
+        for method_name, method in inspect.getmembers(
+            repository_class, inspect.iscoroutinefunction
+        ):
+            conn = RecordingPostgresConnector()
+            type_hints = typing.get_type_hints(method)
+            kwargs = {
+                name: _dummy_value(type_hints[name])
+                for name in inspect.signature(method).parameters
+                if name != "self"
+            }
+
+            try:
+                await getattr(repository_class(conn=conn), method_name)(**kwargs)
+            except Exception:  # pylint: disable=broad-except
+                pass  # empty results may break method flow, queries are recorded anyway
+
+            recorded.extend(
+                (f"{repository_name}.{method_name}", query, query_params)
+                for query, query_params in conn.queries
+            )
+
+    return recorded
+
+
+def _find_seq_scans(plan: dict[str, Any]) -> list[str]:
+    """Get relations scanned sequentially in plan tree"""
+    seq_scans = []
+
+    if plan["Node Type"] == "Seq Scan":
+        seq_scans.append(plan["Relation Name"])
+
+    for child_plan in plan.get("Plans", []):
+        seq_scans.extend(_find_seq_scans(child_plan))
+
+    return seq_scans
+
+
+@pytest.mark.asyncio
+async def test_repositories_queries_use_indexes(postgres_pool: asyncpg.Pool):
+    """Tests repository queries do not fall back to sequential scans on large tables"""
+    async with postgres_pool.acquire() as conn:
+        if not await conn.fetchval("select to_regclass('webhook.message') is not null"):
+            pytest.skip("Postgres schema is not migrated")
+
+        recorded_queries = await _record_repositories_queries()
+        assert recorded_queries
+
+        transaction = conn.transaction()
+        await transaction.start()
+
+        try:
+            for seed_query in SEED_QUERIES:
+                await conn.execute(seed_query)
+
+            seq_scans = {}
+
+            for method_name, query, query_params in recorded_queries:
+                plan = await conn.fetchval(
+                    f"explain (format json) {query}", *query_params
+                )
+                relations = _find_seq_scans(json.loads(plan)[0]["Plan"])
+
+                if relations:
+                    seq_scans[method_name] = relations
+
+        finally:
+            await transaction.rollback()
+
+    assert not seq_scans, f"Sequential scans found: {seq_scans}"
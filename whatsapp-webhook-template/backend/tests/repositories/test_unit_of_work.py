@@ -0,0 +1,57 @@
+import logging
+
+import asyncpg
+import pytest
+from shared_lib_template.db.postgres import PostgresConnector
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_rolls_back_and_releases_connection(
+    postgres_pool: asyncpg.Pool,
+):
+    """Tests unit of work commits on success, rolls back on error together with
+    nested units of work and returns its connection to pool"""
+    conn = PostgresConnector(logger=logger, pool=postgres_pool)
+
+    async def get_values() -> list[int]:
+        rows = await conn.get_query_result_as_list(
+            "select value from public.unit_of_work_test order by value"
+        )
+        return [row["value"] for row in rows]
+
+    try:
+        await conn.execute_query(
+            "create table if not exists public.unit_of_work_test(value int)"
+        )
+        await conn.execute_query("truncate public.unit_of_work_test")
+
+        async with conn.unit_of_work():
+            await conn.execute_query("insert into public.unit_of_work_test values (1)")
+            assert conn.is_connection_active
+        assert await get_values() == [1]
+        assert not conn.is_connection_active
+
+        with pytest.raises(ValueError):
+            async with conn.unit_of_work():
+                await conn.execute_query(
+                    "insert into public.unit_of_work_test values (2)"
+                )
+                async with conn.unit_of_work():
+                    await conn.execute_query(
+                        "insert into public.unit_of_work_test values (3)"
+                    )
+                # nested unit of work keeps connection of outer one
+                assert conn.is_connection_active
+                raise ValueError("rollback")
+        assert await get_values() == [1]
+
+        assert not conn.is_connection_active
+        assert postgres_pool.get_idle_size() == postgres_pool.get_size()
+
+    finally:
+        await conn.execute_query("drop table if exists public.unit_of_work_test")
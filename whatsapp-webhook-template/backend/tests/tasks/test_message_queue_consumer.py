@@ -0,0 +1,99 @@
+import asyncio
+import json
+from collections import Counter
+
+import asyncpg
+import pytest
+from backend.api.v1.webhook.models import WhatsappWebhookUpdates
+from backend.tasks.message_processing.message_queue_consumer import (
+    MessageQueueConsumer,
+)
+from backend.tasks.message_processing.processing_scheduler import ProcessingScheduler
+from fastapi import FastAPI
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+def _updates(entry_id: str) -> str:
+    return json.dumps(
+        {
+            "object": "whatsapp_business_account",
+            "entry": [
+                {
+                    "id": entry_id,
+                    "changes": [
+                        {
+                            "field": "messages",
+                            "value": {
+                                "messaging_product": "whatsapp",
+                                "metadata": {
+                                    "display_phone_number": "1555",
+                                    "phone_number_id": entry_id,
+                                },
+                            },
+                        }
+                    ],
+                }
+            ],
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_message_queue_consumer_retries_drops_and_keeps_claims(
+    postgres_pool: asyncpg.Pool,
+):
+    """Tests failed updates are retried until attempts run out, invalid ones are
+    dropped and update processed longer than visibility timeout is not claimed twice"""
+    app = FastAPI()
+    app.connection_pool = postgres_pool  # type: ignore
+    calls: Counter[str] = Counter()
+
+    async def _handler(data: WhatsappWebhookUpdates, _: FastAPI) -> None:
+        entry_id = data.entry[0].id_
+        calls[entry_id] += 1
+
+        if entry_id == "slow":
+            await asyncio.sleep(1)
+        if entry_id == "failing":
+            raise ValueError("processing failed")
+
+    scheduler = ProcessingScheduler(concurrency=5, key_concurrency=5, queue_size=10)
+    consumer = MessageQueueConsumer(
+        app=app,
+        handler=_handler,
+        scheduler=scheduler,
+        poll_interval=0.05,
+        visibility_timeout=0.3,
+        retries=2,
+        retry_interval=0.05,
+        retry_exponential=1,
+        retry_max_interval=0.1,
+    )
+
+    try:
+        await postgres_pool.execute("delete from webhook.message_pending")
+        await postgres_pool.executemany(
+            "insert into webhook.message_pending(entry) values ($1::jsonb)",
+            [
+                (_updates("ok"),),
+                (_updates("slow"),),
+                (_updates("failing"),),
+                (json.dumps({"not": "updates"}),),
+            ],
+        )
+
+        scheduler.start()
+        consumer.start()
+        await asyncio.sleep(1.5)
+
+        assert calls == {"ok": 1, "slow": 1, "failing": 2}
+        assert not await postgres_pool.fetchval(
+            "select count(*) from webhook.message_pending"
+        )
+
+    finally:
+        await consumer.close()
+        await scheduler.close()
+        await postgres_pool.execute("delete from webhook.message_pending")
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from backend.tasks.message_processing.processing_scheduler import (
+    ProcessingQueueFullError,
+    ProcessingScheduler,
+)
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+@pytest.mark.asyncio
+async def test_processing_scheduler_limits_concurrency():
+    """Tests global and per-key limits are respected and busy key does not block others"""
+    scheduler = ProcessingScheduler(concurrency=3, key_concurrency=2, queue_size=10)
+    scheduler.start()
+
+    running: dict[str, int] = {}
+    max_running: dict[str, int] = {}
+    max_total = 0
+    started: list[str] = []
+
+    async def _job(key: str) -> None:
+        nonlocal max_total
+        running[key] = running.get(key, 0) + 1
+        max_running[key] = max(max_running.get(key, 0), running[key])
+        max_total = max(max_total, sum(running.values()))
+        started.append(key)
+        await asyncio.sleep(0.02)
+        running[key] -= 1
+
+    for key in ["a", "a", "a", "a", "b"]:
+        scheduler.submit(keys={key}, run=lambda key=key: _job(key))
+
+    await asyncio.sleep(0.01)
+    assert started == ["a", "a", "b"]
+
+    while scheduler.metrics()["started"] < 5 or scheduler.metrics()["running"]:
+        await asyncio.sleep(0.01)
+
+    assert max_running == {"a": 2, "b": 1}
+    assert max_total == 3
+    await scheduler.close()
+
+
+@pytest.mark.asyncio
+async def test_processing_scheduler_bounded_queue():
+    """Tests queue rejects jobs when full and frees slots as jobs start"""
+    scheduler = ProcessingScheduler(concurrency=1, key_concurrency=1, queue_size=2)
+    release = asyncio.Event()
+
+    for _ in range(2):
+        scheduler.submit(keys={"a"}, run=release.wait)
+
+    assert scheduler.is_full()
+    with pytest.raises(ProcessingQueueFullError):
+        scheduler.submit(keys={"a"}, run=release.wait)
+
+    scheduler.start()
+    await asyncio.wait_for(scheduler.wait_for_free_slots(), timeout=1)
+    assert scheduler.metrics()["queue_depth"] == 1
+
+    release.set()
+    await scheduler.close()
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+from backend.tasks.message_processing.read_receipt_dispatcher import (
+    ReadReceiptDispatcher,
+)
+from fastapi import FastAPI
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+class RecordingReadReceiptDispatcher(ReadReceiptDispatcher):
+    """Records marked messages instead of calling Whatsapp API, fails first call"""
+
+    def __init__(self) -> None:
+        super().__init__(
+            app=FastAPI(),
+            window=0.05,
+            retries=1,
+            retry_interval=0.01,
+            retry_exponential=1,
+            retry_max_interval=0.05,
+            concurrency=10,
+        )
+        self.calls: list[str] = []
+
+    async def _mark_message_as_read(
+        self, phone_number_id: str, wa_message_id: str
+    ) -> bool:
+        self.calls.append(wa_message_id)
+        return len(self.calls) > 1
+
+
+@pytest.mark.asyncio
+async def test_read_receipt_dispatcher_marks_newest_message_of_user():
+    """Tests receipts within window are coalesced to newest message of user
+    and failed receipt is retried"""
+    dispatcher = RecordingReadReceiptDispatcher()
+
+    for wa_message_id, timestamp in (("wamid.1", 1), ("wamid.3", 3), ("wamid.2", 2)):
+        dispatcher.submit(
+            phone_number_id="PNID",
+            phone_number="100",
+            wa_message_id=wa_message_id,
+            timestamp=timestamp,
+        )
+
+    await asyncio.sleep(0.1)
+    await dispatcher.close()
+
+    assert dispatcher.calls == ["wamid.3", "wamid.3"]
+    assert dispatcher.metrics() == {
+        "submitted": 3,
+        "coalesced": 2,
+        "sent": 1,
+        "failed": 1,
+        "dropped": 0,
+        "waiting": 0,
+    }
@@ -0,0 +1,27 @@
+from backend.tasks.message_processing.recent_message_filter import (
+    RecentMessageFilter,
+)
+
+
+def test_recent_message_filter_is_bounded():
+    """Tests filter rejects recent ids, forgets discarded and oldest generation ids"""
+    message_filter = RecentMessageFilter(size=4, window=60)
+    message_filter.add("a")
+    message_filter.add("b")
+
+    assert message_filter.is_duplicate("a")
+    assert not message_filter.is_duplicate("c")
+
+    message_filter.discard("b")
+    assert not message_filter.is_duplicate("b")
+
+    for wa_message_id in ["c", "d", "e"]:
+        message_filter.add(wa_message_id)
+
+    assert not message_filter.is_duplicate("a")
+    assert message_filter.metrics() == {"size": 3, "rejected": 1}
+
+    assert not message_filter.is_all_duplicates([])
+    assert not message_filter.is_all_duplicates(["d", "a"])
+    assert message_filter.is_all_duplicates(["d", "e"])
+    assert message_filter.metrics() == {"size": 3, "rejected": 3}
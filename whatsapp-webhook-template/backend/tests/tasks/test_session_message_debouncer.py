@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import pytest
+from backend.tasks.message_processing.session_message_debouncer import (
+    SessionMessageDebouncer,
+)
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+@pytest.mark.asyncio
+async def test_session_message_debouncer_flushes_batch_after_idle_gap():
+    """Tests burst of session messages is flushed as one batch after idle gap"""
+    debouncer = SessionMessageDebouncer(idle_seconds=0.05, max_wait_seconds=1)
+
+    async def _send(message_id: int, delay: float) -> list:
+        await asyncio.sleep(delay)
+        return await debouncer.wait(
+            session_id=1,
+            message_id=message_id,
+            user_message=f"message {message_id}",
+            received_timestamp=message_id,
+        )
+
+    started_at = time.monotonic()
+    batches = await asyncio.gather(_send(2, 0.02), _send(1, 0), _send(3, 0.04))
+    elapsed = time.monotonic() - started_at
+
+    assert elapsed < 0.5
+    assert batches[0] == batches[1] == batches[2]
+    assert [item.message_id for item in batches[0]] == [1, 2, 3]
+
+    other_session_batch = await debouncer.wait(
+        session_id=2,
+        message_id=4,
+        user_message="message 4",
+        received_timestamp=4,
+    )
+    assert [item.message_id for item in other_session_batch] == [4]
+
+
+@pytest.mark.asyncio
+async def test_session_message_debouncer_flushes_batch_after_max_wait():
+    """Tests batch is flushed after max wait even if messages keep coming"""
+    debouncer = SessionMessageDebouncer(idle_seconds=0.1, max_wait_seconds=0.15)
+
+    flushed = [
+        debouncer.add(
+            session_id=1, message_id=1, user_message="1", received_timestamp=1
+        )
+    ]
+    for message_id in range(2, 6):
+        await asyncio.sleep(0.05)
+        flushed.append(
+            debouncer.add(
+                session_id=1,
+                message_id=message_id,
+                user_message=str(message_id),
+                received_timestamp=message_id,
+            )
+        )
+
+    first_batch = await flushed[0]
+    last_batch = await flushed[-1]
+
+    assert len(first_batch) < 5
+    assert last_batch[-1].message_id == 5
+    assert first_batch[0].message_id not in {item.message_id for item in last_batch}
@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+from backend.tasks.message_processing.user_lane_executor import UserLaneExecutor
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+@pytest.mark.asyncio
+async def test_user_lane_executor_serializes_user_work():
+    """Tests work of one user runs in arrival order and other users are not blocked"""
+    executor = UserLaneExecutor(lanes=16)
+    lane = executor.get_lane(phone_number_id="1", phone_number="a")
+    other_phone_number = next(
+        phone_number
+        for phone_number in map(str, range(100))
+        if executor.get_lane(phone_number_id="1", phone_number=phone_number) != lane
+    )
+
+    events: list[str] = []
+
+    async def _work(name: str, delay: float) -> str:
+        events.append(f"start {name}")
+        await asyncio.sleep(delay)
+        events.append(f"end {name}")
+        return name
+
+    results = await asyncio.gather(
+        executor.run("1", "a", lambda: _work("a1", 0.05)),
+        executor.run("1", "a", lambda: _work("a2", 0)),
+        executor.run("1", other_phone_number, lambda: _work("b1", 0)),
+    )
+
+    assert results == ["a1", "a2", "b1"]
+    assert events.index("end a1") < events.index("start a2")
+    assert events.index("end b1") < events.index("end a1")
+    assert executor.metrics() == {"lanes": 16, "busy": 0, "waiting": 0}
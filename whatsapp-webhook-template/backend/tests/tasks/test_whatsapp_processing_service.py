@@ -0,0 +1,119 @@
+import asyncio
+import time
+
+import pytest
+from backend.api.v1.webhook.models import WhatsappWebhookUpdates
+from backend.api.v1.webhook.repositories import MessageRepository
+from backend.config import configure_application
+from backend.core.models import MessageIngestInfo
+from backend.tasks.message_processing.whatsapp_processing_service import (
+    WhatsappMessageProcessingService,
+)
+from fastapi import FastAPI
+
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+def _change(phone_number_id: str, messages: list[tuple[str, str]]) -> dict:
+    return {
+        "field": "messages",
+        "value": {
+            "messaging_product": "whatsapp",
+            "metadata": {
+                "display_phone_number": "1555",
+                "phone_number_id": phone_number_id,
+            },
+            "contacts": [
+                {"wa_id": phone_number, "profile": {"name": phone_number}}
+                for phone_number in {phone_number for phone_number, _ in messages}
+            ],
+            "messages": [
+                {
+                    "from": phone_number,
+                    "id": wa_message_id,
+                    "timestamp": int(time.time()),
+                    "type": "text",
+                    "text": {"body": wa_message_id},
+                }
+                for phone_number, wa_message_id in messages
+            ],
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_process_updates_ingests_user_messages_at_once_and_bounds_users(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Tests messages of several changes are ingested in one round trip per user,
+    messages of one user are processed concurrently and entry semaphore is held
+    while user messages are processed"""
+    configure_application()
+    app = FastAPI()
+    app.connection_pool = None  # type: ignore
+
+    data = WhatsappWebhookUpdates.model_validate(
+        {
+            "object": "whatsapp_business_account",
+            "entry": [
+                {
+                    "id": "entry",
+                    "changes": [
+                        _change("1", [("100", "a1"), ("200", "b1"), ("100", "a2")]),
+                        _change("1", [("200", "b2"), ("100", "a3")]),
+                    ],
+                }
+            ],
+        }
+    )
+
+    ingested: list[list[str]] = []
+
+    async def _ingest_messages(self, wa_message_ids: list[str], **_):
+        ingested.append(wa_message_ids)
+        return [
+            MessageIngestInfo(
+                user_id=1,
+                session_id=1,
+                message_id=message_id,
+                status_id=message_id,
+                is_duplicate=False,
+            )
+            for message_id in range(len(wa_message_ids))
+        ]
+
+    running: dict[str, int] = {}
+    max_users = 0
+    max_user_messages: dict[str, int] = {}
+
+    async def _process_user_message(self, entry_info, ingest_info) -> None:
+        nonlocal max_users
+        phone_number = entry_info.phone_number
+        running[phone_number] = running.get(phone_number, 0) + 1
+        max_users = max(max_users, len(running))
+        max_user_messages[phone_number] = max(
+            max_user_messages.get(phone_number, 0), running[phone_number]
+        )
+
+        await asyncio.sleep(0.05)
+
+        running[phone_number] -= 1
+        if not running[phone_number]:
+            del running[phone_number]
+
+    monkeypatch.setattr(MessageRepository, "ingest_messages", _ingest_messages)
+    monkeypatch.setattr(
+        WhatsappMessageProcessingService,
+        "_process_user_message",
+        _process_user_message,
+    )
+
+    service = WhatsappMessageProcessingService(app=app)
+    service._entry_semaphore = asyncio.Semaphore(1)
+
+    await service.process_updates(data=data)
+
+    assert sorted(ingested) == [["a1", "a2", "a3"], ["b1", "b2"]]
+    assert max_user_messages == {"100": 3, "200": 2}
+    assert max_users == 1
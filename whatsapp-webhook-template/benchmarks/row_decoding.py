@@ -0,0 +1,95 @@
+"""
+Row decoding microbenchmark.
+
+Compares per-row cost of building repository models from query results before and
+after shared mapping layer: legacy repositories built `TypeAdapter` on every call,
+mapping layer reuses process-wide adapters. Rows are copied into dicts in both
+paths, as `PostgresConnector` does, pydantic does not validate `asyncpg.Record`.
+
+Usage (from `whatsapp-webhook-template` directory):
+    python -m benchmarks.row_decoding --rounds 20000
+"""
+
+import argparse
+import time
+from typing import Any, Callable
+
+from pydantic import BaseModel, TypeAdapter
+
+from backend.core.mapping import map_rows
+from backend.core.models import MessageIngestInfo, MessageProcessingInfo
+
+
+ROW_COUNTS = (1, 100, 10_000)
+
+
+def _ingest_row(index: int) -> dict[str, Any]:
+    return {
+        "user_id": index,
+        "session_id": index,
+        "is_new_session": False,
+        "message_id": index,
+        "status_id": index,
+        "is_duplicate": False,
+    }
+
+
+def _processing_row(index: int) -> dict[str, Any]:
+    return {
+        "message_id": index,
+        "user_message": f"message {index}",
+        "concatenated_message_id": None,
+    }
+
+
+MODELS: dict[str, tuple[type[BaseModel], Callable[[int], dict[str, Any]]]] = {
+    "MessageIngestInfo": (MessageIngestInfo, _ingest_row),
+    "MessageProcessingInfo": (MessageProcessingInfo, _processing_row),
+}
+
+
+def _legacy_decode(model: type[BaseModel], rows: list[dict[str, Any]]) -> list:
+    result = [dict(row) for row in rows]
+    return TypeAdapter(list[model]).validate_python(result)  # type: ignore[valid-type]
+
+
+def _mapping_decode(model: type[BaseModel], rows: list[dict[str, Any]]) -> list:
+    result = [dict(row) for row in rows]
+    return map_rows(model, result)
+
+
+def _measure(
+    decode: Callable[[type[BaseModel], list[dict[str, Any]]], list],
+    model: type[BaseModel],
+    rows: list[dict[str, Any]],
+    rounds: int,
+) -> float:
+    """Microseconds per decoded row"""
+    repeats = max(rounds // len(rows), 1)
+    decode(model, rows)  # warm up
+
+    started_at = time.perf_counter()
+    for _ in range(repeats):
+        decode(model, rows)
+
+    return (time.perf_counter() - started_at) / repeats / len(rows) * 1e6
+
+
+def main(rounds: int) -> None:
+    print(f"{'model':<22} {'rows':>6} {'legacy, us':>11} {'mapping, us':>12}")
+    for model_name, (model, make_row) in MODELS.items():
+        for row_count in ROW_COUNTS:
+            rows = [make_row(i) for i in range(row_count)]
+            print(
+                f"{model_name:<22} {row_count:>6}"
+                f" {_measure(_legacy_decode, model, rows, rounds):>11.2f}"
+                f" {_measure(_mapping_decode, model, rows, rounds):>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+
+    main(rounds=args.rounds)
@@ -0,0 +1,237 @@
+"""
+Webhook ingestion microbenchmark.
+
+Compares request-thread work of `POST /webhook/whatsapp` before and after raw-body
+ingestion: legacy route parsed the body into `WhatsappWebhookUpdates` twice (route
+and token validator), signed re-serialized model and serialized it again for the
+queue. Queue insert is identical for both and is left out.
+
+Usage (from `whatsapp-webhook-template` directory):
+    python -m benchmarks.webhook_ingestion --requests 5000
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import statistics
+import time
+
+import httpx
+from fastapi import Body, Depends, FastAPI, Header, Request
+
+from backend.config import configure_application
+
+
+configure_application()
+
+from backend.api.v1.auth.services import (  # noqa E402  # pylint: disable=C0413
+    WhatsappTokenValidator,
+)
+from backend.api.v1.webhook.models import (  # noqa E402  # pylint: disable=C0413
+    WhatsappWebhookUpdates,
+)
+from backend.api.v1.webhook.services.whatsapp_service import (  # noqa E402  # pylint: disable=C0413
+    _parse_whatsapp_webhook_updates,
+)
+from backend.settings import get_settings  # noqa E402  # pylint: disable=C0413
+
+
+APP_SECRET = "benchmark-secret"
+
+
+def _text_message_update(index: int) -> dict:
+    return {
+        "object": "whatsapp_business_account",
+        "entry": [
+            {
+                "id": "102290129340398",
+                "changes": [
+                    {
+                        "field": "messages",
+                        "value": {
+                            "messaging_product": "whatsapp",
+                            "metadata": {
+                                "display_phone_number": "15550783881",
+                                "phone_number_id": "106540352242922",
+                            },
+                            "contacts": [
+                                {
+                                    "profile": {"name": "Sheena Nelson"},
+                                    "wa_id": f"1650555{index:04d}",
+                                }
+                            ],
+                            "messages": [
+                                {
+                                    "from": f"1650555{index:04d}",
+                                    "id": f"wamid.HBgLMTY1MDM4Nzk0MzkVAgASGBQzQTRBNjU5OUFFRTAzODEwMTQ0RgA={index}",
+                                    "timestamp": "1749416383",
+                                    "type": "text",
+                                    "text": {"body": "Does it come in another color?"},
+                                }
+                            ],
+                        },
+                    }
+                ],
+            }
+        ],
+    }
+
+
+def _status_update(index: int) -> dict:
+    return {
+        "object": "whatsapp_business_account",
+        "entry": [
+            {
+                "id": "102290129340398",
+                "changes": [
+                    {
+                        "field": "messages",
+                        "value": {
+                            "messaging_product": "whatsapp",
+                            "metadata": {
+                                "display_phone_number": "15550783881",
+                                "phone_number_id": "106540352242922",
+                            },
+                            "statuses": [
+                                {
+                                    "id": f"wamid.HBgLMTY0NjcwNDM1OTUVAgARGBI1RjQyNUE3NEYxMzAzMzQ5MkEA={index}",
+                                    "status": "delivered",
+                                    "timestamp": "1750263773",
+                                    "recipient_id": f"1650555{index:04d}",
+                                    "conversation": {
+                                        "id": "6ceb9d929c1a3d3f2a7e1a0bd3e8b5b1",
+                                        "origin": {"type": "service"},
+                                    },
+                                    "pricing": {
+                                        "billable": True,
+                                        "pricing_model": "PMP",
+                                        "category": "service",
+                                    },
+                                }
+                            ],
+                        },
+                    }
+                ],
+            }
+        ],
+    }
+
+
+def _batched_update(index: int, size: int = 10) -> dict:
+    return {
+        "object": "whatsapp_business_account",
+        "entry": [
+            _text_message_update(index * size + i)["entry"][0] for i in range(size)
+        ],
+    }
+
+
+PAYLOADS = {
+    "text message": _text_message_update,
+    "delivery status": _status_update,
+    "10 entries batch": _batched_update,
+}
+
+
+class LegacyWhatsappTokenValidator:
+    """Token validator as it was: body parsed again and re-serialized to sign"""
+
+    async def __call__(
+        self,
+        signature: str = Header(None, alias="x-hub-signature-256"),
+        data: WhatsappWebhookUpdates = Body(None),
+    ):
+        sha256_hash = hashlib.sha256()
+        sha256_hash.update(data.model_dump_json().encode("utf-8"))
+        sha256_hash.update(APP_SECRET.encode("utf-8"))
+        # legacy scheme never matched Meta signature, only its cost matters here
+        _ = signature.removeprefix("sha256=") == sha256_hash.hexdigest()
+
+
+def _create_legacy_app() -> FastAPI:
+    legacy_app = FastAPI()
+
+    @legacy_app.post("/webhook", dependencies=[Depends(LegacyWhatsappTokenValidator())])
+    async def webhook(data: WhatsappWebhookUpdates):
+        data.model_dump_json(by_alias=True)
+        return "OK"
+
+    return legacy_app
+
+
+def _create_fast_app() -> FastAPI:
+    fast_app = FastAPI()
+
+    @fast_app.post("/webhook", dependencies=[Depends(WhatsappTokenValidator())])
+    async def webhook(request: Request):
+        body = await request.body()
+        assert _parse_whatsapp_webhook_updates(body=body) is not None
+        body.decode("utf-8")
+        return "OK"
+
+    return fast_app
+
+
+async def _run(app: FastAPI, bodies: list[bytes]) -> tuple[list[float], float]:
+    """Send bodies one by one. Returns latencies and CPU seconds per request"""
+    latencies = []
+    transport = httpx.ASGITransport(app=app)  # type: ignore
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        cpu_started_at = time.process_time()
+
+        for body in bodies:
+            signature = hmac.new(APP_SECRET.encode(), body, hashlib.sha256).hexdigest()
+            started_at = time.perf_counter()
+            response = await client.post(
+                "/webhook",
+                content=body,
+                headers={
+                    "content-type": "application/json",
+                    "x-hub-signature-256": f"sha256={signature}",
+                },
+            )
+            latencies.append(time.perf_counter() - started_at)
+            assert response.status_code == 200, response.text
+
+        cpu_seconds = (time.process_time() - cpu_started_at) / len(bodies)
+
+    return latencies, cpu_seconds
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+async def main(requests: int) -> None:
+    settings = get_settings()
+    settings.WHATSAPP_VALIDATE_SIGNATURE = True
+    settings.WHATSAPP_APP_SECRET = APP_SECRET
+
+    apps = {"legacy": _create_legacy_app(), "raw body": _create_fast_app()}
+
+    print(f"{'payload':<18} {'path':<10} {'p50, us':>9} {'p99, us':>9} {'cpu, us':>9}")
+    for payload_name, payload in PAYLOADS.items():
+        bodies = [json.dumps(payload(i)).encode() for i in range(requests)]
+
+        for app_name, app in apps.items():
+            await _run(app=app, bodies=bodies[:100])  # warm up
+            latencies, cpu_seconds = await _run(app=app, bodies=bodies)
+            print(
+                f"{payload_name:<18} {app_name:<10}"
+                f" {_percentile(latencies, 50) * 1e6:>9.0f}"
+                f" {_percentile(latencies, 99) * 1e6:>9.0f}"
+                f" {cpu_seconds * 1e6:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    asyncio.run(main(requests=args.requests))
@@ -6,7 +6,18 @@ from typing import Any
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.templating import Jinja2Templates
-from shared_lib_template.db import create_postgres_connection_pool
+from shared_lib_template.constants import PostgresPoolMode
+from shared_lib_template.db import (
+    create_postgres_connection_pool,
+    create_postgres_listen_pool,
+    create_postgres_replica_router,
+    statement_registry,
+)
+from shared_lib_template.utils import (
+    circuit_breaker_registry,
+    create_http_client_session,
+    retry_budget,
+)
 
 from backend.config import configure_application
 
@@ -18,6 +29,39 @@ from backend import (  # noqa E402  # pylint: disable=C0413
     exception_handler,
     settings,
 )
+from backend.core.metrics import (  # noqa E402  # pylint: disable=C0413
+    register_metrics_source,
+)
+from backend.core.whatsapp.send_rate_limiter import (  # noqa E402  # pylint: disable=C0413
+    create_send_rate_limiter,
+)
+from backend.tasks.message_processing import (  # noqa E402  # pylint: disable=C0413
+    process_message,
+)
+from backend.tasks.message_processing.message_processing_sweeper import (  # noqa E402  # pylint: disable=C0413
+    create_message_processing_sweeper,
+)
+from backend.tasks.message_processing.message_queue_consumer import (  # noqa E402  # pylint: disable=C0413
+    create_message_queue_consumer,
+)
+from backend.tasks.message_processing.processing_scheduler import (  # noqa E402  # pylint: disable=C0413
+    create_processing_scheduler,
+)
+from backend.tasks.message_processing.read_receipt_dispatcher import (  # noqa E402  # pylint: disable=C0413
+    create_read_receipt_dispatcher,
+)
+from backend.tasks.message_processing.recent_message_filter import (  # noqa E402  # pylint: disable=C0413
+    create_recent_message_filter,
+)
+from backend.tasks.message_processing.session_message_debouncer import (  # noqa E402  # pylint: disable=C0413
+    create_session_message_debouncer,
+)
+from backend.tasks.message_processing.session_message_listener import (  # noqa E402  # pylint: disable=C0413
+    create_session_message_listener,
+)
+from backend.tasks.message_processing.user_lane_executor import (  # noqa E402  # pylint: disable=C0413
+    create_user_lane_executor,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -42,10 +86,67 @@ async def lifespan(fastapi_app: FastAPI):
     # Events on startup app
     fastapi_app.connection_pool = await create_postgres_connection_pool(settings=app_settings)  # type: ignore
     logger.info("Connection pool established")
+    register_metrics_source("postgres_statements", statement_registry.metrics)
+    fastapi_app.replica_router = await create_postgres_replica_router(settings=app_settings)  # type: ignore
+    if fastapi_app.replica_router:  # type: ignore
+        register_metrics_source("postgres_replicas", fastapi_app.replica_router.metrics)  # type: ignore
+    fastapi_app.http_client_session = await create_http_client_session(settings=app_settings)  # type: ignore
+    logger.info("HTTP client session established")
+    register_metrics_source("circuit_breakers", circuit_breaker_registry.metrics)
+    retry_budget.configure(
+        ratio=app_settings.RETRY_BUDGET_RATIO,
+        min_retries_per_second=app_settings.RETRY_BUDGET_MIN_RETRIES_PER_SECOND,
+        window=app_settings.RETRY_BUDGET_WINDOW,
+    )
+    register_metrics_source("retry_budget", retry_budget.metrics)
+    fastapi_app.recent_message_filter = create_recent_message_filter()  # type: ignore
+    fastapi_app.send_rate_limiter = create_send_rate_limiter(app=fastapi_app)  # type: ignore
+    fastapi_app.read_receipt_dispatcher = create_read_receipt_dispatcher(app=fastapi_app)  # type: ignore
+    fastapi_app.session_message_debouncer = create_session_message_debouncer()  # type: ignore
+    fastapi_app.user_lane_executor = create_user_lane_executor()  # type: ignore
+    fastapi_app.session_message_listener = None  # type: ignore
+    fastapi_app.listen_connection_pool = await create_postgres_listen_pool(settings=app_settings)  # type: ignore
+    if app_settings.APP_WORKERS > 1:
+        listen_pool = fastapi_app.listen_connection_pool or fastapi_app.connection_pool  # type: ignore
+        is_listen_pool_missing = (
+            app_settings.POSTGRES_POOL_MODE == PostgresPoolMode.TRANSACTION
+            and not fastapi_app.listen_connection_pool  # type: ignore
+        )
+        if is_listen_pool_missing:
+            logger.warning(
+                "POSTGRES_LISTEN_HOST is not set, session messages of other workers are not listened"
+            )
+        else:
+            fastapi_app.session_message_listener = await create_session_message_listener(  # type: ignore
+                pool=listen_pool,
+                debouncer=fastapi_app.session_message_debouncer,  # type: ignore
+            )
+    fastapi_app.processing_scheduler = create_processing_scheduler()  # type: ignore
+    fastapi_app.message_queue_consumer = create_message_queue_consumer(  # type: ignore
+        app=fastapi_app,
+        handler=process_message,
+        scheduler=fastapi_app.processing_scheduler,  # type: ignore
+    )
+    fastapi_app.message_processing_sweeper = create_message_processing_sweeper(app=fastapi_app)  # type: ignore
 
     yield
 
     # Events on shutdown app
+    await fastapi_app.message_processing_sweeper.close()  # type: ignore
+    await fastapi_app.message_queue_consumer.close()  # type: ignore
+    await fastapi_app.processing_scheduler.close()  # type: ignore
+    await fastapi_app.send_rate_limiter.close()  # type: ignore
+    await fastapi_app.read_receipt_dispatcher.close()  # type: ignore
+    logger.info("Message queue consumer stopped")
+    if fastapi_app.session_message_listener:  # type: ignore
+        await fastapi_app.session_message_listener.close()  # type: ignore
+    if fastapi_app.listen_connection_pool:  # type: ignore
+        await fastapi_app.listen_connection_pool.close()  # type: ignore
+    fastapi_app.session_message_debouncer.close()  # type: ignore
+    await fastapi_app.http_client_session.close()  # type: ignore
+    logger.info("HTTP client session closed")
+    if fastapi_app.replica_router:  # type: ignore
+        await fastapi_app.replica_router.close()  # type: ignore
     await fastapi_app.connection_pool.close()  # type: ignore
     logger.info("Connection pool closed")
 
@@ -1 +1 @@
-uvicorn main:app --host 0.0.0.0 --port 8000
+uvicorn main:app --host 0.0.0.0 --port 8000 --workers ${APP_WORKERS:-1}